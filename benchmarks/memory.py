@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Measure memory used per event and per dispatch, plain versus compact variants.
+
+Usage::
+
+    python benchmarks/memory.py
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import uninhibited  # noqa: E402
+
+
+def handler(arg=None):
+    return arg
+
+
+def measure(factory, count=10000):
+    """
+    Measure memory allocated per object created by factory.
+
+    :param callable factory: Called with no arguments to create an object
+    :param int count: Number of objects to create
+    :return float: Bytes per object
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objs = [factory() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # Don't count the list holding them
+    return (after - before - sys.getsizeof(objs)) / float(count)
+
+
+def with_handler(factory):
+    def create():
+        obj = factory()
+        obj.add(handler)
+        return obj
+    return create
+
+
+MEASUREMENTS = [
+    ('Event', uninhibited.Event),
+    ('CompactEvent', uninhibited.CompactEvent),
+    ('Event, 1 handler', with_handler(uninhibited.Event)),
+    ('CompactEvent, 1 handler', with_handler(uninhibited.CompactEvent)),
+    ('PriorityEvent', uninhibited.PriorityEvent),
+    ('CompactPriorityEvent', uninhibited.CompactPriorityEvent),
+    ('Dispatch', uninhibited.Dispatch),
+    ('CompactDispatch', uninhibited.CompactDispatch),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000, help='Objects to create per measurement')
+    args = parser.parse_args(argv)
+
+    for name, factory in MEASUREMENTS:
+        sys.stdout.write('%-30s %10.0f bytes\n' % (name, measure(factory, count=args.count)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
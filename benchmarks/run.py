@@ -0,0 +1,434 @@
+#!/usr/bin/env python
+"""
+Benchmarks for the fire, registration and dispatch paths.
+
+Each benchmark is ran for a number of sizes (handler counts, event counts), timing the best per call time out of a
+few repeats. Results can be saved as JSON and compared against a saved baseline, failing if anything got slower than
+the allowed threshold.
+
+Usage::
+
+    python benchmarks/run.py                           # run all
+    python benchmarks/run.py -k dispatch               # run benchmarks with dispatch in their name
+    python benchmarks/run.py --save baseline.json      # save results
+    python benchmarks/run.py --baseline baseline.json  # compare, exit 1 on regressions
+"""
+
+import argparse
+import asyncio
+import functools
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import uninhibited  # noqa: E402
+from uninhibited import aio, containers, dispatch, journal, tracing  # noqa: E402
+
+BENCHMARKS = []
+
+
+def benchmark(name, param, sizes):
+    """
+    Register a benchmark.
+
+    The decorated function is given a size and returns a callable to time.
+
+    :param str name: Benchmark name
+    :param str param: Name of what size means, eg handlers
+    :param tuple sizes: Sizes to run with
+    """
+    def decorator(setup):
+        BENCHMARKS.append((name, param, sizes, setup))
+        return setup
+    return decorator
+
+
+def handler(arg=None):
+    return arg
+
+
+async def ahandler(arg=None):
+    return arg
+
+
+def method(self, arg=None):
+    return arg
+
+
+def make_handler_class(names):
+    """
+    Create a handler class implementing given event names.
+    """
+    return type('Handler', (object,), dict((name, method) for name in names))
+
+
+@benchmark('event.fire', 'handlers', (1, 10, 100, 1000))
+def bench_event_fire(size):
+    e = uninhibited.Event()
+    for _ in range(size):
+        e += handler
+    return lambda: e.fire(1)
+
+
+@benchmark('event.ifire', 'handlers', (1, 10, 100, 1000))
+def bench_event_ifire(size):
+    e = uninhibited.Event()
+    for _ in range(size):
+        e += handler
+    return lambda: list(e.ifire(1))
+
+
+@benchmark('event.fire_discard', 'handlers', (1, 10, 100, 1000))
+def bench_event_fire_discard(size):
+    e = uninhibited.Event()
+    for _ in range(size):
+        e += handler
+    return lambda: e.fire_discard(1)
+
+
+@benchmark('event.fire_reduce', 'handlers', (1, 10, 100, 1000))
+def bench_event_fire_reduce(size):
+    e = uninhibited.Event()
+    for _ in range(size):
+        e += handler
+    return lambda: e.fire_reduce(any, 1)
+
+
+@benchmark('event.fire.filtered', 'handlers', (1, 10, 100, 1000))
+def bench_event_fire_filtered(size):
+    # One handler in ten matches the fired type
+    e = uninhibited.Event()
+    for i in range(size):
+        # Filters are per handler, so each needs its own
+        e.add(functools.partial(handler), types=int if i % 10 == 0 else str)
+    return lambda: e.fire(1)
+
+
+@benchmark('event.fire.traced', 'handlers', (1, 10, 100, 1000))
+def bench_event_fire_traced(size):
+    e = uninhibited.Event()
+    for _ in range(size):
+        e += handler
+    e.enable_tracing()
+    tracer = tracing.Tracer()
+
+    def fire():
+        with tracer:
+            e.fire(1)
+    return fire
+
+
+@benchmark('priority_event.fire', 'handlers', (1, 10, 100, 1000))
+def bench_priority_event_fire(size):
+    e = uninhibited.PriorityEvent()
+    for i in range(size):
+        e.add(handler, priority=i % 5)
+    return lambda: e.fire(1)
+
+
+PRIORITY_CONTAINERS = [
+    ('sorteddict', containers.SortedDictPriorityHandlerCollection),
+    ('bisect', containers.BisectPriorityHandlerCollection),
+    ('fixed', containers.FixedPriorityHandlerCollection),
+]
+
+
+def _priority_event(factory, size):
+    e = uninhibited.PriorityEvent(container_factory=factory)
+    for i in range(size):
+        e.add(handler, priority=i % 5)
+    return e
+
+
+def _register_priority_container_benchmarks(label, factory):
+    @benchmark('priority_event.%s.handlers_by_priority' % label, 'handlers', (10, 100))
+    def bench_handlers_by_priority(size):
+        e = _priority_event(factory, size)
+        return lambda: [list(handlers) for _, handlers in e.handlers_by_priority]
+
+    @benchmark('priority_event.%s.add_remove_fire' % label, 'handlers', (10, 100, 1000))
+    def bench_add_remove_fire(size):
+        # Every fire follows a mutation, so the call order has to be rebuilt each time
+        e = _priority_event(factory, size)
+
+        def run():
+            e.add(abs, priority=2)
+            e.fire(1)
+            e.remove(abs)
+        return run
+
+
+for _label, _factory in PRIORITY_CONTAINERS:
+    _register_priority_container_benchmarks(_label, _factory)
+
+
+@benchmark('coalescing_event.fire', 'handlers', (1, 10, 100, 1000))
+def bench_coalescing_event_fire(size):
+    # Fires are held and replaced, handlers are only called upon flush
+    from uninhibited.coalesce import CoalescingEvent
+    e = CoalescingEvent(window=3600)
+    for _ in range(size):
+        e += handler
+    run = lambda: e.fire(1)  # noqa: E731
+    run.close = e.cancel
+    return run
+
+
+@benchmark('dispatch.fire', 'events', (10, 1000, 10000))
+def bench_dispatch_fire(size):
+    names = ['on_event_%d' % i for i in range(size)]
+    d = uninhibited.Dispatch(names)
+    d.add(make_handler_class(names[:10])())
+    return lambda: d.fire('on_event_0', 1)
+
+
+@benchmark('dispatch.add_remove', 'events', (10, 1000, 10000))
+def bench_dispatch_add_remove_events(size):
+    names = ['on_event_%d' % i for i in range(size)]
+    d = uninhibited.Dispatch(names)
+    cls = make_handler_class(names[:10])
+    for _ in range(100):
+        d.add(cls())
+    instance = cls()
+
+    def run():
+        d.add(instance)
+        d.remove(instance)
+    return run
+
+
+@benchmark('dispatch.add_remove', 'handlers', (10, 1000, 10000))
+def bench_dispatch_add_remove_handlers(size):
+    names = ['on_event_%d' % i for i in range(100)]
+    d = uninhibited.Dispatch(names)
+    cls = make_handler_class(names[:10])
+    for _ in range(size):
+        d.add(cls())
+    instance = cls()
+
+    def run():
+        d.add(instance)
+        d.remove(instance)
+    return run
+
+
+@benchmark('dispatch.create.schema', 'events', (0, 10, 100))
+def bench_dispatch_create_schema(size):
+    schema = dispatch.Schema(['on_event_%d' % i for i in range(size)])
+    return lambda: uninhibited.Dispatch(schema=schema)
+
+
+@benchmark('dispatch.add_events', 'handlers', (10, 1000, 10000))
+def bench_dispatch_add_events(size):
+    names = ['on_event_%d' % i for i in range(100)]
+    d = uninhibited.Dispatch(names)
+    cls = make_handler_class(names[:10])
+    for _ in range(size):
+        d.add(cls())
+    counter = itertools.count()
+    return lambda: d.add_event('on_new_%d' % next(counter))
+
+
+@benchmark('dispatch.lazy.add_remove', 'handlers', (10, 1000, 10000))
+def bench_dispatch_lazy_add_remove_handlers(size):
+    names = ['on_event_%d' % i for i in range(100)]
+    d = uninhibited.Dispatch(names, lazy_binding=True)
+    cls = make_handler_class(names[:10])
+    for _ in range(size):
+        d.add(cls())
+    instance = cls()
+
+    def run():
+        d.add(instance)
+        d.remove(instance)
+    return run
+
+
+@benchmark('dispatch.lazy.first_fire', 'handlers', (10, 1000, 10000))
+def bench_dispatch_lazy_first_fire(size):
+    names = ['on_event_%d' % i for i in range(100)]
+    d = uninhibited.Dispatch(names, lazy_binding=True)
+    cls = make_handler_class(names[:10])
+    for _ in range(size):
+        d.add(cls())
+    counter = itertools.count()
+    # Names no handler implements, so only the cost of resolving them is timed
+    return lambda: d.fire('on_new_%d' % next(counter), 1)
+
+
+@benchmark('dispatch.fire.patterns', 'patterns', (10, 1000))
+def bench_dispatch_fire_patterns(size):
+    d = uninhibited.Dispatch()
+    for i in range(size):
+        d.subscribe('order_%d.*.failed' % i, handler)
+    d.subscribe('order_0.**', handler)
+    return lambda: d.fire('order_0.payment.failed', 1)
+
+
+def _temporary_journal(size):
+    directory = tempfile.mkdtemp(prefix='uninhibited-bench-')
+    j = journal.Journal(directory)
+    args = (b'x' * size,)
+    return directory, j, args
+
+
+@benchmark('journal.write', 'payload_bytes', (16, 1024))
+def bench_journal_write(size):
+    directory, j, args = _temporary_journal(size)
+    d = uninhibited.Dispatch()
+    j.attach(d, ['on_data'])
+    run = lambda: d.fire('on_data', *args)  # noqa: E731
+
+    def close():
+        j.close()
+        shutil.rmtree(directory)
+    run.close = close
+    return run
+
+
+@benchmark('journal.replay', 'records', (1000,))
+def bench_journal_replay(size):
+    directory, j, args = _temporary_journal(16)
+    for _ in range(size):
+        j.write('on_data', args, {})
+    j.close()
+    reader = journal.JournalReader(directory)
+    d = uninhibited.Dispatch()
+    d.subscribe('on_data', handler)
+    run = lambda: reader.replay(d)  # noqa: E731
+    run.close = lambda: shutil.rmtree(directory)
+    return run
+
+
+def _async_fire(e):
+    loop = asyncio.new_event_loop()
+
+    async def fire():
+        return await e.fire(1)
+
+    run = lambda: loop.run_until_complete(fire())  # noqa: E731
+    run.close = loop.close
+    return run
+
+
+@benchmark('async_event.fire.coroutine', 'handlers', (1, 10, 100))
+def bench_async_event_fire_coroutine(size):
+    e = uninhibited.AsyncEvent()
+    for _ in range(size):
+        e += ahandler
+    return _async_fire(e)
+
+
+@benchmark('async_event.fire.executor', 'handlers', (1, 10, 100))
+def bench_async_event_fire_executor(size):
+    e = uninhibited.AsyncEvent()
+    for _ in range(size):
+        e += handler
+    return _async_fire(e)
+
+
+@benchmark('async_event.fire.inline', 'handlers', (1, 10, 100))
+def bench_async_event_fire_inline(size):
+    e = uninhibited.AsyncEvent(execution=aio.INLINE)
+    for _ in range(size):
+        e += handler
+    return _async_fire(e)
+
+
+@benchmark('import.event', 'processes', (1,))
+def bench_import_event(size):
+    # Interpreter start up is included; compare against a baseline rather than reading it as is
+    command = [sys.executable, '-c', 'from uninhibited import Event']
+    env = dict(os.environ, PYTHONPATH=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    return lambda: subprocess.check_call(command, env=env)
+
+
+def time_call(func, repeat=5, min_time=0.2):
+    """
+    Time func, returning the best per call time in seconds out of `repeat` runs of at least `min_time` seconds each.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    return min([elapsed] + timer.repeat(repeat - 1, number)) / number
+
+
+def run(keyword=None, repeat=5, min_time=0.2, out=sys.stdout):
+    results = {}
+    for name, param, sizes, setup in BENCHMARKS:
+        if keyword and keyword not in name:
+            continue
+        for size in sizes:
+            key = '%s[%s=%d]' % (name, param, size)
+            func = setup(size)
+            try:
+                results[key] = time_call(func, repeat=repeat, min_time=min_time)
+            finally:
+                close = getattr(func, 'close', None)
+                if close:
+                    close()
+            out.write('%-55s %12.3f us\n' % (key, results[key] * 1e6))
+            out.flush()
+    return results
+
+
+def compare(results, baseline, threshold, out=sys.stdout):
+    """
+    Compare results against a baseline.
+
+    :return list: Keys of benchmarks that regressed by more than threshold
+    """
+    regressions = []
+    out.write('\n%-55s %12s %12s %8s\n' % ('benchmark', 'baseline', 'current', 'ratio'))
+    for key in sorted(results):
+        if key not in baseline:
+            continue
+        ratio = results[key] / baseline[key]
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        out.write('%-55s %9.3f us %9.3f us %7.2fx%s\n' % (key, baseline[key] * 1e6, results[key] * 1e6, ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-k', dest='keyword', help='Only run benchmarks with this in their name')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs per benchmark, best is kept')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds per timing run')
+    parser.add_argument('--save', help='Save results as JSON to this file')
+    parser.add_argument('--baseline', help='Compare against results saved with --save')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Allowed slowdown against the baseline before failing, as a fraction')
+    args = parser.parse_args(argv)
+
+    results = run(keyword=args.keyword, repeat=args.repeat, min_time=args.min_time)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            sys.stdout.write('\n%d benchmark(s) regressed more than %d%%\n' % (len(regressions), args.threshold * 100))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,4 +2,4 @@ import sys
 
 collect_ignore = []
 if sys.version_info < (3,5):
-    collect_ignore.append('test_aio.py')
+    collect_ignore.extend(['test_aio.py', 'test_aio_handlers.py', 'test_aio_bus.py'])
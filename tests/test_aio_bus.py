@@ -0,0 +1,66 @@
+import asyncio
+
+import uninhibited
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class Handler(object):
+
+    def __init__(self):
+        self.seen = []
+
+    async def on_item(self, item):
+        await asyncio.sleep(0)
+        self.seen.append(item)
+
+    async def on_fail(self):
+        raise ValueError('fail')
+
+
+def test_posted_events_are_fired_by_workers():
+    d = uninhibited.AsyncDispatch()
+    handler = d.add(Handler())
+    errors = []
+
+    async def produce():
+        bus = d.start_bus(workers=2, maxsize=4, batch_size=3, on_error=lambda name, exc: errors.append(name))
+        for i in range(20):
+            await d.post('on_item', i)
+        await d.post('on_fail')
+        await d.flush()
+        assert bus.depth == 0
+        await d.shutdown()
+        return bus
+
+    bus = run(produce())
+    assert sorted(handler.seen) == list(range(20))
+    assert bus.posted == bus.processed == 21
+    assert bus.errors == 1
+    assert errors == ['on_fail']
+    assert not bus.running
+
+
+def test_post_nowait_applies_backpressure():
+    d = uninhibited.AsyncDispatch()
+    d.add(Handler())
+
+    async def produce():
+        d.start_bus(maxsize=1)
+        d.post_nowait('on_item', 1)
+        try:
+            d.post_nowait('on_item', 2)
+        except asyncio.QueueFull:
+            full = True
+        else:
+            full = False
+        await d.shutdown(flush=False)
+        return full
+
+    assert run(produce())
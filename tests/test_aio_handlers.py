@@ -0,0 +1,450 @@
+import asyncio
+import threading
+import concurrent.futures
+
+import uninhibited
+from uninhibited import aio
+from uninhibited.results import first
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def current_thread(*args):
+    return threading.current_thread()
+
+
+async def acurrent_thread(*args):
+    return threading.current_thread()
+
+
+def test_handler_kinds_are_classified_on_add():
+    e = uninhibited.AsyncEvent()
+    e.add(current_thread)
+    e += acurrent_thread
+    e.add(current_thread, execution=aio.INLINE)
+
+    assert e._handler_kinds == {
+        id(current_thread): (current_thread, False, aio.INLINE),
+        id(acurrent_thread): (acurrent_thread, True, None),
+    }
+
+    e.remove(current_thread)
+    assert id(current_thread) in e._handler_kinds
+    e.remove(current_thread)
+    assert list(e._handler_kinds) == [id(acurrent_thread)]
+
+
+class Unhashable(object):
+    __hash__ = None
+
+    def __call__(self, arg):
+        return arg
+
+    async def method(self, arg):
+        return arg
+
+
+def test_unhashable_and_bound_method_handlers():
+    handler, obj = Unhashable(), Unhashable()
+    e = uninhibited.AsyncEvent(execution=aio.INLINE)
+    e.add(handler)
+    e.add(obj.method)
+    assert run(e.fire(1)) == [(handler, 1), (obj.method, 1)]
+    assert e._handler_kinds[id(e.container.handlers[1])][1:] == (True, None)
+
+    # Removed through an equal bound method, not the one added
+    e.remove(obj.method)
+    e.remove(handler)
+    assert e._handler_kinds == {}
+
+
+def test_execution_policies():
+    main = threading.current_thread()
+    executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='custom')
+
+    @aio.with_execution(executor)
+    def custom(*args):
+        return threading.current_thread()
+
+    def inline(*args):
+        return threading.current_thread()
+
+    e = uninhibited.AsyncEvent()
+    e.add(current_thread)
+    e.add(inline, execution=aio.INLINE)
+    e.add(custom)
+    e.add(acurrent_thread)
+
+    async def fire():
+        return await e.fire()
+
+    try:
+        results = dict(run(fire()))
+    finally:
+        executor.shutdown()
+
+    assert results[current_thread] is not main
+    assert results[inline] is main
+    assert results[custom].name.startswith('custom')
+    assert results[acurrent_thread] is main
+
+
+def test_inline_event_policy():
+    main = threading.current_thread()
+    e = uninhibited.AsyncPriorityEvent(execution=aio.INLINE)
+    e.add(current_thread, priority=0)
+
+    async def fire():
+        return await e.fire()
+
+    assert run(fire()) == [(current_thread, main)]
+
+
+def test_max_concurrency_bounds_in_flight_handlers():
+    in_flight = []
+    peak = []
+
+    async def handler(delay):
+        in_flight.append(handler)
+        peak.append(len(in_flight))
+        await asyncio.sleep(delay)
+        in_flight.pop()
+        return delay
+
+    e = uninhibited.AsyncEvent(max_concurrency=2)
+    for _ in range(6):
+        e.add(handler)
+
+    async def fire():
+        ordered = await e.fire(0)
+        streamed = [result async for _, result in e.fire(0)]
+        return ordered, streamed
+
+    ordered, streamed = run(fire())
+    assert ordered == [(handler, 0)] * 6
+    assert streamed == [0] * 6
+    assert max(peak) == 2
+
+
+def test_async_dispatch_max_concurrency():
+    class Handler(object):
+        async def on_ping(self):
+            return 'pong'
+
+    d = uninhibited.AsyncDispatch(max_concurrency=3)
+    d.add(Handler())
+    d.add(Handler())
+
+    async def fire():
+        return await d.fire('on_ping')
+
+    assert [r for _, r in run(fire())] == ['pong', 'pong']
+    assert d['on_ping'].max_concurrency == 3
+
+
+def test_async_stats_include_executor_wait():
+    e = uninhibited.AsyncEvent()
+    e.add(current_thread)
+    e.add(acurrent_thread)
+    event_stats = e.enable_stats()
+
+    async def fire():
+        return await e.fire()
+
+    run(fire())
+    assert event_stats.fires == 1
+    assert event_stats.handler(current_thread).calls == 1
+    assert event_stats.handler(current_thread).wait.count == 1
+    assert event_stats.handler(acurrent_thread).calls == 1
+    assert event_stats.handler(acurrent_thread).wait.count == 0
+
+
+def test_stop_propagation_skips_unscheduled_handlers():
+    started = []
+
+    async def veto(arg):
+        started.append('veto')
+        raise uninhibited.StopPropagation('vetoed')
+
+    async def late(arg):
+        started.append('late')
+        return arg
+
+    e = uninhibited.AsyncPriorityEvent(max_concurrency=1)
+    e.add(late, priority=10)
+    e.add(veto, priority=0)
+
+    assert run(e.fire(1)) == [(veto, 'vetoed')]
+
+    async def collect():
+        return [r async for r in e.fire(1)]
+
+    assert run(collect()) == [(veto, 'vetoed')]
+    assert started == ['veto', 'veto']
+
+    # Unbounded, everything starts at once; results still end with the vetoing handler
+    e.max_concurrency = None
+    assert run(collect()) == [(veto, 'vetoed')]
+    assert run(e.fire(1)) == [(veto, 'vetoed')]
+
+    # Unless it's marked, in which case lower priorities wait for it
+    del started[:]
+    e = uninhibited.AsyncPriorityEvent()
+    e.add(late, priority=10)
+    e.add(aio.can_stop(veto), priority=0)
+    assert run(e.fire(1)) == [(veto, 'vetoed')]
+    assert run(e.fire_by_priority(1)) == [(0, [(veto, 'vetoed')])]
+    assert started == ['veto', 'veto']
+
+
+def test_stop_propagation_truncates_results():
+    called = []
+
+    def make(name, stop=False):
+        def handler(arg):
+            called.append(name)
+            if stop:
+                raise uninhibited.StopPropagation(name)
+            return name
+        return handler
+
+    a, b, c = make('a'), make('b', stop=True), make('c')
+
+    async def slow(arg):
+        await asyncio.sleep(0.01)
+        return 'slow'
+
+    async def stop(arg):
+        raise uninhibited.StopPropagation('stop')
+
+    async def late(arg):
+        await asyncio.sleep(0.01)
+        return 'late'
+
+    for max_concurrency in (None, 2):
+        e = uninhibited.AsyncEvent(execution=aio.INLINE, max_concurrency=max_concurrency)
+        for h in (a, b, c):
+            e += h
+        del called[:]
+        # Handlers after an inline one that stops aren't started
+        assert run(e.fire(1)) == [(a, 'a'), (b, 'b')]
+        assert called == ['a', 'b']
+
+        e = uninhibited.AsyncEvent(max_concurrency=max_concurrency)
+        for h in (slow, stop, late):
+            e += h
+        # Handlers before one that stops are waited for, those after it left out
+        assert run(e.fire(1)) == [(slow, 'slow'), (stop, 'stop')]
+
+
+def test_async_coalescing_event():
+    calls = []
+
+    async def handler(value):
+        calls.append(value)
+        return value
+
+    async def main():
+        e = uninhibited.AsyncCoalescingEvent(window=0.01)
+        e += handler
+        waiters = [e.fire(i) for i in range(100)]
+        assert all(w is waiters[0] for w in waiters)
+        return await waiters[0]
+
+    assert run(main()) == [(handler, 99)]
+    assert calls == [99]
+
+
+def test_async_result_modes():
+    async def slow(arg):
+        await asyncio.sleep(1)
+        return 'slow'
+
+    async def fast(arg):
+        return arg
+
+    async def none(arg):
+        await asyncio.sleep(0.01)
+
+    e = uninhibited.AsyncEvent(execution=aio.INLINE)
+    e += none
+    e += fast
+    e += slow
+
+    # First in handler order, cancelling the rest
+    assert run(asyncio.wait_for(e.fire_first(1), 0.5)) == 1
+
+    e -= none
+    e -= slow
+    e += abs
+    assert run(e.fire_reduce(sum, -2)) == 0
+    assert run(e.fire_discard(-2)) is None
+
+    e.result_mode = uninhibited.DISCARD
+    assert run(e.fire(-2)) is None
+    e.result_mode = list
+    e.enable_stats()
+    assert run(e.fire(-2)) == [-2, 2]
+    assert e.stats.fires == 1
+
+    bounded = uninhibited.AsyncEvent(max_concurrency=1, result_mode=first)
+    bounded += fast
+    bounded += slow
+    assert run(asyncio.wait_for(bounded.fire(None), 1.5)) == 'slow'
+
+
+def test_async_reducers_stream_in_handler_order():
+    started = []
+
+    def make(name, delay, result):
+        async def handler(arg):
+            started.append(name)
+            await asyncio.sleep(delay)
+            return result
+        return handler
+
+    slow_true, fast_false, late = make('slow_true', 0.02, True), make('fast_false', 0, False), make('late', 1, True)
+
+    for max_concurrency in (None, 2):
+        e = uninhibited.AsyncEvent(max_concurrency=max_concurrency)
+        e += slow_true
+        e += fast_false
+        e += late
+        # Short-circuits on the second handler, without waiting for the third
+        assert run(asyncio.wait_for(e.fire_reduce(all, None), 0.5)) is False
+        assert run(asyncio.wait_for(e.fire_reduce(any, None), 0.5)) is True
+        assert run(asyncio.wait_for(e.fire_first(None), 0.5)) is True
+
+        async def count_until_false(results):
+            count = 0
+            async for result in results:
+                if not result:
+                    break
+                count += 1
+            return count
+
+        assert run(asyncio.wait_for(e.fire_reduce(count_until_false, None), 0.5)) == 1
+
+    # Handler order follows priority, unlike order of completion
+    e = uninhibited.AsyncPriorityEvent()
+    e.add(make('low', 0, 'low'), priority=10)
+    e.add(make('high', 0.01, 'high'), priority=0)
+    assert run(e.fire_first(None)) == 'high'
+    e.tiered = True
+    assert run(e.fire_first(None)) == 'high'
+
+
+def test_tiered_priority_event_runs_levels_in_order():
+    log = []
+
+    def make(name, delay):
+        async def handler(arg):
+            log.append(('start', name))
+            await asyncio.sleep(delay)
+            log.append(('end', name))
+            return name
+        return handler
+
+    fast, slow, late = make('fast', 0), make('slow', 0.05), make('late', 0)
+
+    e = uninhibited.AsyncPriorityEvent(tiered=True)
+    e.add(late, priority=1)
+    e.add(slow, priority=0)
+    e.add(fast, priority=0)
+
+    assert run(e.fire(None)) == [(slow, 'slow'), (fast, 'fast'), (late, 'late')]
+    # The first level runs concurrently, the second only once it's done
+    assert log.index(('start', 'fast')) < log.index(('end', 'slow')) < log.index(('start', 'late'))
+
+    async def collect():
+        return [h async for h, _ in e.fire(None)]
+
+    assert run(collect()) == [fast, slow, late]
+
+    async def plain():
+        return [await f for f in e.fire(None)]
+
+    assert run(plain()) == [(slow, 'slow'), (fast, 'fast'), (late, 'late')]
+
+    # With a quorum of one, the second level starts as soon as the fast handler finishes
+    del log[:]
+    e.quorum = 1
+    assert run(e.fire(None)) == [(slow, 'slow'), (fast, 'fast'), (late, 'late')]
+    assert log.index(('start', 'late')) < log.index(('end', 'slow'))
+
+
+def test_tiered_stop_propagation_skips_later_levels():
+    started = []
+
+    async def veto(arg):
+        started.append('veto')
+        raise uninhibited.StopPropagation('vetoed')
+
+    async def late(arg):
+        started.append('late')
+
+    e = uninhibited.AsyncPriorityEvent(tiered=True)
+    e.add(late, priority=1)
+    e.add(veto, priority=0)
+    assert run(e.fire(None)) == [(veto, 'vetoed')]
+    assert run(e.fire_by_priority(None)) == [(0, [(veto, 'vetoed')])]
+    assert started == ['veto', 'veto']
+
+
+def test_async_fire_by_priority_and_priority_dispatch():
+    async def double(arg):
+        return arg * 2
+
+    e = uninhibited.AsyncPriorityEvent()
+    e.add(double, priority=5)
+    e.add(abs, priority=1, execution=aio.INLINE)
+    assert run(e.fire_by_priority(-1)) == [(1, [(abs, 1)]), (5, [(double, -2)])]
+
+    d = uninhibited.AsyncPriorityDispatch(['on_x'])
+    assert isinstance(d, uninhibited.PriorityDispatch)
+    assert isinstance(d['on_x'], uninhibited.AsyncPriorityEvent)
+
+
+def test_tiered_plain_iteration_driver_is_held_and_closed():
+    async def slow(arg):
+        await asyncio.sleep(10)
+
+    e = uninhibited.AsyncPriorityEvent(tiered=True)
+    e.add(abs, priority=0, execution=aio.INLINE)
+    e.add(slow, priority=1)
+
+    async def main():
+        fs = e.fire(-1)
+        first, second = list(fs)
+        assert await first == (abs, 1)
+        assert not fs._driver.done()
+        fs.close()
+        await asyncio.sleep(0)
+        assert fs._driver.done() and second.cancelled()
+        assert not fs._pending
+
+    run(main())
+
+
+def test_fire_run_in_executor():
+    main = threading.current_thread()
+
+    async def acurrent_loop(arg):
+        return asyncio.get_event_loop()
+
+    e = uninhibited.AsyncEvent(execution=aio.INLINE)
+    e += current_thread
+    e += acurrent_loop
+
+    async def fire():
+        return await e.fire(None).run_in_executor(), asyncio.get_event_loop()
+
+    [(_, thread), (_, loop)], main_loop = run(fire())
+    assert thread is not main
+    assert loop is not main_loop and loop.is_closed()
@@ -0,0 +1,191 @@
+import multiprocessing
+import os
+import socket
+import threading
+import uuid
+
+import pytest
+
+import uninhibited
+from uninhibited import bridge
+from uninhibited.bridge import Bridge, RemoteHandler, SharedMemoryRing, UnixSocketTransport
+
+needs_shared_memory = pytest.mark.skipif(not bridge.HAS_SHARED_MEMORY, reason='Needs multiprocessing.shared_memory')
+
+
+class Recorder(object):
+    def __init__(self, count=1):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.count = count
+        self.done = threading.Event()
+
+    def on_data(self, *args, **kwargs):
+        with self.lock:
+            self.calls.append((tuple(bytes(a) if isinstance(a, memoryview) else a for a in args), kwargs))
+            if len(self.calls) >= self.count:
+                self.done.set()
+
+
+def test_encode_decode_passes_buffers_out_of_band():
+    payload = b'x' * 1024
+    parts = bridge.encode_batch([('on_data', (payload, 1), {'key': bytearray(b'yz')})])
+    frame = memoryview(b''.join(parts))
+
+    [(name, args, kwargs)] = bridge.decode_batch(frame)
+    assert name == 'on_data'
+    if bridge.HAS_PICKLE_BUFFER:
+        assert isinstance(args[0], memoryview)
+        # The payload is not part of the pickle
+        assert payload not in parts[-3]
+        # Views into the frame can't be written to, bytearrays sent included
+        frame = memoryview(bytearray(b''.join(parts)))
+        [(_, args, kwargs)] = bridge.decode_batch(frame)
+        assert args[0].readonly and kwargs['key'].readonly
+    assert bytes(args[0]) == payload and args[1] == 1
+    assert bytes(kwargs['key']) == b'yz'
+
+
+@needs_shared_memory
+def test_ring_wraps_around():
+    name = 'uninhibited-test-%s' % uuid.uuid4().hex[:8]
+    writer = SharedMemoryRing(name, create=True, capacity=64)
+    reader = SharedMemoryRing(name)
+    try:
+        for i in range(20):
+            payload = bytes([i]) * (i % 5 + 20)
+            assert writer.try_write([payload], len(payload))
+            assert not writer.try_write([b'x' * 40], 40)
+            frame = reader.read()
+            assert bytes(frame) == payload
+            frame.release()
+            reader.release()
+            assert reader.read() is None
+
+        with pytest.raises(ValueError):
+            writer.try_write([b'x' * 64], 64)
+    finally:
+        reader.close()
+        writer.close()
+
+
+def bridged_dispatches(transports):
+    local, remote = uninhibited.Dispatch(), uninhibited.Dispatch()
+    recorder = remote.add(Recorder(count=3))
+    local_bridge = Bridge(local, ['on_data'], transports[0])
+    remote_bridge = Bridge(remote, ['on_data'], transports[1])
+    return local, remote, recorder, local_bridge, remote_bridge
+
+
+def check_bridge(transports):
+    local, remote, recorder, local_bridge, remote_bridge = bridged_dispatches(transports)
+    try:
+        results = local.fire('on_data', b'payload', 1)
+        assert [type(h) for h, _ in results] == [RemoteHandler]
+        local.fire('on_data', memoryview(b'view'))
+        local.fire('on_data', key='value')
+
+        assert recorder.done.wait(5)
+        assert recorder.calls == [((b'payload', 1), {}), ((b'view',), {}), ((), {'key': 'value'})]
+        assert local_bridge.flush(5)
+        assert local_bridge.sent == 3 and remote_bridge.received == 3
+        # Received fires are not sent back
+        assert remote_bridge.sent == 0
+    finally:
+        local_bridge.close()
+        remote_bridge.close()
+
+
+@needs_shared_memory
+def test_bridge_over_shared_memory():
+    name = 'uninhibited-test-%s' % uuid.uuid4().hex[:8]
+    creator = bridge.SharedMemoryTransport(name, create=True, capacity=4096)
+    check_bridge([creator, bridge.SharedMemoryTransport(name)])
+
+
+def test_bridge_over_unix_socket():
+    a, b = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    check_bridge([UnixSocketTransport(a), UnixSocketTransport(b)])
+
+
+def _child(name, ready):
+    d = uninhibited.Dispatch()
+
+    class Echo(object):
+        def on_ping(self, value):
+            d.fire('on_pong', os.getpid(), bytes(value))
+
+    d.add(Echo())
+    child = Bridge(d, ['on_ping', 'on_pong'], bridge.open_transport(name))
+    ready.set()
+    child._threads[1].join(10)
+
+
+@needs_shared_memory
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='Needs fork')
+def test_bridge_across_processes():
+    name = 'uninhibited-test-%s' % uuid.uuid4().hex[:8]
+    d = uninhibited.Dispatch()
+    pongs = []
+    done = threading.Event()
+
+    class Pong(object):
+        def on_pong(self, pid, value):
+            pongs.append((pid, bytes(value)))
+            done.set()
+
+    d.add(Pong())
+    parent = Bridge(d, ['on_ping', 'on_pong'], bridge.open_transport(name, create=True))
+    context = multiprocessing.get_context('fork')
+    ready = context.Event()
+    process = context.Process(target=_child, args=(name, ready))
+    process.start()
+    try:
+        assert ready.wait(10)
+        d.fire('on_ping', b'hello')
+        assert done.wait(10)
+        assert pongs == [(process.pid, b'hello')]
+    finally:
+        process.terminate()
+        process.join()
+        parent.close(flush=False)
+
+
+def test_unpicklable_fire_is_reported_and_skipped():
+    a, b = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    errors = []
+    local, remote = uninhibited.Dispatch(), uninhibited.Dispatch()
+    recorder = remote.add(Recorder(count=3))
+    local_bridge = Bridge(local, ['on_data'], UnixSocketTransport(a), start=False,
+                          on_error=lambda name, exc: errors.append(name))
+    remote_bridge = Bridge(remote, ['on_data'], UnixSocketTransport(b))
+    try:
+        # Queued up front, so they go out in one batch
+        local.fire('on_data', 1)
+        local.fire('on_data', lambda: None)
+        local.fire('on_data', 2)
+        local_bridge.start()
+        assert local_bridge.flush(5)
+        local.fire('on_data', lambda: None)
+        local.fire('on_data', 3)
+        assert local_bridge.flush(5)
+
+        assert recorder.done.wait(5)
+        assert [args for args, _ in recorder.calls] == [(1,), (2,), (3,)]
+        assert errors == ['on_data', 'on_data'] and local_bridge.errors == 2
+        assert local_bridge.sent == 5
+    finally:
+        local_bridge.close()
+        remote_bridge.close()
+
+
+@needs_shared_memory
+def test_open_transport_falls_back_to_unix_socket(monkeypatch, tmpdir):
+    def unavailable(*args, **kwargs):
+        raise FileNotFoundError('/dev/shm')
+
+    monkeypatch.setattr(bridge.shared_memory, 'SharedMemory', unavailable)
+    name = 'uninhibited-test-%s' % uuid.uuid4().hex[:8]
+    creator = bridge.open_transport(name, create=True, directory=str(tmpdir))
+    assert isinstance(creator, UnixSocketTransport)
+    check_bridge([creator, bridge.open_transport(name, directory=str(tmpdir), timeout=5)])
@@ -0,0 +1,108 @@
+import functools
+import threading
+import time
+
+import pytest
+
+import uninhibited
+from uninhibited.coalesce import CoalescingEvent, DEBOUNCE, THROTTLE
+
+
+class Recorder(object):
+    def __init__(self):
+        self.calls = []
+        self.called = threading.Event()
+
+    def __call__(self, *args):
+        self.calls.append(args)
+        self.called.set()
+        return args
+
+
+def test_coalesce_delivers_latest_per_key():
+    record = Recorder()
+    e = CoalescingEvent(window=60, key=lambda name, value: name)
+    e += record
+
+    for i in range(1000):
+        e.fire('a', i)
+        e.fire('b', -i)
+    assert e.pending == 2
+    assert record.calls == []
+
+    e.flush()
+    assert sorted(record.calls) == [('a', 999), ('b', -999)]
+    assert e.pending == 0
+
+
+def test_coalesce_merge():
+    record = Recorder()
+
+    def merge(held, new):
+        return (dict(held[0][0], **new[0][0]),), {}
+
+    e = CoalescingEvent(window=60, merge=merge)
+    e += record
+    e.fire({'a': 1})
+    e.fire({'b': 2})
+    e.fire({'a': 3})
+    e.flush()
+    assert record.calls == [({'a': 3, 'b': 2},)]
+
+
+def test_debounce_timer():
+    record = Recorder()
+    e = CoalescingEvent(mode=DEBOUNCE, window=0.05)
+    e += record
+    for i in range(5):
+        e.fire(i)
+        time.sleep(0.01)
+    assert record.called.wait(5)
+    assert record.calls == [(4,)]
+
+
+def test_throttle_delivers_leading_fire_right_away():
+    record = Recorder()
+    e = CoalescingEvent(mode=THROTTLE, rate=1)
+    e += record
+    assert e.fire(1) == [(record, (1,))]
+    assert e.fire(2) == []
+    assert e.fire(3) == []
+    assert record.calls == [(1,)]
+    e.flush()
+    assert record.calls == [(1,), (3,)]
+
+    with pytest.raises(ValueError):
+        CoalescingEvent(mode=THROTTLE)
+
+
+def test_timers_share_one_thread():
+    record = Recorder()
+    e = CoalescingEvent(mode=THROTTLE, rate=50, key=lambda value: value)
+    e += record
+    before = threading.active_count()
+    for _ in range(3):
+        for key in range(20):
+            e.fire(key)
+    # The timer thread, started here unless an earlier test did
+    assert threading.active_count() <= before + 1
+    time.sleep(0.1)
+    assert sorted(record.calls) == sorted([(key,) for key in range(20)] * 2)
+    assert threading.active_count() <= before + 1
+    e.cancel()
+
+
+def test_dispatch_event_factory():
+    class Handler(object):
+        def __init__(self):
+            self.values = []
+
+        def on_config(self, value):
+            self.values.append(value)
+
+    d = uninhibited.Dispatch(event_factory=functools.partial(uninhibited.CoalescingEvent, window=60))
+    handler = d.add(Handler())
+    for i in range(100):
+        d.fire('on_config', i)
+    d['on_config'].flush()
+    assert handler.values == [99]
@@ -0,0 +1,100 @@
+import gc
+
+import pytest
+
+import uninhibited
+from uninhibited import containers
+
+
+class Handler(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def on_echo(self):
+        return self.name
+
+
+def test_weak_list_drops_dead_handlers():
+    e = uninhibited.Event(container_factory=containers.WeakListHandlerCollection)
+    first, second = Handler('first'), Handler('second')
+    e += first.on_echo
+    e += second.on_echo
+    assert [r for _, r in e.fire()] == ['first', 'second']
+
+    del first
+    gc.collect()
+    assert [r for _, r in e.fire()] == ['second']
+    assert len(e) == 1
+
+    e.remove(second.on_echo)
+    assert e.fire() == []
+
+
+def test_weak_list_purges_dead_references_in_batches():
+    container = containers.WeakListHandlerCollection()
+    container.purge_threshold = 4
+    handlers = [Handler(i) for i in range(8)]
+    for handler in handlers:
+        container.add_handler(handler.on_echo)
+
+    del handlers[:3]
+    gc.collect()
+    assert len(container.snapshot) == 5
+    assert len(container.refs) == 8
+
+    del handlers[:1]
+    gc.collect()
+    assert len(container.snapshot) == 4
+    assert len(container.refs) == 4
+
+
+def test_weak_priority_keeps_priority_order():
+    e = uninhibited.PriorityEvent(container_factory=containers.WeakSortedDictPriorityHandlerCollection)
+    low, high, dead = Handler('low'), Handler('high'), Handler('dead')
+    e.add(low.on_echo, priority=10)
+    e.add(dead.on_echo, priority=5)
+    e.add(high.on_echo, priority=0)
+
+    del dead
+    gc.collect()
+    assert [r for _, r in e.fire()] == ['high', 'low']
+    assert [p for p, _ in e.handlers_by_priority] == [0, 10]
+
+    e.remove(high.on_echo)
+    assert [r for _, r in e.fire()] == ['low']
+
+
+@pytest.mark.parametrize('factory', [
+    containers.SortedDictPriorityHandlerCollection,
+    containers.BisectPriorityHandlerCollection,
+    containers.FixedPriorityHandlerCollection,
+])
+def test_priority_collections_agree(factory):
+    e = uninhibited.PriorityEvent(container_factory=factory)
+    e.add(abs, priority=5)
+    e.add(len, priority=0)
+    e.add(str, priority=5)
+    e.add(abs, priority=1)
+    e.add(repr, priority=20)
+
+    assert e.container.snapshot == (len, abs, abs, str, repr)
+    assert [(p, list(hs)) for p, hs in e.handlers_by_priority] == [
+        (0, [len]), (1, [abs]), (5, [abs, str]), (20, [repr])]
+
+    # Removes the latest add
+    e.remove(abs)
+    assert e.container.snapshot == (len, abs, str, repr)
+    e.remove(abs)
+    assert e.container.snapshot == (len, str, repr)
+    with pytest.raises((KeyError, ValueError)):
+        e.remove(abs)
+
+
+def test_fixed_priority_collection_range():
+    collection = containers.FixedPriorityHandlerCollection(levels=4)
+    collection.add_handler(abs, priority=3)
+    for priority in (4, -1, 1.0):
+        with pytest.raises(ValueError):
+            collection.add_handler(abs, priority=priority)
+    assert collection.handlers == [abs]
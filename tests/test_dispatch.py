@@ -29,3 +29,291 @@ def test_given_event_names_are_added():
 
     ret = set(event_names) - set(d.events)
     return not ret
+
+
+class Handler(object):
+
+    def on_echo(self, arg):
+        return arg
+
+    def on_other(self, arg):
+        return 'other', arg
+
+
+class SubHandler(Handler):
+
+    def on_sub(self):
+        return 'sub'
+
+
+class DynamicHandler(object):
+
+    def __getattr__(self, name):
+        if name == 'on_dynamic':
+            return lambda: 'dynamic'
+        raise AttributeError(name)
+
+
+def test_handler_methods_are_attached_from_type_tables():
+    d = uninhibited.Dispatch(['on_echo', 'on_sub'])
+    handler = SubHandler()
+    d.add(handler)
+
+    assert d.fire('on_echo', 1) == [(handler.on_echo, 1)]
+    assert d.fire('on_sub') == [(handler.on_sub, 'sub')]
+
+    # Events added later are attached to handlers of already seen types
+    d.add_event('on_other')
+    assert d.fire('on_other', 2) == [(handler.on_other, ('other', 2))]
+
+    other = SubHandler()
+    d.add(other)
+    assert [h for h, _ in d.fire('on_other', 3)] == [handler.on_other, other.on_other]
+
+
+def test_instance_and_dynamic_handler_methods_are_attached():
+    d = uninhibited.Dispatch(['on_instance', 'on_dynamic'])
+
+    handler = Handler()
+    handler.on_instance = lambda: 'instance'
+    d.add(handler)
+    assert d.fire('on_instance') == [(handler.on_instance, 'instance')]
+
+    dynamic = DynamicHandler()
+    d.add(dynamic)
+    assert [r for _, r in d.fire('on_dynamic')] == ['dynamic']
+
+
+def test_remove_only_detaches_bound_methods():
+    d = uninhibited.Dispatch(['on_echo', 'on_other'])
+    first, second = Handler(), Handler()
+    d.add(first)
+    d.add(second)
+
+    d.remove(first)
+    assert d.fire('on_echo', 1) == [(second.on_echo, 1)]
+    assert d.fire('on_other', 1) == [(second.on_other, ('other', 1))]
+    assert d.handlers == [second]
+
+    try:
+        d.remove(first)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('Removing an absent handler should raise ValueError')
+
+
+def test_remove_undoes_a_single_dupe_add():
+    d = uninhibited.PriorityDispatch(['on_echo'])
+    handler = Handler()
+    d.add(handler)
+    d.add(handler, allow_dupe=True)
+    assert len(d.fire('on_echo', 1)) == 2
+
+    d.remove(handler)
+    assert d.fire('on_echo', 1) == [(handler.on_echo, 1)]
+    d.remove(handler)
+    assert d.fire('on_echo', 1) == []
+    assert d.handlers == []
+
+
+def test_event_remove_handlers_bound_to_instance():
+    e = uninhibited.Event()
+    first, second = Handler(), Handler()
+    e += first.on_echo
+    e += second.on_echo
+    e += first.on_other
+
+    e.remove_handlers_bound_to_instance(first)
+    assert list(e) == [second.on_echo]
+
+
+def test_compact_dispatch():
+    class Handler(object):
+        def on_echo(self, arg):
+            return arg
+
+    d = uninhibited.CompactDispatch(['on_echo'], create_events_on_fire=False)
+    assert type(d).__dictoffset__ == 0
+    assert isinstance(d, uninhibited.CompactDispatch)
+    assert d.create_events_on_fire is False
+    assert uninhibited.CompactDispatch.create_events_on_fire is True
+    assert isinstance(d['on_echo'], uninhibited.CompactEvent)
+
+    handler = d.add(Handler())
+    assert d.fire('on_echo', 1) == [(handler.on_echo, 1)]
+    assert d.fire('on_missing') is None
+
+    d.enable_stats()
+    d.fire('on_echo', 2)
+    assert d.stats()['on_echo']['fires'] == 1
+    assert d.create_events_on_fire is False
+
+    d.remove(handler)
+    assert d.fire('on_echo', 1) == []
+
+
+def test_lazy_binding():
+    class Handler(object):
+        def on_echo(self, arg):
+            return arg
+
+    d = uninhibited.Dispatch(['on_echo'], lazy_binding=True)
+    first = d.add(Handler())
+    assert d.events['on_echo'].container.snapshot == ()
+
+    assert d.fire('on_echo', 1) == [(first.on_echo, 1)]
+    second = d.add(Handler())
+    assert d.fire('on_echo', 2) == [(first.on_echo, 2), (second.on_echo, 2)]
+
+    # Removed before ever being bound to the event
+    third = d.add(Handler())
+    d.remove(third)
+    d.remove(first)
+    assert d.fire('on_echo', 3) == [(second.on_echo, 3)]
+
+    # Events created on fire are bound to handlers added before them
+    handler = d.add(type('Other', (object,), {'on_other': lambda self: 'other'})())
+    assert d.fire('on_other') == [(handler.on_other, 'other')]
+
+
+def test_lazy_binding_compacts_log():
+    class Handler(object):
+        def on_echo(self, arg):
+            return arg
+
+    d = uninhibited.Dispatch(lazy_binding=True)
+    kept = d.add(Handler())
+    assert d.fire('on_echo', 0) == [(kept.on_echo, 0)]
+    for _ in range(200):
+        d.remove(d.add(Handler()))
+    assert len(d._registration_log) < 100
+
+    late = d.add(Handler())
+    assert d.fire('on_echo', 1) == [(kept.on_echo, 1), (late.on_echo, 1)]
+    assert d.handlers == [kept, late]
+
+    d = uninhibited.Dispatch()
+    handlers = [d.add(Handler()) for _ in range(100)]
+    for handler in handlers[10:90]:
+        d.remove(handler)
+    assert len(d._registration_log) < 100
+    assert d.handlers == handlers[:10] + handlers[90:]
+
+
+def test_internal_events_are_created_on_use():
+    d = uninhibited.Dispatch()
+    assert list(d) == []
+    d.add(Handler())
+    assert list(d) == []
+
+    added = []
+    d.on_add_event += added.append
+    d.add_event('on_echo')
+    assert added == ['on_echo']
+
+    class Watcher(object):
+        def __init__(self):
+            self.handlers = []
+
+        def on_handler_add(self, handler):
+            self.handlers.append(handler)
+
+    for lazy_binding in (False, True):
+        d = uninhibited.CompactPriorityDispatch(lazy_binding=lazy_binding)
+        watcher = d.add(Watcher())
+        assert isinstance(d.events['on_handler_add'], uninhibited.CompactPriorityEvent)
+        handler = d.add(Handler())
+        assert watcher.handlers == [watcher, handler]
+        assert 'on_handler_remove' not in d.events
+
+
+def test_schema_events_are_created_on_use():
+    schema = uninhibited.dispatch.Schema(
+        ['on_echo'], event_factories={'on_other': uninhibited.PriorityEvent})
+    created = []
+
+    class CountingDispatch(uninhibited.CompactDispatch):
+        __slots__ = ()
+
+        def _create_event(self, event_factory):
+            created.append(event_factory)
+            return super(CountingDispatch, self)._create_event(event_factory)
+
+    for _ in range(2):
+        d = CountingDispatch(schema=schema, create_events_on_fire=False)
+        assert created == []
+        assert d.schema is schema
+
+    handler = d.add(Handler())
+    assert d.fire('on_echo', 1) == [(handler.on_echo, 1)]
+    assert isinstance(d['on_other'], uninhibited.PriorityEvent)
+    assert created == [uninhibited.CompactEvent, uninhibited.PriorityEvent]
+    assert d.fire('on_missing') is None
+    assert sorted(d) == ['on_echo', 'on_other']
+
+
+def test_readding_an_event_forgets_its_bindings():
+    for lazy_binding in (False, True):
+        d = uninhibited.Dispatch(['on_echo'], lazy_binding=lazy_binding)
+        handler = d.add(Handler())
+        d.add(handler, allow_dupe=True)
+        d['on_echo']
+        d.add_event('on_echo')
+        d.remove(handler)
+        assert d.fire('on_echo', 1) == [(handler.on_echo, 1)]
+        assert [len(bindings) for bindings in d._registrations[id(handler)]] == [1]
+
+
+def test_unhashable_handlers():
+    class Unhashable(Handler):
+        __hash__ = None
+
+        def __eq__(self, other):
+            return isinstance(other, Unhashable)
+
+    for lazy_binding in (False, True):
+        d = uninhibited.Dispatch(['on_echo'], lazy_binding=lazy_binding)
+        first = d.add(Unhashable())
+        second = d.add(Unhashable())
+        assert d.fire('on_echo', 1) == [(first.on_echo, 1), (second.on_echo, 1)]
+        d.remove(second)
+        assert [h.__self__ for h, _ in d.fire('on_echo', 2)] == [first]
+
+
+def test_new_events_bind_handlers_in_add_order():
+    for lazy_binding in (False, True):
+        d = uninhibited.Dispatch(lazy_binding=lazy_binding)
+        first, second = Handler(), Handler()
+        d.add(first)
+        d.add(first, allow_dupe=True)
+        d.add(second)
+        d.remove(first)
+        d.add(first, allow_dupe=True)
+        assert [h.__self__ for h, _ in d.fire('on_echo', 1)] == [first, second, first]
+
+
+def test_compact_dispatch_options_are_per_instance():
+    class Factory(object):
+        __hash__ = None
+
+        def __call__(self):
+            return uninhibited.CompactEvent()
+
+    class LazyDispatch(uninhibited.CompactDispatch):
+        lazy_binding = True
+
+    schema = uninhibited.dispatch.Schema(['on_echo'])
+    d = uninhibited.CompactDispatch(schema=schema, event_factory=Factory())
+    d.enable_stats()
+    assert type(d) is uninhibited.CompactDispatch
+    assert d.schema is schema and d.collect_stats
+    assert d.fire('on_echo') == []
+    assert isinstance(d.events['on_echo'], uninhibited.CompactEvent)
+    other = uninhibited.CompactDispatch()
+    assert other.schema is None and not other.collect_stats
+
+    # Subclass defaults can still be overridden per instance
+    assert LazyDispatch().lazy_binding
+    assert not LazyDispatch(lazy_binding=False).lazy_binding
+    assert LazyDispatch.lazy_binding is True
@@ -1,4 +1,6 @@
 import uninhibited
+from uninhibited import containers
+from uninhibited.utils import _sentinel
 
 pe = uninhibited.PriorityEvent()
 
@@ -15,3 +17,305 @@ pe.add(test, priority=10)
 pe.add(test2, priority=10)
 pe.add(test, priority=0)
 pe.add(test2, priority=500)
+
+
+def test_snapshot_is_reused_until_mutated():
+    e = uninhibited.Event()
+    e.add(test)
+    snapshot = e.container.snapshot
+    assert e.container.snapshot is snapshot
+
+    generation = e.container.generation
+    e.add(test2)
+    assert e.container.generation == generation + 1
+    assert e.container.snapshot == (test, test2)
+
+    e.remove(test)
+    assert e.container.snapshot == (test2,)
+    assert [h for h, _ in e.fire()] == [test2]
+
+
+def test_priority_fire_uses_priority_order():
+    assert [h for h, _ in pe.fire()] == [test, test, test2, test2]
+    assert [h for h, _ in pe.ifire()] == [test, test, test2, test2]
+
+
+def test_fire_many_calls_batch_handlers_once():
+    calls = []
+
+    @uninhibited.batch_handler
+    def batched(payloads, suffix):
+        calls.append(list(payloads))
+        return len(payloads)
+
+    def single(payload, suffix):
+        return '%s%s' % (payload, suffix)
+
+    e = uninhibited.PriorityEvent()
+    e.add(single, priority=0)
+    e.add(batched, priority=10)
+
+    results = e.fire_many(iter([1, 2]), '!')
+    assert list(results) == [(batched, 2), (single, '1!'), (single, '2!')]
+    assert calls == [[1, 2]]
+
+
+def test_dispatch_fire_batch():
+    class Handler(object):
+        def on_payload(self, payload):
+            return payload + 1
+
+    d = uninhibited.Dispatch()
+    handler = d.add(Handler())
+    assert list(d.fire_batch('on_payload', range(3))) == [(handler.on_payload, 1), (handler.on_payload, 2),
+                                                          (handler.on_payload, 3)]
+
+
+def test_compact_event_allocates_container_on_first_add():
+    e = uninhibited.CompactEvent()
+    assert not hasattr(e, '__dict__')
+    assert e.container is containers.EMPTY_HANDLERS
+    assert e.fire() == []
+    assert len(e) == 0
+
+    e += test
+    assert isinstance(e.container, containers.CompactListHandlerCollection)
+    assert [h for h, _ in e.fire()] == [test]
+
+    e.remove(test)
+    assert e.fire() == []
+    assert uninhibited.CompactEvent().container is containers.EMPTY_HANDLERS
+
+
+def test_compact_priority_event_and_stats():
+    e = uninhibited.CompactPriorityEvent()
+    e.add(test2, priority=5)
+    e.add(test, priority=0)
+    assert [h for h, _ in e.fire()] == [test, test2]
+
+    stats = e.enable_stats()
+    e.fire()
+    assert stats.fires == 1
+    e.disable_stats()
+    assert type(e) is uninhibited.CompactPriorityEvent
+
+
+def test_stop_propagation():
+    calls = []
+
+    def first(arg):
+        calls.append('first')
+        return arg
+
+    def veto(arg):
+        calls.append('veto')
+        raise uninhibited.StopPropagation('vetoed')
+
+    def last(arg):
+        calls.append('last')
+
+    e = uninhibited.PriorityEvent()
+    e.add(last, priority=20)
+    e.add(veto, priority=10)
+    e.add(first, priority=0)
+
+    assert e.fire(1) == [(first, 1), (veto, 'vetoed')]
+    assert list(e.ifire(1)) == [(first, 1), (veto, 'vetoed')]
+    assert calls == ['first', 'veto'] * 2
+
+    e.enable_stats()
+    assert e.fire(1) == [(first, 1), (veto, 'vetoed')]
+    assert e.stats.handler(veto).errors == 0
+
+    # Per payload, the rest of the payload's handlers are skipped
+    assert [r for _, r in e.fire_many([1, 2])] == [1, 'vetoed', 2, 'vetoed']
+
+
+def test_dispatch_stop_propagation():
+    class Veto(object):
+        def on_order(self, order):
+            raise uninhibited.StopPropagation(False)
+
+    class Audit(object):
+        def on_order(self, order):
+            return True
+
+    d = uninhibited.Dispatch()
+    veto = d.add(Veto())
+    d.add(Audit())
+    assert d.fire('on_order', 1) == [(veto.on_order, False)]
+
+
+def test_result_modes():
+    calls = []
+
+    def none(arg):
+        calls.append('none')
+
+    def double(arg):
+        calls.append('double')
+        return arg * 2
+
+    def negate(arg):
+        calls.append('negate')
+        return -arg
+
+    e = uninhibited.Event()
+    e += none
+    e += double
+    e += negate
+
+    assert e.fire_discard(1) is None
+    assert e.fire_reduce(list, 1) == [None, 2, -1]
+    del calls[:]
+    assert e.fire_first(1) == 2
+    assert calls == ['none', 'double']
+
+    e = uninhibited.Event(result_mode=uninhibited.DISCARD)
+    e += double
+    assert e.fire(1) is None
+
+    class AllEvent(uninhibited.CompactEvent):
+        __slots__ = ()
+        result_mode = all
+
+    e = AllEvent()
+    e += double
+    e += negate
+    assert e.fire(1) is True
+    e.enable_stats()
+    assert e.fire(0) is False
+    assert e.fire_first(1) == 2
+    assert e.stats.fires == 2
+
+
+def test_result_modes_stop_propagation():
+    def veto(arg):
+        raise uninhibited.StopPropagation('vetoed')
+
+    e = uninhibited.PriorityEvent()
+    e.add(abs, priority=20)
+    e.add(veto, priority=10)
+    e.add(lambda arg: None, priority=0)
+
+    assert e.fire_first(-1) == 'vetoed'
+    assert e.fire_reduce(list, -1) == [None, 'vetoed']
+    assert e.fire_discard(-1) is None
+
+
+def test_dispatch_result_modes():
+    class Handler(object):
+        def on_check(self, value):
+            return value > 0
+
+    d = uninhibited.Dispatch()
+    d.add(Handler())
+    d.add(Handler())
+    assert d.fire_reduce('on_check', all, 1) is True
+    assert d.fire_first('on_check', 1) is True
+    assert d.fire_discard('on_check', 1) is None
+    assert d.fire_first('on_missing') is None
+
+
+def test_fire_by_priority():
+    def veto(arg):
+        raise uninhibited.StopPropagation('vetoed')
+
+    e = uninhibited.PriorityEvent()
+    e.add(abs, priority=0)
+    e.add(str, priority=0)
+    e.add(repr, priority=5)
+    assert e.fire_by_priority(-1) == [(0, [(abs, 1), (str, '-1')]), (5, [(repr, '-1')])]
+
+    e.add(veto, priority=0)
+    assert e.fire_by_priority(-1) == [(0, [(abs, 1), (str, '-1'), (veto, 'vetoed')])]
+
+    e.enable_stats()
+    assert [priority for priority, results in e.ifire_by_priority(-1) if list(results)] == [0]
+    assert e.stats.handler(veto).calls == 1
+    assert e.stats.handler(repr).calls == 0
+
+
+def test_overridden_call_handler_is_used_by_all_fires():
+    class Logged(uninhibited.Event):
+        def _call_handler(self, handler, args, kwargs):
+            return 'logged', super(Logged, self)._call_handler(handler, args, kwargs)
+
+    class LoggedMixin(object):
+        def _call_handler(self, handler, args, kwargs):
+            return 'mixed', super(LoggedMixin, self)._call_handler(handler, args, kwargs)
+
+    class Mixed(LoggedMixin, uninhibited.CompactEvent):
+        __slots__ = ()
+
+    assert uninhibited.Event._inline_calls and not Logged._inline_calls and not Mixed._inline_calls
+
+    e = Logged()
+    e += abs
+    assert e.fire(-1) == list(e.ifire(-1)) == [(abs, ('logged', 1))]
+    assert e.fire_reduce(list, -1) == [('logged', 1)]
+
+    e = Mixed()
+    e += abs
+    assert e.fire(-1) == [(abs, ('mixed', 1))]
+    e.enable_stats()
+    assert e.fire(-1) == [(abs, ('mixed', 1))]
+
+
+def test_overridden_results_and_handlers_are_used():
+    class Doubled(uninhibited.Event):
+        def _results(self, args, kwargs, handlers=_sentinel):
+            for h, result in super(Doubled, self)._results(args, kwargs, handlers):
+                yield h, result * 2
+
+    class Reversed(uninhibited.Event):
+        @property
+        def handlers(self):
+            return reversed(self.container.snapshot)
+
+    assert not Doubled._inline_calls and not Reversed._inline_calls
+
+    e = Doubled()
+    e += abs
+    assert e.fire(-1) == [(abs, 2)]
+
+    e = Reversed()
+    e += abs
+    e += str
+    assert e.fire(-1) == [(str, '-1'), (abs, 1)]
+    assert e.fire_first(-1) == '-1'
+
+
+class BaselineCollection(containers.HandlerCollection):
+    def __init__(self):
+        self.handlers = []
+
+    def add_handler(self, handler):
+        self.handlers.append(handler)
+
+    def remove_handler(self, handler):
+        self.handlers.remove(handler)
+
+    def iter_handlers(self):
+        return iter(self.handlers)
+
+
+def test_custom_container_without_snapshot_support():
+    assert not BaselineCollection.supports_snapshot
+    e = uninhibited.Event(container_factory=BaselineCollection)
+    e += abs
+    assert len(e) == 1
+    assert e.fire(-1) == [(abs, 1)]
+    e += str
+    assert e.fire(-1) == [(abs, 1), (str, '-1')]
+    e -= abs
+    assert e.fire(-1) == [(str, '-1')]
+
+
+def test_container_mutated_through_list_methods():
+    e = uninhibited.Event()
+    assert e.fire(-1) == []
+    e.container.append(abs)
+    assert e.fire(-1) == [(abs, 1)]
+    e.container.remove(abs)
+    assert e.fire(-1) == []
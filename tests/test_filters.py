@@ -0,0 +1,123 @@
+import asyncio
+import collections
+import operator
+
+import uninhibited
+from uninhibited.filters import HandlerIndex
+
+Message = collections.namedtuple('Message', 'tenant body')
+
+
+class Order(Message):
+    pass
+
+
+class Refund(Order):
+    pass
+
+
+def test_type_filters_match_subclasses():
+    e = uninhibited.Event()
+    orders = e.add(lambda msg: 'order', types=Order)
+    refunds = e.add(lambda msg: 'refund', types=Refund)
+    anything = e.add(lambda msg: 'any')
+
+    assert e.fire(Message('a', 1)) == [(anything, 'any')]
+    assert e.fire(Order('a', 1)) == [(orders, 'order'), (anything, 'any')]
+    assert e.fire(Refund('a', 1)) == [(orders, 'order'), (refunds, 'refund'), (anything, 'any')]
+    assert e.fire_first(Refund('a', 1)) == 'order'
+    assert list(e.ifire(Refund('a', 1))) == e.fire(Refund('a', 1))
+
+    e -= orders
+    assert e.fire(Order('a', 1)) == [(anything, 'any')]
+    assert orders not in e._filter_index.filters
+
+
+def test_key_filters():
+    e = uninhibited.PriorityEvent(filter_key=operator.attrgetter('tenant'))
+    e.add(str, priority=20)
+    e.add(repr, priority=10, key='a')
+    e.add(len, priority=0, key='b', types=Order)
+
+    assert [h for h, _ in e.fire(Message('a', 1))] == [repr, str]
+    assert [h for h, _ in e.fire(Message('b', 1))] == [str]
+    assert [h for h, _ in e.fire(Order('b', 1))] == [len, str]
+    # No tenant to filter on
+    assert [h for h, _ in e.fire(object())] == [str]
+
+    # Adding again replaces filters
+    e.remove(repr)
+    e.add(repr, priority=10)
+    assert [h for h, _ in e.fire(Message('b', 1))] == [repr, str]
+
+
+def test_filter_on_named_argument():
+    class TenantEvent(uninhibited.CompactEvent):
+        __slots__ = ()
+        filter_arg = 'tenant'
+
+    def a(value, tenant=None):
+        return 'a'
+
+    def b(value, tenant=None):
+        return 'b'
+
+    e = TenantEvent()
+    e.add(a, key='a')
+    e.add(b, key='b')
+    assert e.fire(1, tenant='a') == [(a, 'a')]
+    assert e.fire(1, tenant='b') == [(b, 'b')]
+    assert e.fire(1) == []
+
+    e.enable_stats()
+    assert e.fire(1, tenant='a') == [(a, 'a')]
+    assert e.stats.handler(b).calls == 0
+
+
+def test_fire_many_filters_each_payload():
+    @uninhibited.batch_handler
+    def count(payloads):
+        return len(payloads)
+
+    e = uninhibited.Event()
+    e.add(abs, types=int)
+    e.add(len, types=str)
+    e.add(count)
+
+    assert list(e.fire_many([-1, 'ab'])) == [(count, 2), (abs, 1), (len, 2)]
+
+
+def test_dispatch_subscriptions_take_filters():
+    d = uninhibited.Dispatch()
+    d.subscribe('order.*', abs, types=int)
+    d.subscribe('order.*', len, types=str)
+    assert d.fire('order.created', -1) == [(abs, 1)]
+
+
+def test_async_event_filters():
+    async def handler(msg):
+        return msg.body
+
+    e = uninhibited.AsyncEvent(filter_key=operator.attrgetter('tenant'))
+    e.add(handler, key='a')
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(e.fire(Message('a', 1)).gather()) == [(handler, 1)]
+        assert loop.run_until_complete(e.fire(Message('b', 1)).gather()) == []
+    finally:
+        loop.close()
+
+
+def test_index_caches_selections_until_handlers_change():
+    index = HandlerIndex()
+    index.set(abs, types=int)
+    handlers = (abs, len)
+    selected = index.select(handlers, (1,), {})
+    assert selected == (abs, len)
+    assert index.select(handlers, (True,), {}) == selected
+    assert index.select(handlers, (2,), {}) is selected
+    assert index.select((len, abs), (2,), {}) == (len, abs)
+    # Unhashable values can still be filtered on by type
+    index.set(len, key=1)
+    assert index.select(handlers, ([],), {}) == ()
@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import pytest
+
+import uninhibited
+
+HEAVY_MODULES = [
+    'asyncio', 'concurrent.futures', 'sortedcontainers', 'six', 'inspect', 'threading', 'contextvars',
+    'uninhibited.dispatch',
+]
+
+
+def imported_modules(statement):
+    """
+    Run statement in a fresh interpreter, returning which of HEAVY_MODULES it imported.
+    """
+    code = '%s\nimport sys\nprint(" ".join(m for m in %r if m in sys.modules))' % (statement, HEAVY_MODULES)
+    return subprocess.check_output([sys.executable, '-c', code]).decode().split()
+
+
+lazy_imports = pytest.mark.skipif(sys.version_info < (3, 7), reason='Lazy imports need module level __getattr__')
+
+
+@lazy_imports
+def test_plain_event_import_is_lean():
+    assert imported_modules('from uninhibited import Event, PriorityEvent') == []
+
+
+@lazy_imports
+def test_lazy_attributes_import_on_access():
+    assert imported_modules('import uninhibited; uninhibited.Dispatch') == ['uninhibited.dispatch']
+    assert 'sortedcontainers' in imported_modules('import uninhibited; uninhibited.PriorityEvent()')
+
+
+def test_all_names_resolve():
+    for name in uninhibited.__all__:
+        assert getattr(uninhibited, name) is not None
+    assert set(uninhibited.__all__) <= set(dir(uninhibited))
@@ -0,0 +1,116 @@
+import asyncio
+import os
+
+import pytest
+
+import uninhibited
+from uninhibited import journal
+from uninhibited.journal import Journal, JournalReader
+
+
+class Recorder(object):
+    def __init__(self):
+        self.calls = []
+
+    def on_order(self, *args, **kwargs):
+        self.calls.append(('on_order', args, kwargs))
+
+    def on_refund(self, *args, **kwargs):
+        self.calls.append(('on_refund', args, kwargs))
+
+
+def test_record_and_replay(tmpdir):
+    d = uninhibited.Dispatch()
+    with Journal(str(tmpdir)) as j:
+        j.attach(d)
+        d.fire('on_order', 1, total=2.5)
+        # Created on fire, after attaching
+        d.fire('on_refund', b'\x00' * 3)
+        d.fire('on_order', [1, 2])
+        assert j.records == 3
+
+    # Detached on close
+    d.fire('on_order', 3)
+    assert all(not isinstance(h, journal.JournalHandler) for h in d.events['on_order'])
+
+    records = list(JournalReader(str(tmpdir)))
+    assert [r[1:] for r in records] == [
+        ('on_order', (1,), {'total': 2.5}),
+        ('on_refund', (b'\x00' * 3,), {}),
+        ('on_order', ([1, 2],), {}),
+    ]
+    assert records[0][0] <= records[-1][0]
+
+    recorder = Recorder()
+    target = uninhibited.Dispatch()
+    target.add(recorder)
+    assert JournalReader(str(tmpdir)).replay(target) == 3
+    assert recorder.calls == [r[1:] for r in records]
+
+
+def test_segments_rotate(tmpdir):
+    j = Journal(str(tmpdir), segment_size=256, buffer_size=64)
+    for i in range(100):
+        j.write('on_order', (i,), {})
+    j.close()
+
+    assert len(journal.list_segments(str(tmpdir))) > 5
+    assert [args for _, _, args, _ in JournalReader(str(tmpdir))] == [(i,) for i in range(100)]
+
+    # A new journal carries on after existing segments
+    with Journal(str(tmpdir)) as j:
+        j.write('on_order', (100,), {})
+    assert [args for _, _, args, _ in JournalReader(str(tmpdir))][-1] == (100,)
+
+
+def test_torn_record_ends_segment(tmpdir):
+    with Journal(str(tmpdir)) as j:
+        for i in range(3):
+            j.write('on_order', (i,), {})
+    [path] = journal.list_segments(str(tmpdir))
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 1)
+
+    assert [args for _, _, args, _ in JournalReader(str(tmpdir))] == [(0,), (1,)]
+
+
+def test_not_a_segment(tmpdir):
+    tmpdir.join('000000000001.journal').write_binary(b'not a journal segment')
+    with pytest.raises(ValueError):
+        list(JournalReader(str(tmpdir)))
+
+
+def test_paced_replay(tmpdir):
+    with Journal(str(tmpdir)) as j:
+        j.write('on_order', (1,), {}, timestamp=100.0)
+        j.write('on_order', (2,), {}, timestamp=101.0)
+        j.write('on_order', (3,), {}, timestamp=103.0)
+
+    sleeps = []
+    reader = JournalReader(str(tmpdir))
+    reader.sleep = sleeps.append
+    assert reader.replay(uninhibited.Dispatch(), speed=2.0) == 3
+    assert [round(s, 1) for s in sleeps] == [0.5, 1.5]
+
+    assert reader.replay(uninhibited.Dispatch(), since=101.0) == 2
+
+
+def test_replay_into_async_dispatch(tmpdir):
+    with Journal(str(tmpdir)) as j:
+        for i in range(3):
+            j.write('on_order', (i,), {})
+
+    calls = []
+
+    async def on_order(value):
+        calls.append(value)
+
+    d = uninhibited.AsyncDispatch()
+    d.subscribe('on_order', on_order)
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(JournalReader(str(tmpdir)).replay_async(d)) == 3
+    finally:
+        loop.close()
+    assert calls == [0, 1, 2]
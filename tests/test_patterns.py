@@ -0,0 +1,67 @@
+import pytest
+
+import uninhibited
+from uninhibited.patterns import PatternTrie
+
+
+def test_trie_matches_wildcards():
+    trie = PatternTrie()
+    trie.add('order.*', 'star')
+    trie.add('order.**.failed', 'globstar')
+    trie.add('order.created', 'exact')
+    trie.add('**', 'all')
+
+    assert trie.match('order.created') == ('star', 'exact', 'all')
+    assert trie.match('order.failed') == ('star', 'globstar', 'all')
+    assert trie.match('order.payment.card.failed') == ('globstar', 'all')
+    assert trie.match('order') == ('all',)
+    assert trie.match('user.created') == ('all',)
+
+
+def test_trie_remove_invalidates_cache_and_prunes():
+    trie = PatternTrie()
+    trie.add('a.**.b', 1)
+    assert trie.match('a.x.y.b') == (1,)
+
+    trie.remove('a.**.b', 1)
+    assert trie.match('a.x.y.b') == ()
+    assert not trie.root
+    assert len(trie) == 0
+
+    with pytest.raises(ValueError):
+        trie.remove('a.**.b', 1)
+
+
+def test_dispatch_subscribe():
+    calls = []
+
+    def on_order(*args):
+        calls.append(args)
+
+    d = uninhibited.Dispatch(['order.created'], create_events_on_fire=False)
+    d.subscribe('order.*', on_order)
+    d.subscribe('order.**.failed', on_order)
+
+    d.fire('order.created', 1)
+    # Created on fire since a pattern matches it, even though create_events_on_fire is off
+    d.fire('order.payment.failed', 2)
+    # Matches both patterns
+    d.fire('order.failed', 3)
+    assert d.fire('user.created', 4) is None
+    assert calls == [(1,), (2,), (3,), (3,)]
+
+    d.unsubscribe('order.*', on_order)
+    del calls[:]
+    d.fire('order.created', 5)
+    d.fire('order.failed', 6)
+    assert calls == [(6,)]
+
+    with pytest.raises(ValueError):
+        d.unsubscribe('order.*', on_order)
+
+
+def test_priority_dispatch_subscribe_kwargs():
+    d = uninhibited.PriorityDispatch()
+    d.subscribe('job.*', str, priority=20)
+    d.subscribe('job.done', len, priority=0)
+    assert d.fire('job.done', [1]) == [(len, 1), (str, '[1]')]
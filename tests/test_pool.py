@@ -0,0 +1,111 @@
+import os
+import threading
+
+import uninhibited
+
+
+def thread_name(*args):
+    return threading.current_thread().name
+
+
+def pid(*args):
+    return os.getpid()
+
+
+def test_thread_pool_event_results_are_in_handler_order():
+    e = uninhibited.ThreadPoolEvent(max_workers=2)
+    e += thread_name
+    e += len
+    try:
+        results = e.fire('abc')
+        assert [h for h, _ in results] == [thread_name, len]
+        assert results[0][1] != threading.current_thread().name
+        assert results[1][1] == 3
+        assert dict(e.ifire('ab'))[len] == 2
+    finally:
+        e.shutdown()
+
+
+def test_process_pool_event_rejects_unpicklable_handlers():
+    e = uninhibited.ProcessPoolEvent()
+    try:
+        e.add(lambda: None)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError('Unpicklable handler should be rejected')
+    assert len(e) == 0
+
+
+def test_process_pool_event_runs_in_other_processes():
+    e = uninhibited.ProcessPoolEvent(max_workers=1)
+    e += pid
+    e += len
+    try:
+        results = e.fire(b'x' * 1024)
+        assert results[0][1] != os.getpid()
+        assert results[1] == (len, 1024)
+    finally:
+        e.shutdown()
+
+
+class Handler(object):
+
+    def on_work(self, value):
+        return value * 2
+
+
+def test_thread_pool_dispatch_shares_its_executor():
+    d = uninhibited.ThreadPoolDispatch(['on_work', 'on_other'], max_workers=2)
+    handler = d.add(Handler())
+    try:
+        assert d.fire('on_work', 2) == [(handler.on_work, 4)]
+        assert d['on_work'].executor is d['on_other'].executor is d.executor
+    finally:
+        d.shutdown()
+
+
+def veto(arg):
+    raise uninhibited.StopPropagation(arg)
+
+
+def test_thread_pool_event_stop_propagation():
+    e = uninhibited.ThreadPoolEvent(max_workers=1)
+    e += veto
+    e += abs
+    try:
+        assert e.fire(-1) == [(veto, -1)]
+        assert list(e.ifire(-1))[-1] == (veto, -1)
+    finally:
+        e.shutdown()
+
+
+def test_thread_pool_event_filters_and_stats():
+    e = uninhibited.ThreadPoolEvent(max_workers=2, filter_key=len)
+    e.add(thread_name, key=2)
+    e.add(abs, types=int)
+    e.enable_stats()
+    try:
+        assert [h for h, _ in e.fire('ab')] == [thread_name]
+        assert e.fire(-1) == [(abs, 1)]
+        assert e.stats.fires == 2
+        assert e.stats.handler(thread_name).calls == 1
+        assert e.stats.handler(abs).calls == 1
+    finally:
+        e.shutdown()
+
+
+def test_thread_pool_dispatch_can_be_used_after_shutdown():
+    d = uninhibited.ThreadPoolDispatch(['on_work'], max_workers=1)
+    handler = d.add(Handler())
+    assert d._executor is None
+    first = d.executor
+    d.fire('on_work', 1)
+    d.shutdown()
+    # Nothing is started again until the next fire
+    assert d._executor is None and d['on_work']._executor is None
+    try:
+        assert d.fire('on_work', 2) == [(handler.on_work, 4)]
+        assert d['on_work'].executor is d.executor is not first
+    finally:
+        d.shutdown()
@@ -0,0 +1,73 @@
+import uninhibited
+from uninhibited import stats
+
+
+def ok(arg):
+    return arg
+
+
+def fail(arg):
+    raise ValueError(arg)
+
+
+def test_event_stats_swap_fire_path():
+    e = uninhibited.PriorityEvent()
+    e.add(ok, priority=0)
+    cls = type(e)
+
+    event_stats = e.enable_stats()
+    assert type(e) is not cls and isinstance(e, cls)
+    e.fire(1)
+    e(2)
+    list(e.ifire(3))
+
+    assert event_stats.fires == 3
+    assert event_stats.latency.count == 2
+    assert event_stats.handler(ok).calls == 3
+
+    e.disable_stats()
+    assert type(e) is cls
+    e.fire(4)
+    assert event_stats.handler(ok).calls == 3
+
+
+def test_handler_errors_are_counted():
+    e = uninhibited.Event()
+    e += fail
+    e.enable_stats()
+    try:
+        e.fire(1)
+    except ValueError:
+        pass
+    handler_stats = e.stats.handler(fail)
+    assert (handler_stats.calls, handler_stats.errors) == (1, 1)
+
+
+class Handler(object):
+
+    def on_echo(self, arg):
+        return arg
+
+
+def test_dispatch_stats():
+    d = uninhibited.Dispatch()
+    handler = d.add(Handler())
+    d.enable_stats()
+    d.fire('on_echo', 1)
+    d.fire('on_echo', 2)
+
+    echo = d.stats()['on_echo']
+    assert echo['fires'] == 2
+    assert echo['handlers'][handler.on_echo]['calls'] == 2
+    assert echo['handlers'][handler.on_echo]['latency']['count'] == 2
+
+
+def test_latency_histogram():
+    histogram = stats.LatencyHistogram()
+    for seconds in (0.000001, 0.000002, 0.001):
+        histogram.record(seconds)
+    assert histogram.count == 3
+    assert histogram.min == 0.000001
+    assert histogram.max == 0.001
+    assert histogram.percentile(50) <= 0.000004
+    assert histogram.percentile(100) == 0.001
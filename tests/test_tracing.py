@@ -0,0 +1,162 @@
+import asyncio
+import json
+
+import pytest
+
+import uninhibited
+from uninhibited import tracing
+from uninhibited.tracing import Tracer
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer().start()
+    yield tracer
+    tracer.stop()
+
+
+def names(tracer):
+    return [(span.name, span.category) for span in tracer.spans]
+
+
+def test_nested_fires_link_to_parent(tracer):
+    inner = uninhibited.Event()
+    inner += abs
+
+    def outer_handler(value):
+        return inner.fire(value)
+
+    outer = uninhibited.PriorityEvent()
+    outer.add(outer_handler)
+    inner.enable_tracing()
+    outer.enable_tracing()
+
+    outer.fire(-1)
+    spans = dict((span.name, span) for span in tracer.spans)
+    assert [span.name for span in tracer.spans] == [
+        'abs', 'Event.fire', tracing.handler_name(outer_handler), 'PriorityEvent.fire']
+    assert spans['PriorityEvent.fire'].parent == 0
+    assert spans[tracing.handler_name(outer_handler)].parent == spans['PriorityEvent.fire'].id
+    assert spans['Event.fire'].parent == spans[tracing.handler_name(outer_handler)].id
+    assert spans['abs'].parent == spans['Event.fire'].id
+    assert all(span.start <= span.end for span in tracer.spans)
+
+
+def test_dispatch_spans(tracer):
+    d = uninhibited.Dispatch()
+    d.add_event('order.a')
+    d.enable_tracing()
+    d.subscribe('order.*', abs)
+
+    assert d.fire('order.a', -1) == [(abs, 1)]
+    # Created on fire, after tracing was enabled
+    assert d.fire_reduce('order.b', list, -2) == [2]
+    assert names(tracer) == [
+        ('abs', 'handler'), ('Event.fire', 'event'), ('order.a', 'dispatch'),
+        ('abs', 'handler'), ('Event.fire_reduce', 'event'), ('order.b', 'dispatch'),
+    ]
+
+    tracer.clear()
+    d.disable_tracing()
+    d.fire('order.a', -1)
+    assert tracer.spans == []
+    assert type(d.events['order.a']) is uninhibited.Event
+
+
+def test_stats_and_tracing_layer(tracer):
+    for first, second in (('stats', 'tracing'), ('tracing', 'stats')):
+        e = uninhibited.Event()
+        e += abs
+        getattr(e, 'enable_%s' % first)()
+        getattr(e, 'enable_%s' % second)()
+        assert e.fire(-1) == [(abs, 1)]
+        assert e.stats.fires == 1
+        assert tracing.is_traced(e)
+
+        e.disable_stats()
+        assert tracing.is_traced(e)
+        e.fire(-1)
+        e.disable_tracing()
+        assert type(e) is uninhibited.Event
+
+    assert names(tracer) == [('abs', 'handler'), ('Event.fire', 'event')] * 4
+
+
+def test_no_spans_unless_started():
+    e = uninhibited.Event()
+    e += abs
+    e.enable_tracing()
+    assert e.fire(-1) == [(abs, 1)]
+
+    tracer = Tracer()
+    assert tracer.spans == []
+    with tracer:
+        e.fire(-1)
+    e.fire(-1)
+    assert len(tracer.spans) == 2
+
+
+def test_ring_overflow():
+    e = uninhibited.Event()
+    e += abs
+    e.enable_tracing()
+    with Tracer(capacity=4) as tracer:
+        for _ in range(3):
+            e.fire(-1)
+    assert len(tracer.spans) == 4
+    assert tracer.dropped == 2
+    assert [span.sequence for span in tracer.spans] == [2, 3, 4, 5]
+
+
+def test_export(tracer, tmpdir):
+    e = uninhibited.Event()
+    e += abs
+    e.enable_tracing()
+    e.fire(-1)
+
+    path = str(tmpdir.join('trace.json'))
+    tracer.export(path)
+    with open(path) as f:
+        trace = json.load(f)
+    [handler, fire] = trace['traceEvents']
+    assert fire['name'] == 'Event.fire'
+    assert fire['ph'] == 'X'
+    assert handler['args']['parent'] == fire['args']['id']
+    assert fire['ts'] <= handler['ts'] and handler['dur'] <= fire['dur']
+
+
+def test_async_handler_spans(tracer):
+    inner = uninhibited.Event()
+    inner += abs
+    inner.enable_tracing()
+
+    async def a(value):
+        await asyncio.sleep(0)
+        return inner.fire(value)
+
+    async def b(value):
+        return value
+
+    d = uninhibited.AsyncDispatch()
+    d.subscribe('on_a', a)
+    d.subscribe('on_a', b)
+    d.enable_tracing()
+    d.enable_stats()
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(d.fire('on_a', -1).gather())
+    finally:
+        loop.close()
+    assert results == [(a, [(abs, 1)]), (b, -1)]
+    assert d.stats()['on_a']['fires'] == 1
+
+    spans = dict((span.name, span) for span in tracer.spans)
+    fire, dispatch = spans['AsyncEvent.fire'], spans['on_a']
+    handler_a, handler_b = spans[tracing.handler_name(a)], spans[tracing.handler_name(b)]
+    assert fire.parent == dispatch.id
+    assert handler_a.parent == handler_b.parent == fire.id
+    # Events fired by a handler task are nested under it
+    assert spans['Event.fire'].parent == handler_a.id
+    # Concurrent handlers each get a lane
+    assert handler_a.tid != handler_b.tid
@@ -1,16 +1,65 @@
 """
 Easy event management.
+
+Only the plain events are imported up front. Dispatches, executor backed and async objects are imported on first
+access, so `from uninhibited import Event` doesn't pull in asyncio, concurrent.futures or sortedcontainers.
 """
 
-from .events import Event, PriorityEvent
-from .dispatch import Dispatch, PriorityDispatch
+import importlib
+import sys
 
-__all__ = ['Event', 'PriorityEvent', 'Dispatch', 'PriorityDispatch']
+from .events import Event, PriorityEvent, CompactEvent, CompactPriorityEvent, StopPropagation, batch_handler
+from .results import DISCARD
+from .utils import _HAS_ASYNCIO, HAS_FUTURES
 
-# Only include async objects if we have asyncio
-from .utils import _HAS_ASYNCIO
+__all__ = [
+    'Event', 'PriorityEvent', 'CompactEvent', 'CompactPriorityEvent',
+    'Dispatch', 'PriorityDispatch', 'CompactDispatch', 'CompactPriorityDispatch',
+    'CoalescingEvent', 'CoalescingPriorityEvent',
+    'StopPropagation', 'batch_handler', 'DISCARD',
+]
+
+# name -> module it's lazily imported from
+_lazy_attrs = dict.fromkeys(['Dispatch', 'PriorityDispatch', 'CompactDispatch', 'CompactPriorityDispatch'], '.dispatch')
+_lazy_attrs.update(dict.fromkeys(['CoalescingEvent', 'CoalescingPriorityEvent'], '.coalesce'))
 
+# Only include executor backed objects if we have concurrent.futures
+if HAS_FUTURES:
+    _names = ['ThreadPoolEvent', 'ProcessPoolEvent', 'ThreadPoolDispatch', 'ProcessPoolDispatch']
+    _lazy_attrs.update(dict.fromkeys(_names, '.pool'))
+    __all__.extend(_names)
+
+# Only include async objects if we have asyncio
 if _HAS_ASYNCIO:
-    from .aio import AsyncEvent, AsyncPriorityEvent, AsyncDispatch, AsyncPriorityDispatch
+    _names = ['AsyncEvent', 'AsyncPriorityEvent', 'AsyncDispatch', 'AsyncPriorityDispatch',
+              'AsyncCoalescingEvent', 'AsyncCoalescingPriorityEvent']
+    _lazy_attrs.update(dict.fromkeys(_names, '.aio'))
+    __all__.extend(_names)
+
+    # The bridge runs received async fires on a loop, so it needs Python 3.5+ as well
+    _lazy_attrs['Bridge'] = '.bridge'
+    __all__.append('Bridge')
+
+    # As does the journal, replaying into async dispatches
+    _lazy_attrs.update(dict.fromkeys(['Journal', 'JournalReader'], '.journal'))
+    __all__.extend(['Journal', 'JournalReader'])
+
+
+def __getattr__(name):
+    try:
+        module = _lazy_attrs[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attrs))
+
 
-    __all__.extend(['AsyncEvent', 'AsyncPriorityEvent', 'AsyncDispatch', 'AsyncPriorityDispatch'])
+# Module level __getattr__ is only supported from Python 3.7 on
+if sys.version_info < (3, 7):
+    for _name in _lazy_attrs:
+        __getattr__(_name)
@@ -1,13 +1,139 @@
 import asyncio
+import collections
 import functools
 import inspect
+import itertools
+import math
 
-from uninhibited.utils import _sentinel
+from uninhibited.utils import StopPropagation, _sentinel, clock
+from uninhibited import tracing
 from uninhibited.events import Event, PriorityEvent
-from uninhibited.dispatch import Dispatch
+from uninhibited.coalesce import CoalescingEventMixin
+from uninhibited.results import DISCARD, first
+from uninhibited.dispatch import Dispatch, PriorityDispatch
+from uninhibited.aio.bus import EventBus
+
+
+async def _raise(exc):
+    raise exc
+
+
+def _started(calls):
+    """
+    Start calls in order. Once an inline handler raises :class:`StopPropagation` while being called, no further calls
+    are started; the last awaitable given raises it instead.
+
+    :param iterator calls: Iterator of callables that each start a handler call, returning an awaitable
+    :return generator: Awaitables of (handler, result) tuples, in handler order
+    """
+    for call in calls:
+        try:
+            f = call()
+        except StopPropagation as stop:
+            yield _raise(stop)
+            return
+        yield f
+
+
+def _is_stop(f):
+    return f.done() and not f.cancelled() and isinstance(f.exception(), StopPropagation)
+
+
+async def _stopped_results(fs):
+    """
+    Collect results once a handler raised :class:`StopPropagation`. Handlers after the first one in handler order to
+    raise it are cancelled; those before it are waited for.
+
+    :param list fs: Futures of (handler, result) tuples, in handler order
+    :return list: Results of handlers up to the first one that raised, in handler order, ending with its result
+    """
+    stop = next(index for index, f in enumerate(fs) if _is_stop(f))
+    for f in fs[stop + 1:]:
+        f.cancel()
+    pending = [f for f in fs[:stop] if not f.done()]
+    if pending:
+        await asyncio.wait(pending)
+
+    results = []
+    for f in fs[:stop + 1]:
+        if f.cancelled():
+            continue
+        exc = f.exception()
+        if exc is None:
+            results.append(f.result())
+        elif isinstance(exc, StopPropagation):
+            results.append((exc.handler, exc.result))
+            break
+        else:
+            raise exc
+    return results
+
+
+class _OrderedResults:
+    """
+    Asynchronous iterator of handler results in handler order, awaiting each in turn. Ends with the result of a handler
+    raising :class:`StopPropagation`.
+    """
+    __slots__ = ('_fs', '_index')
+
+    def __init__(self, fs):
+        """
+        Init.
+
+        :param list fs: Futures of (handler, result) tuples, in handler order
+        """
+        self._fs = fs
+        self._index = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._index >= len(self._fs):
+            raise StopAsyncIteration()
+        f = self._fs[self._index]
+        self._index += 1
+        try:
+            return (await f)[1]
+        except StopPropagation as stop:
+            self._index = len(self._fs)
+            return stop.result
+
+
+async def _any(results):
+    async for result in results:
+        if result:
+            return True
+    return False
+
+
+async def _all(results):
+    async for result in results:
+        if not result:
+            return False
+    return True
+
+
+async def _first(results):
+    async for result in results:
+        if result is not None:
+            return result
+    return None
+
+
+# Reducers that may stop early -> their equivalents taking an asynchronous iterator of results
+_ASYNC_REDUCERS = ((any, _any), (all, _all), (first, _first))
 
 
 class EventFireIter:
+    """
+    Results of an async fire; await it to gather (handler, result) tuples in handler order, or iterate it
+    asynchronously to get them one by one.
+
+    Once a handler raises :class:`StopPropagation`, asynchronous iteration doesn't start any further handlers. Awaiting
+    starts all handlers up front, up to an inline handler raising it, so it can only cancel the handlers after the
+    raising one that are still running; their results are left out, as for sync events.
+    """
     __slots__ = ('_iter')
 
     def __init__(self, iterator):
@@ -30,13 +156,70 @@ class EventFireIter:
             f = next(self._iter)
         except StopIteration as exc:
             raise StopAsyncIteration() from exc
-        return await f
+        try:
+            return await f
+        except StopPropagation as stop:
+            self._iter = iter(())
+            return stop.handler, stop.result
 
     __anext__ = anext
 
     async def gather(self):
-        fs = self
-        return await asyncio.gather(*fs)
+        fs = [asyncio.ensure_future(f) for f in self]
+        try:
+            return await asyncio.gather(*fs)
+        except StopPropagation:
+            return await _stopped_results(fs)
+
+    async def discard(self):
+        """
+        Wait for all handlers, throwing away their results.
+        """
+        await self.gather()
+
+    async def reduce(self, reducer):
+        """
+        Reduce handler results, in handler order.
+
+        A coroutine function reducer is called with an asynchronous iterator of results, fed as they arrive; once it
+        returns, handlers still running are cancelled and no further ones are started. `any`, `all` and
+        :func:`uninhibited.results.first` are reduced that way too, so they stop early just like on sync events. Other
+        reducers are called with all results once every handler finished.
+
+        :param callable reducer: Called with an iterable of handler results in handler order, eg `sum` or `all`, or a
+            coroutine function called with an asynchronous iterator of them.
+        :return object: What reducer returned
+        """
+        for sync, async_reducer in _ASYNC_REDUCERS:
+            if reducer is sync:
+                reducer = async_reducer
+                break
+        if not inspect.iscoroutinefunction(reducer):
+            return reducer(result for _, result in await self.gather())
+
+        fs = [asyncio.ensure_future(f) for f in self]
+        try:
+            return await reducer(_OrderedResults(fs))
+        finally:
+            self.close()
+            for f in fs:
+                if not f.done():
+                    f.cancel()
+
+    async def first(self):
+        """
+        Wait for handlers in handler order until one finishes with a result other than None, cancelling handlers
+        still running then.
+
+        :return object: First result that is not None in handler order, or None
+        """
+        return await self.reduce(first)
+
+    def close(self):
+        """
+        Don't start any further handlers.
+        """
+        self._iter = iter(())
 
     def __await__(self):
         # Voodoo, yes, but this whole PEP is still a bit broken. Sigh.
@@ -61,27 +244,403 @@ class EventFireIter:
         return loop.run_until_complete(f)
 
     def run_in_executor(self, executor=None, loop=None):
+        """
+        Run handlers to completion in executor, on an event loop of their own, eg when they block. Handlers must not
+        have been started yet, ie the fire not iterated or awaited.
+
+        :param concurrent.futures.Executor executor: Executor, the loop's default one if not given
+        :param asyncio.AbstractEventLoop loop: Loop to give the result on
+        :return asyncio.Future: Future of the list of (handler, result) tuples, in handler order
+        """
         if not loop:
             loop = asyncio.get_event_loop()
-        # TODO untested
-        return loop.run_in_executor(executor, self.run_until_complete)
+        return loop.run_in_executor(executor, self._run_on_new_loop)
+
+    def _run_on_new_loop(self):
+        loop = asyncio.new_event_loop()
+        # Handlers are started through the current loop of the thread
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(self.gather())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+
+# Execution policies for plain sync handlers; an Executor instance can be given as well.
+INLINE = 'inline'
+EXECUTOR = 'executor'
+
+
+def can_stop(handler):
+    """
+    Mark a handler as one that may raise :class:`StopPropagation` once started. Fires of an
+    :class:`AsyncPriorityEvent` holding such a handler run priority levels in order, each level finishing before the
+    next starts, so lower priority handlers are not started before it had its say.
+
+    Inline handlers don't need this: raising while being called stops any further handlers from being started.
+
+    :param callable handler: callable handler
+    :return callable: The handler is given back so this can be used as a decorator.
+    """
+    handler.can_stop = True
+    return handler
+
+
+def with_execution(execution):
+    """
+    Set the execution policy of a sync handler, for handlers that are not added via :meth:`AsyncEventMixin.add`
+    directly, eg methods attached by a Dispatch.
+
+    :param str|concurrent.futures.Executor execution: INLINE, EXECUTOR or an Executor instance
+    :return callable: decorator
+    """
+    def decorator(handler):
+        handler.execution = execution
+        return handler
+    return decorator
+
+
+class BoundedEventFireIter(EventFireIter):
+    """
+    :class:`EventFireIter` that keeps at most `limit` handler calls in flight, only starting the next handler once an
+    earlier one finishes. Handlers that have not been started yet take up no task, future or executor slot.
+
+    Asynchronous iteration streams (handler, result) tuples as they complete; :meth:`gather` returns them in handler
+    order.
+    """
+    __slots__ = ('_limit', '_pending', '_done', '_started', '_semaphore', '_stopped_at')
+
+    def __init__(self, calls, limit):
+        """
+        Init.
+
+        :param iterator calls: Iterator of callables that each start a handler call, returning an awaitable
+        :param int limit: Maximum number of calls in flight
+        """
+        super().__init__(calls)
+        self._limit = limit
+        # task -> index of call
+        self._pending = {}
+        self._done = collections.deque()
+        self._started = 0
+        self._semaphore = None
+        # Index of the first call in order to raise StopPropagation, if any did
+        self._stopped_at = None
+
+    def next(self):
+        # Plain iteration hands out awaitables that only start their call once awaited, under our limit
+        call = next(self._iter)
+        return self._bounded(call)
+
+    __next__ = next
+
+    async def _bounded(self, call):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._limit)
+        async with self._semaphore:
+            return await call()
+
+    def _start(self, call):
+        """
+        Start call, keeping track of it while in flight.
+
+        :return asyncio.Future: Task of the call
+        """
+        index = self._started
+        self._started += 1
+        try:
+            f = call()
+        except StopPropagation as stop:
+            # An inline handler stopped propagation while being called, don't start any further calls
+            f = _raise(stop)
+            self._stop_after(index)
+        f = asyncio.ensure_future(f)
+        self._pending[f] = index
+        return f
+
+    def _fill(self):
+        while len(self._pending) < self._limit:
+            try:
+                call = next(self._iter)
+            except StopIteration:
+                break
+            self._start(call)
+
+    async def _completed(self):
+        """
+        Wait for in-flight calls to finish, starting new ones as slots free up.
+
+        :return list: List of tuples of call index, finished task; empty once all calls are done.
+        """
+        self._fill()
+        if not self._pending:
+            return []
+        done, _ = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+        return [(self._pending.pop(f), f) for f in done]
+
+    def _cancel(self):
+        for f in self._pending:
+            f.cancel()
+        self._pending.clear()
+
+    def _stop(self):
+        # Cancel calls in flight, and don't start any more
+        self._cancel()
+        self._iter = iter(())
+
+    def _stop_after(self, index):
+        # Cancel calls in flight that come after the given one in order, and don't start any more
+        if self._stopped_at is None or index < self._stopped_at:
+            self._stopped_at = index
+        self._iter = iter(())
+        for f, i in list(self._pending.items()):
+            if i > self._stopped_at:
+                f.cancel()
+                del self._pending[f]
+
+    async def anext(self):
+        while not self._done:
+            completed = await self._completed()
+            if not completed:
+                raise StopAsyncIteration()
+            self._done.extend(f for _, f in completed)
+        try:
+            return self._done.popleft().result()
+        except StopPropagation as stop:
+            self._stop()
+            self._done.clear()
+            return stop.handler, stop.result
+
+    __anext__ = anext
+
+    async def gather(self):
+        results = await self._gather()
+        return [results[index] for index in sorted(results)]
+
+    async def _gather(self):
+        """
+        Wait for all calls, starting them as slots free up. Once a call raises :class:`StopPropagation`, calls after
+        it are cancelled or not started at all, while those before it are still waited for.
+
+        :return dict: Mapping of call index to (handler, result) tuple, of calls that finished, up to the first one in
+            order that stopped propagation
+        """
+        results = {}
+        while True:
+            completed = await self._completed()
+            if not completed:
+                break
+            for index, f in completed:
+                if f.cancelled():
+                    continue
+                exc = f.exception()
+                if exc is None:
+                    results[index] = f.result()
+                elif isinstance(exc, StopPropagation):
+                    results[index] = exc.handler, exc.result
+                    self._stop_after(index)
+                else:
+                    self._cancel()
+                    raise exc
+        if self._stopped_at is not None:
+            results = dict((index, result) for index, result in results.items() if index <= self._stopped_at)
+        return results
+
+    def as_completed(self):
+        # Asynchronous iteration already yields in completion order
+        return self
+
+    def close(self):
+        self._stop()
+
+    async def wait(self):
+        return await self.gather()
+
+
+class TieredEventFireIter(BoundedEventFireIter):
+    """
+    :class:`EventFireIter` running levels of handlers in order, each level's handlers concurrently. The next level
+    is started once `quorum` handlers of the current one have finished; by default, once all of them have.
+
+    Asynchronous iteration streams (handler, result) tuples as they complete; :meth:`gather` returns them in handler
+    order. Plain iteration gives an awaitable per handler, in handler order, all driven by a single task; see
+    :meth:`close` to stop it early.
+    """
+    __slots__ = ('_quorum', '_count', '_level', '_needed', '_futures', '_handed', '_driver')
+
+    def __init__(self, levels, quorum=None):
+        """
+        Init.
+
+        :param list levels: List of lists of callables that each start a handler call, returning an awaitable
+        :param int|float quorum: Number of handlers of a level that have to finish before the next level starts, or
+            the fraction of them if a float; all of them if None.
+        """
+        super().__init__(iter(levels), None)
+        self._quorum = quorum
+        self._count = sum(len(level) for level in levels)
+        self._level = ()
+        self._needed = 0
+        self._futures = None
+        self._handed = 0
+        self._driver = None
+
+    def _quorum_of(self, size):
+        quorum = self._quorum
+        if quorum is None:
+            return size
+        if isinstance(quorum, float):
+            quorum = int(math.ceil(quorum * size))
+        return min(max(quorum, 1), size)
+
+    def _fill(self):
+        while sum(1 for f in self._level if f.done()) >= self._needed:
+            try:
+                level = next(self._iter)
+            except StopIteration:
+                break
+            started = []
+            for call in level:
+                started.append(self._start(call))
+                if self._stopped_at is not None:
+                    break
+            self._level = started
+            self._needed = self._quorum_of(len(started))
+
+    def next(self):
+        if self._futures is None:
+            loop = asyncio.get_event_loop()
+            self._futures = [loop.create_future() for _ in range(self._count)]
+            # Held on to, as the loop only keeps weak references to tasks
+            self._driver = asyncio.ensure_future(self._drive())
+        if self._handed >= self._count:
+            raise StopIteration()
+        f = self._futures[self._handed]
+        self._handed += 1
+        return f
+
+    __next__ = next
+
+    async def _drive(self):
+        # Resolve the futures handed out by plain iteration as calls finish
+        futures = self._futures
+        try:
+            while True:
+                completed = await self._completed()
+                if not completed:
+                    break
+                for index, f in completed:
+                    if f.cancelled():
+                        futures[index].cancel()
+                        continue
+                    exc = f.exception()
+                    if exc is None:
+                        futures[index].set_result(f.result())
+                    else:
+                        futures[index].set_exception(exc)
+                        if isinstance(exc, StopPropagation):
+                            self._stop_after(index)
+        except Exception as exc:
+            # Hand our own failure to whoever awaits what's left, rather than leaving it on the task unretrieved
+            self._cancel()
+            for f in futures:
+                if not f.done():
+                    f.set_exception(exc)
+        finally:
+            for f in futures:
+                if not f.done():
+                    f.cancel()
+
+    def close(self):
+        """
+        Stop driving awaitables given by plain iteration: calls in flight are cancelled, along with the awaitables of
+        calls not done yet.
+        """
+        if self._driver is not None:
+            self._driver.cancel()
+        self._stop()
 
 
 class AsyncEventMixin:
+    _inline_calls = False
+
+    # Maximum number of handler calls in flight per fire; None for no limit.
+    max_concurrency = None
+
+    # How plain sync handlers are ran: INLINE on the loop, EXECUTOR in the default executor, or in an Executor instance.
+    execution = EXECUTOR
+
+    def __init__(self, *args, execution=None, max_concurrency=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if execution is not None:
+            self.execution = execution
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        # id(handler) -> (handler, is async, execution policy or None for the event's). Keyed by identity, as
+        # handlers needn't be hashable; holding on to the handler keeps its id from being reused.
+        self._handler_kinds = {}
+
+    @staticmethod
+    def _classify(handler, execution=None):
+        is_async = inspect.iscoroutinefunction(handler) or inspect.isgeneratorfunction(handler)
+        if execution is None:
+            execution = getattr(handler, 'execution', None)
+        return is_async, execution
+
+    def add(self, handler, *args, execution=None, **kwargs):
+        """
+        Add handler, detecting its kind once up front.
+
+        :param callable handler: callable handler
+        :param str|concurrent.futures.Executor execution: How to run handler if it's sync, overriding the event's
+            execution policy.
+        :return callable: The handler you added is given back so this can be used as a decorator.
+        """
+        super().add(handler, *args, **kwargs)
+        self._handler_kinds[id(handler)] = (handler,) + self._classify(handler, execution)
+        return handler
+
+    def remove(self, handler):
+        super().remove(handler)
+        # The handler removed may be an equal one rather than the very one given, eg for bound methods
+        kinds = self._handler_kinds
+        live = set(map(id, self._snapshot()))
+        for key in [key for key in kinds if key not in live]:
+            del kinds[key]
+        return handler
 
     def _call_handler(self, *, handler, args, kwargs, loop=None, start=True, executor=None):
         if loop is None:
             loop = asyncio.get_event_loop()
 
-        if (inspect.iscoroutinefunction(handler) or inspect.isgeneratorfunction(handler)):
+        try:
+            _, is_async, execution = self._handler_kinds[id(handler)]
+        except KeyError:
+            # Added to the container directly
+            _, is_async, execution = self._handler_kinds[id(handler)] = (handler,) + self._classify(handler)
+
+        if is_async:
             # Get a coro/future
             f = handler(*args, **kwargs)
         else:
-            # run_in_executor doesn't support kwargs
-            handler = functools.partial(handler, *args, **kwargs)
+            if execution is None:
+                execution = self.execution
 
-            # Get result/coro/future
-            f = loop.run_in_executor(executor, handler)
+            if execution == INLINE:
+                f = loop.create_future()
+                try:
+                    f.set_result(handler(*args, **kwargs))
+                except StopPropagation as stop:
+                    # Raised right away, so the fire doesn't start any further handlers
+                    stop.handler = handler
+                    raise
+                except Exception as exc:
+                    f.set_exception(exc)
+            else:
+                if execution != EXECUTOR:
+                    executor = execution
+                f = self._run_in_executor(loop, executor, handler, args, kwargs)
 
         if start:
             # Wrap future in a task, schedule it for execution
@@ -90,21 +649,38 @@ class AsyncEventMixin:
         # Return a coro that awaits our existing future
         return self._result_tuple(handler, f)
 
+    def _run_in_executor(self, loop, executor, handler, args, kwargs):
+        # run_in_executor doesn't support kwargs
+        return loop.run_in_executor(executor, functools.partial(handler, *args, **kwargs))
+
     async def _result_tuple(self, handler, f):
-        return handler, await f
+        try:
+            return handler, await f
+        except StopPropagation as stop:
+            # Let the fire iterator know whose result it carries
+            stop.handler = handler
+            raise
 
-    def _results(self, args, kwargs, *, handlers=_sentinel, loop=None, start=True, executor=None):
+    def _calls(self, args, kwargs, *, handlers=_sentinel, loop=None, start=True, executor=None):
         if handlers is _sentinel:
-            handlers = self.handlers
+            handlers = self._handlers_for(args, kwargs)
 
         meth = functools.partial(self._call_handler,
                                  args=args,
                                  kwargs=kwargs,
+                                 loop=loop,
                                  start=start,
                                  executor=executor,)
 
-        iterator = (meth(handler=handler) for handler in handlers)
-        return EventFireIter(iterator)
+        return (functools.partial(meth, handler=handler) for handler in handlers)
+
+    def _fire_iter(self, calls):
+        if self.max_concurrency:
+            return BoundedEventFireIter(calls, self.max_concurrency)
+        return EventFireIter(_started(calls))
+
+    def _results(self, args, kwargs, **options):
+        return self._fire_iter(self._calls(args, kwargs, **options))
 
     """ These are overridden to return our iterator """
 
@@ -112,20 +688,347 @@ class AsyncEventMixin:
         fs = self._results(args, kwargs)
         return fs
 
-    fire = ifire
+    def fire(self, *args, **kwargs):
+        fs = self._results(args, kwargs)
+        mode = self.result_mode
+        if mode is None:
+            return fs
+        elif mode is DISCARD:
+            return fs.discard()
+        elif mode is first:
+            return fs.first()
+        return fs.reduce(mode)
+
+    __call__ = fire
+
+    def fire_discard(self, *args, **kwargs):
+        return self._results(args, kwargs).discard()
+
+    def fire_reduce(self, reducer, *args, **kwargs):
+        return self._results(args, kwargs).reduce(reducer)
+
+    def fire_first(self, *args, **kwargs):
+        return self._results(args, kwargs).first()
+
+    def fire_many(self, payloads, *args, **kwargs):
+        batch, single = self._batch_handlers()
+        if batch and not hasattr(payloads, '__len__'):
+            payloads = list(payloads)
+
+        calls = itertools.chain(
+            self._calls((payloads,) + args, kwargs, handlers=batch),
+            itertools.chain.from_iterable(
+                self._calls((p,) + args, kwargs, handlers=self._payload_handlers(single, (p,) + args, kwargs))
+                for p in payloads),
+        )
+        return self._fire_iter(calls)
+
+
+class InstrumentedAsyncEventMixin:
+    """
+    Timed fire path for async events. Handler latency is measured from the handler being scheduled until its result
+    is available; sync handlers sent to an executor additionally record how long they waited there before starting.
+
+    Like :class:`uninhibited.stats.InstrumentedEventMixin`, its methods are copied into the instrumented subclass.
+    """
+
+    def _call_handler(self, *, handler, **kwargs):
+        stats = self.stats.handler(handler)
+        scheduled = clock()
+        try:
+            f = self._uninstrumented_class._call_handler(self, handler=handler, **kwargs)
+        except StopPropagation:
+            stats.record(clock() - scheduled)
+            raise
+        except Exception:
+            stats.record(clock() - scheduled, error=True)
+            raise
+        return self._timed(f, stats, scheduled)
+
+    async def _timed(self, f, stats, scheduled):
+        try:
+            ret = await f
+        except StopPropagation:
+            stats.record(clock() - scheduled)
+            raise
+        except Exception:
+            stats.record(clock() - scheduled, error=True)
+            raise
+        stats.record(clock() - scheduled)
+        return ret
+
+    def _run_in_executor(self, loop, executor, handler, args, kwargs):
+        stats = self.stats.handler(handler)
+        submitted = clock()
+
+        def call():
+            stats.wait.record(clock() - submitted)
+            return handler(*args, **kwargs)
+
+        return loop.run_in_executor(executor, call)
+
+    def ifire(self, *args, **kwargs):
+        self.stats.fires += 1
+        return self._uninstrumented_class.ifire(self, *args, **kwargs)
+
+    def fire(self, *args, **kwargs):
+        self.stats.fires += 1
+        return self._uninstrumented_class.fire(self, *args, **kwargs)
+
     __call__ = fire
 
+    def fire_discard(self, *args, **kwargs):
+        self.stats.fires += 1
+        return self._uninstrumented_class.fire_discard(self, *args, **kwargs)
+
+    def fire_reduce(self, reducer, *args, **kwargs):
+        self.stats.fires += 1
+        return self._uninstrumented_class.fire_reduce(self, reducer, *args, **kwargs)
+
+
+AsyncEventMixin._stats_mixin = InstrumentedAsyncEventMixin
+
+
+class TracedAsyncEventMixin:
+    """
+    Traced fire path for async events; see :func:`uninhibited.tracing.trace`.
+
+    The span of a fire only covers scheduling its handlers. Handler spans last from the handler being scheduled until
+    its result is available, and each goes on a lane of its own, as handlers overlap. Events fired from within a
+    handler, sync or async, are nested under its span.
+    """
+
+    def _results(self, args, kwargs, **options):
+        with tracing.span(tracing.event_span_name(type(self)), 'event'):
+            return self._untraced_class._results(self, args, kwargs, **options)
+
+    def _calls(self, args, kwargs, **options):
+        calls = self._untraced_class._calls(self, args, kwargs, **options)
+        tracer = tracing._active
+        if tracer is None:
+            return calls
+        # Handlers may well be called after the fire returns, outside of its span
+        parent = tracing.current_span()
+        return (functools.partial(self._traced_call, tracer, call, parent) for call in calls)
+
+    def _traced_call(self, tracer, call, parent):
+        span = tracer.next_id()
+        # Tasks of handlers copy the context as they're created, and so start out within the handler's span
+        token = tracing._current.set(span)
+        scheduled = clock()
+        try:
+            f = call()
+        except StopPropagation:
+            tracer.record(tracing.handler_name(call.keywords['handler']), 'handler', scheduled, clock(), span, parent,
+                          tid=id(call))
+            raise
+        finally:
+            tracing._current.reset(token)
+        return self._traced_result(tracer, call.keywords['handler'], f, scheduled, span, parent)
+
+    async def _traced_result(self, tracer, handler, f, scheduled, span, parent):
+        try:
+            return await f
+        finally:
+            tracer.record(tracing.handler_name(handler), 'handler', scheduled, clock(), span, parent, tid=id(f))
+
+
+AsyncEventMixin._tracing_mixin = TracedAsyncEventMixin
+
 
 class AsyncEvent(AsyncEventMixin, Event):
     pass
 
 
 class AsyncPriorityEvent(AsyncEventMixin, PriorityEvent):
+    """
+    :class:`PriorityEvent` with async handlers.
+
+    By default all handlers are started at once, as for :class:`AsyncEvent`; priorities only order results. With
+    `tiered`, priority levels run in order instead, each level's handlers concurrently, and `quorum` lets the next
+    level start before all of the current one has finished. See :class:`TieredEventFireIter`.
+
+    Fires of an event holding handlers marked with :func:`can_stop` run levels in order as well, ignoring `quorum`,
+    so a higher priority handler raising :class:`StopPropagation` keeps lower priority ones from being started.
+    """
+
+    # If True, fires run priority levels in order, see :class:`TieredEventFireIter`
+    tiered = False
+    # Handlers of a level that have to finish before the next one starts when tiered; a count, a fraction, or None
+    # for all of them.
+    quorum = None
+
+    # (snapshot, whether any handler can stop) as of the last fire
+    _can_stop_cache = None
+
+    def __init__(self, *args, tiered=None, quorum=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if tiered is not None:
+            self.tiered = tiered
+        if quorum is not None:
+            if quorum <= 0:
+                raise ValueError("Quorum must be positive: %r" % quorum)
+            self.quorum = quorum
+
+    def _can_stop(self):
+        """
+        Whether any handler is marked with :func:`can_stop`, cached until handlers change.
+        """
+        snapshot = self._snapshot()
+        cached = self._can_stop_cache
+        if cached is None or cached[0] is not snapshot:
+            cached = self._can_stop_cache = (snapshot, any(getattr(h, 'can_stop', False) for h in snapshot))
+        return cached[1]
+
+    def _results(self, args, kwargs, **options):
+        if 'handlers' in options:
+            return super()._results(args, kwargs, **options)
+        can_stop = self._can_stop()
+        if not (self.tiered or can_stop):
+            return super()._results(args, kwargs, **options)
+        levels = [list(self._calls(args, kwargs, handlers=handlers, **options))
+                  for _, handlers in self._levels(args, kwargs)]
+        return TieredEventFireIter(levels, None if can_stop else self.quorum)
+
+    def ifire_by_priority(self, *args, **kwargs):
+        """
+        Fire event by priority level, returning a generator of tuples of priority, :class:`EventFireIter`. Each level's
+        handlers are started when its fire iterator is awaited or iterated.
+        """
+        return ((priority, self._results(args, kwargs, handlers=handlers))
+                for priority, handlers in self._levels(args, kwargs))
+
+    async def fire_by_priority(self, *args, **kwargs):
+        """
+        Fire event by priority level: levels run in order, each level's handlers concurrently, and the next level
+        starts once `quorum` handlers of the current one have finished. Only finished handlers are included.
+
+        :return list: a list of tuples of priority, list of (handler, return value) tuples
+        """
+        levels = self._levels(args, kwargs)
+        quorum = None if self._can_stop() else self.quorum
+        results = await TieredEventFireIter(
+            [list(self._calls(args, kwargs, handlers=handlers)) for _, handlers in levels], quorum)._gather()
+
+        ret = []
+        start = 0
+        for priority, handlers in levels:
+            end = start + len(handlers)
+            level = [results[index] for index in range(start, end) if index in results]
+            if level:
+                ret.append((priority, level))
+            start = end
+        return ret
+
+
+class AsyncCoalescingEventMixin(CoalescingEventMixin):
+    """
+    :class:`uninhibited.coalesce.CoalescingEventMixin` for async events: timers run on the event loop, and fires
+    return an awaitable of the delivery's (handler, result) tuples, shared by all fires coalesced into it.
+    """
+
+    def _schedule(self, delay, callback):
+        return asyncio.get_event_loop().call_later(delay, callback)
+
+    def _waiter(self, slot):
+        return asyncio.get_event_loop().create_future()
+
+    def _deliver(self, payload, waiter=None):
+        task = asyncio.ensure_future(super()._deliver(payload))
+        if waiter is not None:
+            task.add_done_callback(functools.partial(self._resolve_waiter, waiter))
+        return task
+
+    @staticmethod
+    def _resolve_waiter(waiter, task):
+        if waiter.done():
+            return
+        if task.cancelled():
+            waiter.cancel()
+        elif task.exception() is not None:
+            waiter.set_exception(task.exception())
+        else:
+            waiter.set_result(task.result())
+
+    fire = CoalescingEventMixin.fire
+    ifire = fire
+    __call__ = fire
+
+
+class AsyncCoalescingEvent(AsyncCoalescingEventMixin, AsyncEvent):
+    pass
+
+
+class AsyncCoalescingPriorityEvent(AsyncCoalescingEventMixin, AsyncPriorityEvent):
     pass
 
 
 class AsyncDispatchMixin:
 
+    # Default maximum number of handler calls in flight per fire for async events we create; None for no limit.
+    max_concurrency = None
+
+    def __init__(self, *args, max_concurrency=None, **kwargs):
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        super().__init__(*args, **kwargs)
+
+    def _create_event(self, event_factory):
+        event = super()._create_event(event_factory)
+        if self.max_concurrency is not None and isinstance(event, AsyncEventMixin):
+            event.max_concurrency = self.max_concurrency
+        return event
+
+    # Queue of posted events, see start_bus
+    bus = None
+    bus_factory = EventBus
+
+    def start_bus(self, workers=1, maxsize=1024, batch_size=64, on_error=None):
+        """
+        Start draining posted events with a pool of worker tasks. Called with defaults on first :meth:`post`.
+
+        :param int workers: Number of worker tasks
+        :param int maxsize: Maximum number of queued events before producers have to wait
+        :param int batch_size: Maximum number of events a worker takes off the queue at once
+        :param callable on_error: Called with event name, exception for handler errors
+        :return EventBus: Bus
+        """
+        if self.bus is None:
+            self.bus = self.bus_factory(self, workers=workers, maxsize=maxsize, batch_size=batch_size,
+                                        on_error=on_error)
+        self.bus.start()
+        return self.bus
+
+    async def post(self, event, *args, **kwargs):
+        """
+        Queue event to be fired by the bus workers, waiting while the queue is full.
+        """
+        if self.bus is None:
+            self.start_bus()
+        await self.bus.post(event, *args, **kwargs)
+
+    def post_nowait(self, event, *args, **kwargs):
+        """
+        Queue event to be fired by the bus workers, raising asyncio.QueueFull if the queue is full.
+        """
+        if self.bus is None:
+            self.start_bus()
+        self.bus.post_nowait(event, *args, **kwargs)
+
+    async def flush(self):
+        """
+        Wait until all posted events have been fired.
+        """
+        if self.bus is not None:
+            await self.bus.flush()
+
+    async def shutdown(self, flush=True):
+        """
+        Stop the bus workers, firing queued events first unless flush is False.
+        """
+        if self.bus is not None:
+            await self.bus.shutdown(flush=flush)
+
     async def fire_wait(self, event, *args, **kwargs):
         # await ((handler, await f) for handler, f in self.ifire(event, *args, **kwargs))
         results = self.fire(event, *args, **kwargs)
@@ -152,5 +1055,5 @@ class AsyncDispatch(AsyncDispatchMixin, Dispatch):
     event_factory = AsyncEvent
 
 
-class AsyncPriorityDispatch(AsyncDispatchMixin, Dispatch):
+class AsyncPriorityDispatch(AsyncDispatchMixin, PriorityDispatch):
     event_factory = AsyncPriorityEvent
@@ -0,0 +1,161 @@
+import asyncio
+import inspect
+
+
+class EventBus:
+    """
+    Producer/consumer front end for an async dispatch.
+
+    Producers :meth:`post` events into a bounded queue, waiting whenever it's full. A pool of worker tasks drains the
+    queue in batches and fires each event through the dispatch, awaiting its handlers.
+    """
+
+    # Smoothing factor of the drain rate's moving average
+    rate_smoothing = 0.2
+
+    def __init__(self, dispatch, workers=1, maxsize=1024, batch_size=64, on_error=None):
+        """
+        Init.
+
+        :param AsyncDispatch dispatch: Dispatch to fire events through
+        :param int workers: Number of worker tasks draining the queue
+        :param int maxsize: Maximum number of queued events before producers have to wait
+        :param int batch_size: Maximum number of events a worker takes off the queue at once
+        :param callable on_error: Called with event name, exception for handler errors; they are only counted otherwise.
+        """
+        self.dispatch = dispatch
+        self.workers = workers
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.on_error = on_error
+
+        self.posted = 0
+        self.processed = 0
+        self.errors = 0
+        self.drain_rate = 0.0
+
+        self._queue = None
+        self._tasks = []
+        self._last_drain = None
+
+    @property
+    def depth(self):
+        """
+        Number of events waiting in the queue.
+
+        :return int: Queue depth
+        """
+        if self._queue is None:
+            return 0
+        return self._queue.qsize()
+
+    @property
+    def running(self):
+        return bool(self._tasks)
+
+    def start(self):
+        """
+        Start worker tasks on the running loop. Called for you on first post.
+        """
+        if self._tasks:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._last_drain = asyncio.get_event_loop().time()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def post(self, event, *args, **kwargs):
+        """
+        Queue event to be fired, waiting for room in the queue if it's full.
+
+        :param str event: Event name
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        """
+        if not self._tasks:
+            self.start()
+        await self._queue.put((event, args, kwargs))
+        self.posted += 1
+
+    def post_nowait(self, event, *args, **kwargs):
+        """
+        Queue event to be fired.
+
+        :param str event: Event name
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        :raises asyncio.QueueFull: If the queue is full
+        """
+        if not self._tasks:
+            self.start()
+        self._queue.put_nowait((event, args, kwargs))
+        self.posted += 1
+
+    async def flush(self):
+        """
+        Wait until every event posted so far has been fired and its handlers are done.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def shutdown(self, flush=True):
+        """
+        Stop worker tasks.
+
+        :param bool flush: If True, fire all queued events first; otherwise they are dropped.
+        """
+        if flush:
+            await self.flush()
+
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if not flush and self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+                self._queue.task_done()
+
+    async def _fire(self, event, args, kwargs):
+        try:
+            results = self.dispatch.fire(event, *args, **kwargs)
+            if inspect.isawaitable(results):
+                await results
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.errors += 1
+            if self.on_error is not None:
+                self.on_error(event, exc)
+
+    async def _worker(self):
+        queue = self._queue
+        loop = asyncio.get_event_loop()
+
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await asyncio.gather(*(self._fire(*item) for item in batch))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+            self.processed += len(batch)
+
+            now = loop.time()
+            elapsed = now - self._last_drain
+            self._last_drain = now
+            if elapsed > 0:
+                rate = len(batch) / elapsed
+                self.drain_rate += self.rate_smoothing * (rate - self.drain_rate)
+
+    def __repr__(self):
+        return '<%s depth=%s posted=%s processed=%s workers=%s>' % (
+            self.__class__.__name__, self.depth, self.posted, self.processed, len(self._tasks))
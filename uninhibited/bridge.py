@@ -0,0 +1,754 @@
+"""
+Mirror events between the dispatches of processes on one host.
+
+A :class:`Bridge` adds a :class:`RemoteHandler` to each mirrored event of its local dispatch. Firing the event locally
+calls it like any other handler, queueing the fire to be sent to the other end, where it's fired on that process'
+dispatch. Queued fires are sent in batches, serialized together with a single pickle.
+
+Fires travel over a shared memory ring buffer per direction, or a Unix socket where shared memory is not available,
+either on this Python or at runtime, eg without `/dev/shm`.
+`bytes`, `bytearray` and `memoryview` arguments are sent as out of band pickle buffers, so they are not copied into
+the pickle; handlers on the other end get a read only `memoryview` straight into the received frame, which is only
+valid until the handler returns. Copy it, eg with `bytes(view)`, to keep it around.
+
+Usage, in two processes::
+
+    bridge = Bridge(dispatch, ['on_config'], open_transport('workers', create=True))    # first process
+    bridge = Bridge(dispatch, ['on_config'], open_transport('workers', create=False))   # second process
+"""
+
+import collections
+import inspect
+import os
+import pickle
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+from uninhibited.utils import clock
+
+try:
+    from multiprocessing import shared_memory, resource_tracker
+
+    HAS_SHARED_MEMORY = True
+except ImportError:
+    HAS_SHARED_MEMORY = False
+
+# Out of band buffers need pickle protocol 5
+HAS_PICKLE_BUFFER = hasattr(pickle, 'PickleBuffer')
+
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+# Frame header: pickle length, buffer count; followed by the length of each buffer
+_FRAME_HEADER = struct.Struct('<II')
+_BUFFER_LENGTH = struct.Struct('<Q')
+
+
+def encode_batch(batch):
+    """
+    Serialize a batch of fires.
+
+    :param list batch: List of tuples of event name, args, kwargs
+    :return list: Buffers making up the frame, in order; they are not joined, to save a copy.
+    """
+    buffers = []
+    if HAS_PICKLE_BUFFER:
+        batch = [(name, _wrap_args(args), _wrap_kwargs(kwargs)) for name, args, kwargs in batch]
+        data = pickle.dumps(batch, 5, buffer_callback=buffers.append)
+        buffers = [buf.raw() for buf in buffers]
+    else:
+        data = pickle.dumps(batch, pickle.HIGHEST_PROTOCOL)
+
+    parts = [_FRAME_HEADER.pack(len(data), len(buffers))]
+    parts.extend(_BUFFER_LENGTH.pack(buf.nbytes) for buf in buffers)
+    parts.append(data)
+    parts.extend(buffers)
+    return parts
+
+
+def decode_batch(frame):
+    """
+    Deserialize a batch of fires. Out of band buffers are given back as read only views into frame.
+
+    :param memoryview frame: Frame
+    :return list: List of tuples of event name, args, kwargs
+    """
+    data_length, count = _FRAME_HEADER.unpack_from(frame)
+    offset = _FRAME_HEADER.size
+    lengths = []
+    for _ in range(count):
+        lengths.append(_BUFFER_LENGTH.unpack_from(frame, offset)[0])
+        offset += _BUFFER_LENGTH.size
+
+    data = frame[offset:offset + data_length]
+    offset += data_length
+    if not count:
+        return pickle.loads(data)
+
+    buffers = []
+    for length in lengths:
+        # Read only, even for a bytearray sent, as the frame is the transport's own buffer
+        buffers.append(frame[offset:offset + length].toreadonly())
+        offset += length
+    return pickle.loads(data, buffers=buffers)
+
+
+def _wrap(value):
+    if isinstance(value, _BYTES_TYPES):
+        return pickle.PickleBuffer(value)
+    return value
+
+
+def _wrap_args(args):
+    return tuple(_wrap(arg) for arg in args)
+
+
+def _wrap_kwargs(kwargs):
+    return dict((key, _wrap(value)) for key, value in kwargs.items())
+
+
+def _frame_size(parts):
+    return sum(memoryview(part).nbytes for part in parts)
+
+
+class _Backoff(object):
+    """
+    Polling delays, growing from short to `limit` while there's nothing to do.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.delay = 0.00005
+
+    def wait(self):
+        time.sleep(self.delay)
+        self.delay = min(self.delay * 2, self.limit)
+
+
+class SharedMemoryRing(object):
+    """
+    Single producer, single consumer ring buffer of frames in a shared memory segment.
+
+    The header holds the read and write positions; each is only ever written by one side. Positions only grow, the
+    offset in the ring being the position modulo its capacity. Frames are length prefixed and never wrap around; a
+    marker sends the reader back to the start of the ring instead.
+    """
+
+    _POSITION = struct.Struct('<Q')
+    _LENGTH = struct.Struct('<I')
+    _HEAD = 0
+    _TAIL = 8
+    _CAPACITY = 16
+    HEADER_SIZE = 64
+    WRAP = 0xFFFFFFFF
+
+    def __init__(self, name, create=False, capacity=1 << 20):
+        """
+        Init.
+
+        :param str name: Name of the shared memory segment
+        :param bool create: If True, create the segment, otherwise attach to an existing one.
+        :param int capacity: Ring size in bytes, rounded up to a multiple of 8. Only used when creating.
+        """
+        self.created = create
+        if create:
+            capacity = (capacity + 7) & ~7
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.HEADER_SIZE + capacity)
+            self.shm.buf[:self.HEADER_SIZE] = bytes(self.HEADER_SIZE)
+            self._POSITION.pack_into(self.shm.buf, self._CAPACITY, capacity)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            # Only the creating process may unlink the segment; don't let the resource tracker do it on our exit
+            try:
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+            except Exception:
+                pass
+            capacity = self._POSITION.unpack_from(self.shm.buf, self._CAPACITY)[0]
+
+        self.capacity = capacity
+        self.buf = self.shm.buf
+        self.data = self.buf[self.HEADER_SIZE:self.HEADER_SIZE + capacity]
+        self._head = self._get(self._HEAD)
+        self._tail = self._get(self._TAIL)
+        self._pending = 0
+
+    def _get(self, offset):
+        return self._POSITION.unpack_from(self.buf, offset)[0]
+
+    def _set(self, offset, value):
+        self._POSITION.pack_into(self.buf, offset, value)
+
+    def _span(self, length):
+        # Frames are length prefixed and aligned to 8 bytes
+        return (self._LENGTH.size + length + 7) & ~7
+
+    def try_write(self, parts, length):
+        """
+        Write a frame if there's room for it.
+
+        :param list parts: Buffers making up the frame
+        :param int length: Total length of parts
+        :return bool: False if the ring is too full
+        """
+        span = self._span(length)
+        if span > self.capacity:
+            raise ValueError("Frame of %d bytes can't fit a ring of %d bytes" % (length, self.capacity))
+
+        tail = self._tail
+        offset = tail % self.capacity
+        contiguous = self.capacity - offset
+        required = span if span <= contiguous else contiguous + span
+        if self.capacity - (tail - self._get(self._HEAD)) < required:
+            return False
+
+        if span > contiguous:
+            self._LENGTH.pack_into(self.data, offset, self.WRAP)
+            tail += contiguous
+            offset = 0
+
+        self._LENGTH.pack_into(self.data, offset, length)
+        offset += self._LENGTH.size
+        for part in parts:
+            part = memoryview(part).cast('B')
+            self.data[offset:offset + part.nbytes] = part
+            offset += part.nbytes
+
+        # Publish the frame only once it's fully written
+        self._tail = tail + span
+        self._set(self._TAIL, self._tail)
+        return True
+
+    def read(self):
+        """
+        Read the next frame, if any. It must be released with :meth:`release` before reading the next one.
+
+        :return memoryview: View of the frame in the ring, or None if it's empty
+        """
+        while True:
+            head = self._head
+            if head == self._get(self._TAIL):
+                return None
+            offset = head % self.capacity
+            length = self._LENGTH.unpack_from(self.data, offset)[0]
+            if length == self.WRAP:
+                self._head = head + self.capacity - offset
+                self._set(self._HEAD, self._head)
+                continue
+            self._pending = self._span(length)
+            start = offset + self._LENGTH.size
+            return self.data[start:start + length]
+
+    def release(self):
+        """
+        Give the space of the last frame read back to the writer.
+        """
+        self._head += self._pending
+        self._pending = 0
+        self._set(self._HEAD, self._head)
+
+    def close(self):
+        self.data.release()
+        self.buf = self.data = None
+        self.shm.close()
+        if self.created:
+            self.shm.unlink()
+
+
+class SharedMemoryTransport(object):
+    """
+    Duplex transport over two :class:`SharedMemoryRing`, one per direction.
+    """
+
+    # Longest sleep between polls while waiting for frames or room for them
+    poll_interval = 0.005
+
+    def __init__(self, name, create=False, capacity=1 << 20, timeout=10.0):
+        """
+        Init.
+
+        :param str name: Name shared by both ends
+        :param bool create: True on the end that creates the rings, False on the one attaching to them
+        :param int capacity: Size in bytes of each ring
+        :param float timeout: Seconds to wait for the rings to be created, when attaching
+        """
+        names = ('%s-a' % name, '%s-b' % name)
+        if create:
+            rings = []
+            try:
+                for n in names:
+                    rings.append(SharedMemoryRing(n, create=True, capacity=capacity))
+            except Exception:
+                for ring in rings:
+                    ring.close()
+                raise
+            self.outbound, self.inbound = rings
+        else:
+            deadline = clock() + timeout
+            backoff = _Backoff(self.poll_interval)
+            while True:
+                try:
+                    self.inbound, self.outbound = [SharedMemoryRing(n) for n in names]
+                    break
+                except FileNotFoundError:
+                    if clock() > deadline:
+                        raise
+                    backoff.wait()
+
+    def send(self, parts, timeout=None):
+        """
+        Send a frame, waiting for room in the ring.
+
+        :param list parts: Buffers making up the frame
+        :param float timeout: Seconds to wait for room; None to wait forever
+        :raises TimeoutError: If there wasn't room in time
+        """
+        length = _frame_size(parts)
+        deadline = None if timeout is None else clock() + timeout
+        backoff = _Backoff(self.poll_interval)
+        while not self.outbound.try_write(parts, length):
+            if deadline is not None and clock() > deadline:
+                raise TimeoutError("Ring buffer full")
+            backoff.wait()
+
+    def recv(self, timeout=None):
+        """
+        Receive a frame. It's only valid until :meth:`release`.
+
+        :param float timeout: Seconds to wait for one; None to wait forever
+        :return memoryview: Frame, or None on timeout
+        """
+        deadline = None if timeout is None else clock() + timeout
+        backoff = _Backoff(self.poll_interval)
+        while True:
+            frame = self.inbound.read()
+            if frame is not None:
+                return frame
+            if deadline is not None and clock() > deadline:
+                return None
+            backoff.wait()
+
+    def release(self):
+        self.inbound.release()
+
+    def close(self):
+        self.inbound.close()
+        self.outbound.close()
+
+
+class UnixSocketTransport(object):
+    """
+    Duplex transport over a Unix stream socket. Frames are length prefixed, and sent with a single scatter write.
+    """
+
+    _LENGTH = struct.Struct('<Q')
+
+    def __init__(self, sock, listener=None, path=None):
+        """
+        Init.
+
+        :param socket.socket sock: Connected socket, or None if it's yet to be accepted from listener
+        :param socket.socket listener: Listening socket to accept a connection from on first use
+        :param str path: Socket path to remove on close, if we created it
+        """
+        self._sock = sock
+        self._listener = listener
+        self._path = path
+        self._lock = threading.Lock()
+        self._buffer = bytearray(1 << 16)
+
+    @classmethod
+    def listen(cls, path):
+        """
+        Listen on path; the connection is accepted on first use.
+
+        :param str path: Socket path
+        :return UnixSocketTransport: Transport
+        """
+        if os.path.exists(path):
+            os.unlink(path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(1)
+        return cls(None, listener=listener, path=path)
+
+    @classmethod
+    def connect(cls, path, timeout=10.0):
+        """
+        Connect to path, waiting for the other end to listen.
+
+        :param str path: Socket path
+        :param float timeout: Seconds to wait for the other end
+        :return UnixSocketTransport: Transport
+        """
+        deadline = clock() + timeout
+        backoff = _Backoff(0.05)
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(path)
+                return cls(sock)
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if clock() > deadline:
+                    raise
+                backoff.wait()
+
+    @property
+    def sock(self):
+        if self._sock is None:
+            with self._lock:
+                if self._sock is None:
+                    self._sock, _ = self._listener.accept()
+        return self._sock
+
+    def send(self, parts, timeout=None):
+        """
+        Send a frame.
+
+        :param list parts: Buffers making up the frame
+        :param float timeout: Unused, sends block until done
+        """
+        views = [memoryview(self._LENGTH.pack(_frame_size(parts)))]
+        views.extend(memoryview(part).cast('B') for part in parts)
+        sock = self.sock
+        while views:
+            sent = sock.sendmsg(views)
+            # Drop what was sent, a stream socket may send part of it
+            while views and sent >= views[0].nbytes:
+                sent -= views[0].nbytes
+                views.pop(0)
+            if sent:
+                views[0] = views[0][sent:]
+
+    def _recv_into(self, view):
+        sock = self.sock
+        while view.nbytes:
+            received = sock.recv_into(view)
+            if not received:
+                raise EOFError("Connection closed")
+            view = view[received:]
+
+    def recv(self, timeout=None):
+        """
+        Receive a frame. It's only valid until the next :meth:`recv`.
+
+        :param float timeout: Seconds to wait for one; None to wait forever
+        :return memoryview: Frame, or None on timeout
+        """
+        sock = self.sock
+        sock.settimeout(timeout)
+        prefix = bytearray(self._LENGTH.size)
+        try:
+            received = sock.recv_into(prefix)
+        except socket.timeout:
+            return None
+        finally:
+            sock.settimeout(None)
+        if not received:
+            raise EOFError("Connection closed")
+        if received < len(prefix):
+            self._recv_into(memoryview(prefix)[received:])
+
+        length = self._LENGTH.unpack(prefix)[0]
+        if length > len(self._buffer):
+            self._buffer = bytearray(length)
+        frame = memoryview(self._buffer)[:length]
+        self._recv_into(frame)
+        return frame
+
+    def release(self):
+        pass
+
+    def close(self):
+        for sock in (self._sock, self._listener):
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                sock.close()
+        if self._path is not None and os.path.exists(self._path):
+            os.unlink(self._path)
+
+
+def open_transport(name, create=False, capacity=1 << 20, directory=None, timeout=10.0):
+    """
+    Open a transport between two processes on this host: shared memory if available, a Unix socket otherwise.
+
+    Should creating the shared memory fail, eg without `/dev/shm`, the creating end listens on the socket instead. The
+    other end uses whichever of the two it finds first.
+
+    :param str name: Name shared by both ends
+    :param bool create: True on one end, False on the other
+    :param int capacity: Ring size in bytes, for shared memory
+    :param str directory: Directory of the socket, for Unix sockets; defaults to the temp dir
+    :param float timeout: Seconds to wait for the creating end, when attaching
+    :return object: Transport
+    """
+    path = os.path.join(directory or tempfile.gettempdir(), 'uninhibited-%s.sock' % name)
+    if not HAS_SHARED_MEMORY:
+        if create:
+            return UnixSocketTransport.listen(path)
+        return UnixSocketTransport.connect(path, timeout=timeout)
+
+    if create:
+        try:
+            transport = SharedMemoryTransport(name, create=True, capacity=capacity)
+        except OSError:
+            return UnixSocketTransport.listen(path)
+        # Don't let the other end find a socket left behind by an earlier run
+        if os.path.exists(path):
+            os.unlink(path)
+        return transport
+
+    deadline = clock() + timeout
+    backoff = _Backoff(SharedMemoryTransport.poll_interval)
+    while True:
+        if os.path.exists(path):
+            return UnixSocketTransport.connect(path, timeout=max(deadline - clock(), 0))
+        try:
+            return SharedMemoryTransport(name, timeout=0)
+        except FileNotFoundError:
+            if clock() > deadline:
+                raise
+            backoff.wait()
+
+
+class RemoteHandler(object):
+    """
+    Local stand in for the handlers of an event on the other end of a :class:`Bridge`. Calling it queues the fire to
+    be sent there; it returns None right away.
+    """
+
+    __slots__ = ('bridge', 'name')
+
+    def __init__(self, bridge, name):
+        self.bridge = bridge
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        self.bridge.send(self.name, args, kwargs)
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.name)
+
+
+class Bridge(object):
+    """
+    Mirrors events of a local dispatch with the dispatch of another process.
+
+    Fires received from the other end are fired on the local event's handlers, leaving out its :class:`RemoteHandler`
+    so they are not sent back. Handler errors are counted, and passed to `on_error` if given, as are fires that
+    could not be sent, such as ones with arguments that can't be pickled.
+    """
+
+    remote_handler_factory = RemoteHandler
+    # Maximum number of fires serialized into one frame
+    batch_size = 256
+    # Seconds the reader waits for a frame before checking if it should stop
+    poll_timeout = 0.1
+
+    def __init__(self, dispatch, names, transport, on_error=None, loop=None, batch_size=None, start=True):
+        """
+        Init.
+
+        :param Dispatch dispatch: Local dispatch
+        :param list names: Names of events to mirror
+        :param object transport: Transport to the other end, see :func:`open_transport`
+        :param callable on_error: Called with event name, exception for errors of local handlers of received fires, and
+            for fires that could not be sent
+        :param asyncio.AbstractEventLoop loop: Loop to run received fires on, for async dispatches
+        :param int batch_size: Maximum number of fires serialized into one frame
+        :param bool start: If True, start sending and receiving right away
+        """
+        self.dispatch = dispatch
+        self.transport = transport
+        self.on_error = on_error
+        self.loop = loop
+        if batch_size is not None:
+            self.batch_size = batch_size
+
+        # Fires sent, or given up on; see :meth:`flush`
+        self.sent = 0
+        self.received = 0
+        self.errors = 0
+
+        self._outbox = collections.deque()
+        self._queued = 0
+        self._cond = threading.Condition()
+        self._closing = False
+        self._threads = []
+
+        self.remote_handlers = {}
+        for name in names:
+            self.mirror(name)
+
+        if start:
+            self.start()
+
+    def mirror(self, name):
+        """
+        Start mirroring an event.
+
+        :param str name: Event name
+        """
+        if name in self.remote_handlers:
+            return
+        if name not in self.dispatch.events:
+            self.dispatch.add_event(name)
+        handler = self.remote_handlers[name] = self.remote_handler_factory(self, name)
+        self.dispatch.events[name].add(handler)
+
+    def start(self):
+        if self._threads:
+            return
+        for target in (self._writer, self._reader):
+            thread = threading.Thread(target=target, name='uninhibited-bridge-%s' % target.__name__.strip('_'))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def send(self, name, args, kwargs):
+        """
+        Queue a fire to be sent to the other end.
+
+        Arguments are serialized later, on the sending thread; don't modify buffers given as arguments until
+        :meth:`flush` returns.
+
+        :param str name: Event name
+        :param tuple args: positional arguments
+        :param dict kwargs: keyword arguments
+        """
+        with self._cond:
+            self._outbox.append((name, args, kwargs))
+            self._queued += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Wait until all queued fires have been sent, or given up on for errors.
+
+        :param float timeout: Seconds to wait; None to wait forever
+        :return bool: True if everything was sent
+        """
+        with self._cond:
+            queued = self._queued
+            return self._cond.wait_for(lambda: self.sent >= queued or self._closing, timeout)
+
+    def _writer(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._outbox or self._closing)
+                if not self._outbox:
+                    return
+                batch = [self._outbox.popleft() for _ in range(min(len(self._outbox), self.batch_size))]
+
+            try:
+                parts = self._encode(batch)
+                if parts is not None:
+                    self.transport.send(parts)
+            except Exception as exc:
+                for name, _, _ in batch:
+                    self._error(name, exc)
+            finally:
+                with self._cond:
+                    self.sent += len(batch)
+                    self._cond.notify_all()
+
+    def _encode(self, batch):
+        """
+        Serialize a batch of fires, leaving out the ones that can't be.
+
+        :return list|None: Frame parts, or None if no fire could be serialized
+        """
+        try:
+            return encode_batch(batch)
+        except Exception:
+            pass
+        # Pick the bad fires out one by one; this is only done for batches that fail
+        good = []
+        for fire in batch:
+            try:
+                encode_batch([fire])
+            except Exception as exc:
+                self._error(fire[0], exc)
+            else:
+                good.append(fire)
+        if good:
+            return encode_batch(good)
+
+    def _error(self, name, exc):
+        self.errors += 1
+        if self.on_error is not None:
+            self.on_error(name, exc)
+
+    def _reader(self):
+        while not self._closing:
+            try:
+                frame = self.transport.recv(timeout=self.poll_timeout)
+            except (EOFError, OSError):
+                # Other end went away, or we are closing
+                return
+            if frame is None:
+                continue
+            try:
+                batch = decode_batch(frame)
+                for name, args, kwargs in batch:
+                    self._fire(name, args, kwargs)
+                self.received += len(batch)
+            finally:
+                # Views into the frame must be gone before its space is reused
+                batch = args = kwargs = None
+                frame.release()
+                self.transport.release()
+
+    def _fire(self, name, args, kwargs):
+        try:
+            if not self.dispatch._maybe_create_on_fire(name):
+                return
+            event = self.dispatch[name]
+            handlers = tuple(h for h in event.container.snapshot if not isinstance(h, RemoteHandler))
+            results = event._results(args, kwargs, handlers=handlers)
+            if inspect.isawaitable(results):
+                import asyncio
+                asyncio.run_coroutine_threadsafe(_await(results), self.loop).result()
+            else:
+                for _ in results:
+                    pass
+        except Exception as exc:
+            self._error(name, exc)
+
+    def close(self, flush=True):
+        """
+        Stop mirroring, and close the transport.
+
+        :param bool flush: If True, send queued fires first.
+        """
+        if flush:
+            self.flush()
+        for name, handler in self.remote_handlers.items():
+            event = self.dispatch.events.get(name)
+            if event is not None:
+                try:
+                    event.remove(handler)
+                except (KeyError, ValueError):
+                    pass
+        self.remote_handlers = {}
+
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.transport.close()
+
+    def __repr__(self):
+        return '<%s %s sent=%s received=%s>' % (
+            self.__class__.__name__, sorted(self.remote_handlers), self.sent, self.received)
+
+
+async def _await(awaitable):
+    return await awaitable
@@ -0,0 +1,312 @@
+"""
+Events that coalesce bursts of fires, calling their handlers once with the latest payload.
+"""
+
+import functools
+import heapq
+import itertools
+import threading
+import traceback
+
+from uninhibited.events import Event, PriorityEvent
+from uninhibited.utils import clock
+
+# Modes
+COALESCE = 'coalesce'
+DEBOUNCE = 'debounce'
+THROTTLE = 'throttle'
+
+MODES = (COALESCE, DEBOUNCE, THROTTLE)
+
+
+class _Slot(object):
+    """
+    Pending fire of a single key.
+    """
+
+    __slots__ = ('payload', 'deadline', 'timer', 'last', 'waiter')
+
+    def __init__(self):
+        # (args, kwargs) of the pending fire, or None
+        self.payload = None
+        self.deadline = None
+        self.timer = None
+        # When handlers were last called, for throttling
+        self.last = None
+        # Whatever :meth:`CoalescingEventMixin._waiter` gives out to fires waiting on delivery
+        self.waiter = None
+
+
+class _TimerHandle(object):
+    __slots__ = ('callback',)
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def cancel(self):
+        self.callback = None
+
+
+class _Scheduler(object):
+    """
+    Calls callbacks after a delay, one after the other on a single long-lived thread, rather than a thread per timer.
+    """
+
+    def __init__(self):
+        # (deadline, sequence, handle)
+        self._heap = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def schedule(self, delay, callback):
+        """
+        Call callback after delay seconds.
+
+        :return _TimerHandle: Handle, with a cancel method
+        """
+        handle = _TimerHandle(callback)
+        with self._cond:
+            heapq.heappush(self._heap, (clock() + delay, next(self._sequence), handle))
+            # Started on first use, and again in a forked child
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='uninhibited-coalesce-timer')
+                self._thread.daemon = True
+                self._thread.start()
+            self._cond.notify()
+        return handle
+
+    def _run(self):
+        heap = self._heap
+        while True:
+            with self._cond:
+                while True:
+                    if not heap:
+                        self._cond.wait()
+                        continue
+                    delay = heap[0][0] - clock()
+                    if delay <= 0:
+                        handle = heapq.heappop(heap)[2]
+                        break
+                    self._cond.wait(delay)
+            callback = handle.callback
+            if callback is None:
+                continue
+            try:
+                callback()
+            except Exception:
+                # Keep going for other timers, reporting it like an uncaught error of a thread of its own would be
+                traceback.print_exc()
+
+
+_scheduler = _Scheduler()
+
+
+class CoalescingEventMixin(object):
+    """
+    Holds on to fires instead of calling handlers right away, calling them once per key with the latest payload.
+
+    Modes:
+
+    - COALESCE: Handlers are called `window` seconds after the first of a burst of fires.
+    - DEBOUNCE: Handlers are called once fires have stopped for `window` seconds.
+    - THROTTLE: Handlers are called at most `rate` times per second; a fire is delivered right away if allowed,
+      otherwise the latest one is delivered as soon as it is.
+
+    Fires are told apart by `key`, called with the fire's arguments; fires with different keys are held separately.
+    Held fires replace one another, unless `merge` is given: it's called with the (args, kwargs) of the held fire and
+    of the new one, returning the (args, kwargs) to hold instead.
+
+    Handlers are called from a timer: for synchronous events, on a timer thread shared by all coalescing events, one
+    delivery at a time; use :meth:`flush` to deliver held fires right away.
+    """
+
+    mode = COALESCE
+    # Seconds to hold fires for, in COALESCE and DEBOUNCE modes
+    window = 0.1
+    # Deliveries per second, in THROTTLE mode
+    rate = None
+    key = None
+    merge = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        Init.
+
+        :param str mode: COALESCE, DEBOUNCE or THROTTLE
+        :param float window: Seconds to hold fires for, in COALESCE and DEBOUNCE modes
+        :param float rate: Deliveries per second per key, in THROTTLE mode
+        :param callable key: Called with each fire's arguments to get the key it's held under
+        :param callable merge: Called with held and new (args, kwargs) to merge them, instead of replacing
+        """
+        for name in ('mode', 'window', 'rate', 'key', 'merge'):
+            value = kwargs.pop(name, None)
+            if value is not None:
+                setattr(self, name, value)
+        super(CoalescingEventMixin, self).__init__(*args, **kwargs)
+
+        if self.mode not in MODES:
+            raise ValueError("Unknown mode: %r" % self.mode)
+        if self.mode == THROTTLE and not self.rate:
+            raise ValueError("A rate is required to throttle")
+
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _schedule(self, delay, callback):
+        """
+        Call callback after delay seconds.
+
+        :return object: Timer, with a cancel method
+        """
+        return _scheduler.schedule(delay, callback)
+
+    def _waiter(self, slot):
+        """
+        What a fire that's being held returns.
+        """
+        return []
+
+    def _deliver(self, payload, waiter=None):
+        """
+        Call handlers with payload.
+
+        :param tuple payload: (args, kwargs)
+        :param object waiter: Waiter of the fires being delivered
+        """
+        args, kwargs = payload
+        return super(CoalescingEventMixin, self).fire(*args, **kwargs)
+
+    def fire(self, *args, **kwargs):
+        """
+        Fire event, holding it to be delivered later according to our mode.
+
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        :return list: Results of handlers if the fire was delivered right away, otherwise an empty list.
+        """
+        key = self.key(*args, **kwargs) if self.key is not None else None
+        payload = (args, kwargs)
+
+        with self._lock:
+            now = clock()
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = _Slot()
+
+            if self.mode == THROTTLE:
+                interval = 1.0 / self.rate
+                if slot.payload is None and (slot.last is None or now - slot.last >= interval):
+                    slot.last = now
+                    if slot.timer is None:
+                        # Drops the slot once the interval is over, unless a fire is held by then
+                        slot.timer = self._schedule(interval, functools.partial(self._on_timer, key))
+                    deliver = True
+                else:
+                    deliver = False
+                    delay = slot.last + interval - now
+            else:
+                deliver = False
+                if slot.payload is None or self.mode == DEBOUNCE:
+                    slot.deadline = now + self.window
+                delay = self.window
+
+            if not deliver:
+                if slot.payload is not None and self.merge is not None:
+                    payload = self.merge(slot.payload, payload)
+                slot.payload = payload
+                if slot.timer is None:
+                    slot.timer = self._schedule(max(delay, 0), functools.partial(self._on_timer, key))
+                if slot.waiter is None:
+                    slot.waiter = self._waiter(slot)
+                return slot.waiter
+
+        return self._deliver(payload)
+
+    __call__ = fire
+
+    def ifire(self, *args, **kwargs):
+        return iter(self.fire(*args, **kwargs))
+
+    def _on_timer(self, key):
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                return
+            slot.timer = None
+            now = clock()
+
+            if self.mode == THROTTLE:
+                interval = 1.0 / self.rate
+                remaining = slot.last + interval - now
+            else:
+                remaining = slot.deadline - now
+            if remaining > 0:
+                # Debounced again, or woke up early
+                slot.timer = self._schedule(remaining, functools.partial(self._on_timer, key))
+                return
+
+            payload, waiter = slot.payload, slot.waiter
+            slot.payload = slot.waiter = None
+            if payload is None:
+                del self._slots[key]
+                return
+            if self.mode == THROTTLE:
+                slot.last = now
+                slot.timer = self._schedule(interval, functools.partial(self._on_timer, key))
+            else:
+                del self._slots[key]
+
+        self._deliver(payload, waiter)
+
+    def _take_all(self):
+        with self._lock:
+            slots, self._slots = self._slots, {}
+        for slot in slots.values():
+            if slot.timer is not None:
+                slot.timer.cancel()
+        return [(slot.payload, slot.waiter) for slot in slots.values() if slot.payload is not None]
+
+    def flush(self):
+        """
+        Deliver all held fires right away.
+
+        :return list: Results of each delivery
+        """
+        return [self._deliver(payload, waiter) for payload, waiter in self._take_all()]
+
+    def cancel(self):
+        """
+        Drop all held fires.
+        """
+        self._take_all()
+
+    @property
+    def pending(self):
+        """
+        Number of held fires.
+
+        :return int: Count
+        """
+        return sum(1 for slot in list(self._slots.values()) if slot.payload is not None)
+
+
+class CoalescingEvent(CoalescingEventMixin, Event):
+    """
+    :class:`Event` coalescing bursts of fires; see :class:`CoalescingEventMixin`.
+
+    To have a Dispatch create these, give it a factory such as `functools.partial(CoalescingEvent, mode=DEBOUNCE)`.
+
+    >>> e = CoalescingEvent(window=60)
+    >>> e += abs
+    >>> e.fire(-1), e.fire(-2), e.pending
+    ([], [], 1)
+    >>> e.flush()
+    [[(<built-in function abs>, 2)]]
+    """
+
+
+class CoalescingPriorityEvent(CoalescingEventMixin, PriorityEvent):
+    """
+    :class:`PriorityEvent` coalescing bursts of fires; see :class:`CoalescingEventMixin`.
+    """
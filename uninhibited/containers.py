@@ -1,12 +1,62 @@
 import abc
+import bisect
+import itertools
+import types
 import weakref
-import six
 import warnings
-import sortedcontainers
 
+try:
+    integer_types = (int, long)
+except NameError:
+    integer_types = (int,)
 
-@six.add_metaclass(abc.ABCMeta)
-class HandlerCollection(object):
+# sortedcontainers is only imported once a SortedDict based collection is created, keeping `import uninhibited` lean.
+
+try:
+    WeakMethod = weakref.WeakMethod
+except AttributeError:
+    class WeakMethod(object):
+        """
+        Minimal stand in for Python 3's :class:`weakref.WeakMethod`: weakly references a bound method's instance.
+        """
+
+        def __init__(self, meth, callback=None):
+            self._func = meth.__func__
+            if callback is not None:
+                self_ref = weakref.ref(self)
+
+                def _callback(ref):
+                    self = self_ref()
+                    if self is not None:
+                        callback(self)
+            else:
+                _callback = None
+            self._obj = weakref.ref(meth.__self__, _callback)
+
+        def __call__(self):
+            obj = self._obj()
+            if obj is None:
+                return None
+            return types.MethodType(self._func, obj)
+
+
+# List methods that mutate, see :meth:`HandlerCollection.__getattr__`
+_LIST_MUTATORS = frozenset(('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse'))
+
+
+class HandlerCollection(abc.ABCMeta('ABC', (object,), {'__slots__': ()})):
+    __slots__ = ()
+
+    # If True, every mutation calls :meth:`_changed`, so :attr:`snapshot` can be cached between them. Subclasses
+    # overriding :meth:`add_handler`, :meth:`remove_handler` or :meth:`iter_handlers` have it turned off for them on
+    # Python 3.6+, unless they set it themselves.
+    supports_snapshot = False
+
+    # Bumped on every mutation, see :meth:`_changed`.
+    generation = 0
+
+    _snapshot = ()
+    _snapshot_generation = 0
 
     @abc.abstractmethod
     def add_handler(self, handler):
@@ -31,27 +81,123 @@ class HandlerCollection(object):
     def __iter__(self):
         return self.iter_handlers()
 
+    def __init_subclass__(cls, **kwargs):
+        super(HandlerCollection, cls).__init_subclass__(**kwargs)
+        if 'supports_snapshot' not in vars(cls) and cls.supports_snapshot:
+            overrides = ('add_handler', 'remove_handler', 'iter_handlers')
+            cls.supports_snapshot = not any(name in vars(cls) for name in overrides)
+
+    def _changed(self):
+        """
+        Mark handlers as changed. Collections supporting snapshots must call this after every mutation so
+        :attr:`snapshot` is rebuilt.
+        """
+        self.generation += 1
+
+    @property
+    def snapshot(self):
+        """
+        Immutable tuple of handlers in call order. If :attr:`supports_snapshot`, it is only rebuilt when
+        :attr:`generation` has moved on since the last build, so repeated fires between mutations share the same
+        tuple. Otherwise it is built anew on every access.
+
+        :return tuple: Handlers in call order
+        """
+        if not self.supports_snapshot:
+            return tuple(self.iter_handlers())
+        if self._snapshot_generation != self.generation:
+            self._snapshot = tuple(self.iter_handlers())
+            self._snapshot_generation = self.generation
+        return self._snapshot
+
     def __getattr__(self, item):
-        return getattr(self.handlers, item)
+        attr = getattr(self.handlers, item)
+        if item not in _LIST_MUTATORS:
+            return attr
+
+        def mutate(*args, **kwargs):
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self._changed()
+
+        return mutate
 
 
 class ListHandlerCollection(HandlerCollection):
 
+    supports_snapshot = True
+
+    def __init__(self):
+        self.handlers = list()
+
+    def add_handler(self, handler):
+        self.handlers.append(handler)
+        self._changed()
+
+    def remove_handler(self, handler):
+        self.handlers.remove(handler)
+        self._changed()
+
+    def iter_handlers(self):
+        return iter(self.handlers)
+
+
+class CompactListHandlerCollection(HandlerCollection):
+    """
+    :class:`ListHandlerCollection` without an instance __dict__.
+    """
+
+    __slots__ = ('handlers', 'generation', '_snapshot', '_snapshot_generation')
+
+    supports_snapshot = True
+
     def __init__(self):
         self.handlers = list()
+        self.generation = 0
+        self._snapshot = ()
+        self._snapshot_generation = 0
 
     def add_handler(self, handler):
         self.handlers.append(handler)
+        self._changed()
 
     def remove_handler(self, handler):
         self.handlers.remove(handler)
+        self._changed()
 
     def iter_handlers(self):
         return iter(self.handlers)
 
 
-@six.add_metaclass(abc.ABCMeta)
+class EmptyHandlerCollection(HandlerCollection):
+    """
+    Read only collection without handlers, shared by events that have none yet; see :data:`EMPTY_HANDLERS`.
+    """
+
+    __slots__ = ()
+
+    handlers = ()
+    snapshot = ()
+
+    def add_handler(self, handler, priority=None):
+        raise TypeError("The shared empty handler collection is read only")
+
+    def remove_handler(self, handler):
+        raise ValueError("Handler not present: %s" % handler)
+
+    def iter_handlers(self):
+        return iter(())
+
+    def iter_handlers_by_priority(self):
+        return ()
+
+
+EMPTY_HANDLERS = EmptyHandlerCollection()
+
+
 class PriorityHandlerCollection(HandlerCollection):
+    __slots__ = ()
 
     @abc.abstractmethod
     def add_handler(self, handler, priority=10):
@@ -69,21 +215,271 @@ class PriorityHandlerCollection(HandlerCollection):
 
 class SortedDictPriorityHandlerCollection(PriorityHandlerCollection):
 
+    supports_snapshot = True
+
     def __init__(self):
+        import sortedcontainers
         self.map = sortedcontainers.SortedDict()
-        self.weakmap = weakref.WeakKeyDictionary()
+        # handler -> priorities it was added with, latest last. The map holds strong references anyway, and weak keys
+        # would vanish as soon as an equal (but not identical) bound method gets removed.
+        self.priorities = dict()
 
     def add_handler(self, handler, priority=10):
         if priority not in self.map:
             self.map[priority] = list()
         self.map[priority].append(handler)
-        self.weakmap[handler] = priority
+        self.priorities.setdefault(handler, []).append(priority)
+        self._changed()
 
     def remove_handler(self, handler):
-        priority = self.weakmap.pop(handler)
+        priorities = self.priorities[handler]
+        priority = priorities.pop()
+        if not priorities:
+            del self.priorities[handler]
         self.map[priority].remove(handler)
         if not self.map[priority]:
             del self.map[priority]
+        self._changed()
 
     def iter_handlers_by_priority(self):
         return self.map.items()
+
+
+class BisectPriorityHandlerCollection(PriorityHandlerCollection):
+    """
+    Keeps handlers in a flat list in call order, alongside a parallel sorted list of their priorities, placing each
+    new handler with :func:`bisect.bisect_right`. Iterating is a plain walk over the list.
+    """
+
+    supports_snapshot = True
+
+    def __init__(self):
+        self.handlers = list()
+        self.keys = list()
+        # handler -> priorities it was added with, latest last
+        self.priorities = dict()
+        self._by_priority = None
+
+    def add_handler(self, handler, priority=10):
+        index = bisect.bisect_right(self.keys, priority)
+        self.keys.insert(index, priority)
+        self.handlers.insert(index, handler)
+        self.priorities.setdefault(handler, []).append(priority)
+        self._changed()
+
+    def remove_handler(self, handler):
+        priorities = self.priorities[handler]
+        priority = priorities[-1]
+        start = bisect.bisect_left(self.keys, priority)
+        index = self.handlers.index(handler, start, bisect.bisect_right(self.keys, priority, start))
+        priorities.pop()
+        if not priorities:
+            del self.priorities[handler]
+        del self.keys[index]
+        del self.handlers[index]
+        self._changed()
+
+    def _changed(self):
+        super(BisectPriorityHandlerCollection, self)._changed()
+        self._by_priority = None
+
+    def iter_handlers(self):
+        return iter(self.handlers)
+
+    def iter_handlers_by_priority(self):
+        if self._by_priority is None:
+            pairs = itertools.groupby(zip(self.keys, self.handlers), key=lambda pair: pair[0])
+            self._by_priority = [(priority, [handler for _, handler in group]) for priority, group in pairs]
+        return self._by_priority
+
+
+class FixedPriorityHandlerCollection(PriorityHandlerCollection):
+    """
+    Keeps one list of handlers per integer priority out of a small fixed range, `0 <= priority < levels`.
+
+    Use :func:`functools.partial` to get a factory for another range, eg `partial(FixedPriorityHandlerCollection, 4)`.
+    """
+
+    supports_snapshot = True
+
+    levels = 32
+
+    def __init__(self, levels=None):
+        """
+        Init.
+
+        :param int levels: Number of priorities
+        """
+        if levels is not None:
+            self.levels = levels
+        self.buckets = [[] for _ in range(self.levels)]
+        self.priorities = dict()
+        self._by_priority = None
+
+    @property
+    def handlers(self):
+        return list(self.snapshot)
+
+    def add_handler(self, handler, priority=10):
+        if not isinstance(priority, integer_types) or not 0 <= priority < self.levels:
+            raise ValueError("Priority must be an integer from 0 to %d: %r" % (self.levels - 1, priority))
+        self.buckets[priority].append(handler)
+        self.priorities.setdefault(handler, []).append(priority)
+        self._changed()
+
+    def remove_handler(self, handler):
+        priorities = self.priorities[handler]
+        priority = priorities.pop()
+        if not priorities:
+            del self.priorities[handler]
+        self.buckets[priority].remove(handler)
+        self._changed()
+
+    def _changed(self):
+        super(FixedPriorityHandlerCollection, self)._changed()
+        self._by_priority = None
+
+    def iter_handlers(self):
+        return itertools.chain.from_iterable(self.buckets)
+
+    def iter_handlers_by_priority(self):
+        if self._by_priority is None:
+            self._by_priority = [(priority, handlers) for priority, handlers in enumerate(self.buckets) if handlers]
+        return self._by_priority
+
+
+def weak_handler_ref(handler, callback=None):
+    """
+    Weak reference to handler. Bound methods are referenced through their instance, as they are usually created on
+    attribute access and would die right away otherwise.
+
+    :param callable handler: Handler
+    :param callable callback: Called with the reference once handler dies
+    :return callable: Reference; call it to get handler, or None if it died
+    """
+    if getattr(handler, '__self__', None) is not None and hasattr(handler, '__func__'):
+        return WeakMethod(handler, callback)
+    return weakref.ref(handler, callback)
+
+
+class WeakHandlerCollectionMixin(object):
+    """
+    Common weak reference handling.
+
+    Dead references are only counted when handlers die, and skipped over when iterating. They are purged in a single
+    batch once enough of them piled up, rather than on every fire.
+
+    Since the snapshot of live handlers can't be held on to without keeping them alive, it is resolved on access.
+    """
+
+    # Purge once this many dead references piled up, or a quarter of all of them are dead, whichever is more
+    purge_threshold = 16
+
+    _dead = 0
+
+    def _ref(self, handler):
+        self_ref = weakref.ref(self)
+
+        def on_dead(ref):
+            self = self_ref()
+            if self is not None:
+                self._dead += 1
+
+        return weak_handler_ref(handler, on_dead)
+
+    def _should_purge(self, total):
+        return self._dead and self._dead >= max(self.purge_threshold, total // 4)
+
+    @staticmethod
+    def _resolve(refs):
+        return [handler for handler in (ref() for ref in refs) if handler is not None]
+
+    @staticmethod
+    def _index_of(refs, handler):
+        for index, ref in enumerate(refs):
+            if ref() == handler:
+                return index
+        raise ValueError("Handler not present: %s" % handler)
+
+    @property
+    def snapshot(self):
+        return tuple(self.iter_handlers())
+
+    @property
+    def handlers(self):
+        return list(self.iter_handlers())
+
+
+class WeakListHandlerCollection(WeakHandlerCollectionMixin, HandlerCollection):
+    """
+    Keeps handlers in order, only holding weak references to them.
+    """
+
+    def __init__(self):
+        self.refs = list()
+
+    def add_handler(self, handler):
+        self.refs.append(self._ref(handler))
+        self._maybe_purge()
+        self._changed()
+
+    def remove_handler(self, handler):
+        del self.refs[self._index_of(self.refs, handler)]
+        self._changed()
+
+    def _maybe_purge(self):
+        if self._should_purge(len(self.refs)):
+            self.refs = [ref for ref in self.refs if ref() is not None]
+            self._dead = 0
+
+    def iter_handlers(self):
+        self._maybe_purge()
+        return iter(self._resolve(self.refs))
+
+
+class WeakSortedDictPriorityHandlerCollection(WeakHandlerCollectionMixin, PriorityHandlerCollection):
+    """
+    Keeps handlers ordered by priority, only holding weak references to them.
+    """
+
+    def __init__(self):
+        import sortedcontainers
+        self.map = sortedcontainers.SortedDict()
+        self._count = 0
+
+    def add_handler(self, handler, priority=10):
+        if priority not in self.map:
+            self.map[priority] = list()
+        self.map[priority].append(self._ref(handler))
+        self._count += 1
+        self._maybe_purge()
+        self._changed()
+
+    def remove_handler(self, handler):
+        for priority, refs in self.map.items():
+            try:
+                index = self._index_of(refs, handler)
+            except ValueError:
+                continue
+            del refs[index]
+            if not refs:
+                del self.map[priority]
+            self._count -= 1
+            self._changed()
+            return
+        raise ValueError("Handler not present: %s" % handler)
+
+    def _maybe_purge(self):
+        if not self._should_purge(self._count):
+            return
+        for priority, refs in list(self.map.items()):
+            refs[:] = [ref for ref in refs if ref() is not None]
+            if not refs:
+                del self.map[priority]
+        self._count = sum(len(refs) for refs in self.map.values())
+        self._dead = 0
+
+    def iter_handlers_by_priority(self):
+        self._maybe_purge()
+        items = ((priority, self._resolve(refs)) for priority, refs in self.map.items())
+        return [(priority, handlers) for priority, handlers in items if handlers]
@@ -1,58 +1,122 @@
+from uninhibited.patterns import PatternTrie
 from uninhibited.utils import _sentinel
-from uninhibited import Event, PriorityEvent
+from uninhibited.events import Event, PriorityEvent, CompactEvent, CompactPriorityEvent
 
 
-class Dispatch(object):
+def _resolves_attributes_dynamically(klass):
     """
-    Manage many events and dispatch them to a number of handlers.
+    Check if instances of given type may grow attributes that are not visible in the type's MRO.
 
-    Handlers are instances that can receive many events via methods named after the event.
+    :param type klass: Handler type
+    :return bool: True if a custom __getattr__ or __getattribute__ is defined
+    """
+    for base in klass.__mro__:
+        if base is object:
+            continue
+        attrs = vars(base)
+        if '__getattr__' in attrs or '__getattribute__' in attrs:
+            return True
+    return False
 
-    Events are created lazily, and attached to handlers lazily as well.
 
-    Example usage:
+class _Registration(list):
+    """
+    A single add of a handler: the (event name, event, method) triples it has been attached to so far.
+    """
 
-    Create instance
-    >>> d = Dispatch()
+    __slots__ = ('handler', 'active')
 
-    Define an example event handler:
-    >>> class Handler(object):
-    ...     def on_echo(self, arg):
-    ...         return arg
+    def __init__(self, handler):
+        super(_Registration, self).__init__()
+        self.handler = handler
+        self.active = True
 
-    Create handler instance:
-    >>> handler = Handler()
 
-    Attach handler to our list of handlers:
-    >>> d += handler
+class _Subscription(object):
+    """
+    A handler subscribed to an event name pattern, along with the names of the events it has been added to.
+    """
 
-    You can also use :meth:`add` to do so:
-    Duplicates are not allowed by default, unless you specify.
-    >>> d.add(handler, allow_dupe=True)
-    <uninhibited.dispatch.Handler object at ...>
+    __slots__ = ('pattern', 'handler', 'add_kwargs', 'names')
 
-    Fire the event:
-    >>> d('on_echo', True)
-    [(<bound method Handler.on_echo of ..., True), (<bound method Handler.on_echo of ..., True)]
-    >>> d.fire('on_echo', True)
-    [(<bound method Handler.on_echo of ..., True), (<bound method Handler.on_echo of ..., True)]
+    def __init__(self, pattern, handler, add_kwargs):
+        self.pattern = pattern
+        self.handler = handler
+        self.add_kwargs = add_kwargs
+        self.names = set()
 
-    You can fire the event iteratively via ifire:
-    >>> d.ifire('on_echo')  # As you can see it returns a generator
-    <generator object ...>
-    >>> list(d.ifire('on_echo', False))
-    [(<bound method Handler.on_echo of ..., False), (<bound method Handler.on_echo of ..., False)]
 
-    Some introspections are supported:
-    >>> len(d)
-    4
+class Schema(object):
+    """
+    Event names declared once and shared by any number of dispatches.
+
+    A dispatch given a schema doesn't create its events up front, but creates each upon its first use, eg when it's
+    accessed or fired, even if events are otherwise not created on either. Creating a dispatch per request or session
+    then costs about the same however many events it may end up using.
+
+    >>> schema = Schema(['on_order', 'on_refund'], event_factory=PriorityEvent)
+    >>> d = Dispatch(schema=schema, create_events_on_fire=False)
     >>> list(d)
-    [...]
+    []
+    >>> d.fire('on_order')
+    []
+    >>> d.events
+    {'on_order': <PriorityEvent []>}
+    >>> d.fire('on_other') is None
+    True
+    """
+
+    __slots__ = ('factories',)
+
+    def __init__(self, event_names=(), event_factory=None, event_factories=None):
+        """
+        Init.
+
+        :param list event_names: Names of events to declare
+        :param callable event_factory: Factory to create events of event_names with; each dispatch's own `event_factory`
+            if None.
+        :param dict event_factories: Mapping of further event names to declare to the factory to create each with
+        """
+        factories = dict.fromkeys(event_names, event_factory)
+        if event_factories:
+            factories.update(event_factories)
+        self.factories = factories
+
+    def __contains__(self, name):
+        return name in self.factories
+
+    def __iter__(self):
+        return iter(self.factories)
+
+    def __len__(self):
+        return len(self.factories)
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, sorted(self.factories))
+
+
+class BaseDispatch(object):
+    """
+    Dispatch implementation without any per instance state of its own; see :class:`Dispatch`.
     """
 
+    __slots__ = ()
+
     create_events_on_access = False
     create_events_on_fire = True
 
+    # If True, events collect stats as they are created, see :meth:`enable_stats`
+    collect_stats = False
+
+    # If True, fires are traced, see :meth:`enable_tracing`
+    tracing = False
+
+    # If True, handlers are only bound to an event when it's first fired or accessed, instead of on add.
+    lazy_binding = False
+
+    # Events created upon first use, see :class:`Schema`
+    schema = None
+
     event_factory = Event
     internal_event_factory = event_factory
     events_mapping_factory = dict
@@ -66,7 +130,9 @@ class Dispatch(object):
         event_factory=None,
         internal_event_factory=None,
         events_mapping_factory=None,
-        handlers_container_factory=None
+        handlers_container_factory=None,
+        lazy_binding=None,
+        schema=None
     ):
         """
         Init.
@@ -76,22 +142,40 @@ class Dispatch(object):
         :param bool create_events_on_fire: if True, create events on fire.
         :param callable event_factory: Factory to create Event instances
         :param callable events_mapping_factory: Factory to create mapping to store events
-        :param callable handlers_container_factory: Factory to create container to store handlers
+        :param callable handlers_container_factory: Factory to create container :attr:`handlers` are given back in
+        :param bool lazy_binding: If True, adding handlers and events doesn't search them for each other; each event
+            binds the methods of handlers added since it was last used upon its next fire or access.
+        :param Schema schema: Declared events, each created upon its first use
         """
+        options = {}
         if create_events_on_access is not None:
-            self.create_events_on_access = create_events_on_access
+            options['create_events_on_access'] = create_events_on_access
         if create_events_on_fire is not None:
-            self.create_events_on_fire = create_events_on_fire
+            options['create_events_on_fire'] = create_events_on_fire
         if event_factory:
-            self.event_factory = event_factory
+            options['event_factory'] = event_factory
         if internal_event_factory:
-            self.internal_event_factory = internal_event_factory
+            options['internal_event_factory'] = internal_event_factory
         if events_mapping_factory:
-            self.events_mapping_factory = events_mapping_factory
+            options['events_mapping_factory'] = events_mapping_factory
         if handlers_container_factory:
-            self.handlers_container_factory = handlers_container_factory
-
-        self.handlers = self.handlers_container_factory()
+            options['handlers_container_factory'] = handlers_container_factory
+        if lazy_binding is not None:
+            options['lazy_binding'] = lazy_binding
+        if schema is not None:
+            options['schema'] = schema
+        if options:
+            self._set_options(options)
+
+        self._method_tables = {}
+        # id(handler) -> its registrations, latest last; by id, as handlers needn't be hashable
+        self._registrations = {}
+        # Registrations in the order they were added, to bind events to in that order
+        self._registration_log = []
+        # Number of removed registrations still in the log
+        self._removed_registrations = 0
+        self._bound_cursors = {}
+        self._patterns = PatternTrie()
         self.events = self.events_mapping_factory()
         self.clear()
 
@@ -99,19 +183,40 @@ class Dispatch(object):
             # Register given events
             self.add_events(event_names)
 
+    # Only created once accessed, until then there's no one to send them to
     internal_events = ['on_handler_add', 'on_handler_remove', 'on_add_event']
 
-    def _setup_internal_events(self):
-        # Register internal events
-        self._add_internal_events(self.internal_events)
+    def _set_options(self, options):
+        """
+        Override class level options, such as factories, for this instance.
+
+        :param dict options: Mapping of attribute name to value
+        """
+        for name, value in options.items():
+            setattr(self, name, value)
+
+    @property
+    def handlers(self):
+        """
+        Handlers in the order they were added, as many times as they were added.
+
+        :return list: Handlers, in a new container of `handlers_container_factory`
+        """
+        handlers = self.handlers_container_factory()
+        handlers.extend(registration.handler for registration in self._registration_log if registration.active)
+        return handlers
 
     def clear(self):
         """
         Clear all handlers and events.
         """
-        del self.handlers[:]
         self.events.clear()
-        self._setup_internal_events()
+        self._method_tables.clear()
+        self._registrations.clear()
+        del self._registration_log[:]
+        self._removed_registrations = 0
+        self._bound_cursors.clear()
+        self._patterns.clear()
 
     def get_event(self, name, default=_sentinel):
         """
@@ -120,12 +225,48 @@ class Dispatch(object):
         :param str item: Event name
         :return Event: Event instance under key
         """
-        if name not in self.events:
+        if name not in self.events and not self._add_declared_event(name):
             if self.create_events_on_access:
                 self.add_event(name)
             elif default is not _sentinel:
                 return default
-        return self.events[name]
+        event = self.events[name]
+        if self.lazy_binding and self._bound_cursors.get(name) != len(self._registration_log):
+            self._bind_pending(name)
+        return event
+
+    def _bind_pending(self, name):
+        """
+        Attach handlers added since event was last bound to it; see `lazy_binding`.
+
+        :param str name: Event name
+        """
+        log = self._registration_log
+        names = (name,)
+        method_table = self._method_table
+        for registration in log[self._bound_cursors.get(name, 0):]:
+            if not registration.active:
+                continue
+            handler = registration.handler
+            # Skip handlers whose type is known not to implement it, unless set on the instance itself
+            table = method_table(handler.__class__)
+            if table is not None and name not in table[1] and name not in getattr(handler, '__dict__', ()):
+                continue
+            self._attach_handler_events(handler, events=names, bindings=registration)
+        self._bound_cursors[name] = len(log)
+
+    def _compact_registration_log(self):
+        """
+        Drop removed registrations from the log, moving each event's position in it accordingly.
+        """
+        log = self._registration_log
+        # Number of active registrations before each position of the log
+        active_before = [0]
+        for registration in log:
+            active_before.append(active_before[-1] + registration.active)
+        self._bound_cursors = dict((name, active_before[cursor]) for name, cursor in self._bound_cursors.items())
+        log[:] = [registration for registration in log if registration.active]
+        self._removed_registrations = 0
 
     def __getitem__(self, item):
         """
@@ -157,13 +298,53 @@ class Dispatch(object):
         """
         if not internal_event_factory:
             internal_event_factory = self.internal_event_factory
-        return self.add_event(names, send_event=send_event, event_factory=internal_event_factory)
+        return self.add_event(name, send_event=send_event, event_factory=internal_event_factory)
 
     def _add_internal_events(self, names, send_event=False, internal_event_factory=None):
         if not internal_event_factory:
             internal_event_factory = self.internal_event_factory
         return self.add_events(names, send_event=send_event, event_factory=internal_event_factory)
 
+    def _add_declared_event(self, name):
+        """
+        Create an event that's declared to exist, but only created upon first use: an internal event, or one of
+        `schema`.
+
+        :param str name: Event name, of an event not created yet
+        :return bool: True if it was declared, and so created
+        """
+        if name in self.internal_events:
+            self._add_internal_event(name)
+            return True
+        schema = self.schema
+        if schema is not None and name in schema:
+            self.add_event(name, event_factory=schema.factories[name])
+            return True
+        return False
+
+    def _add_internal_events_for(self, handler):
+        """
+        Create the internal events handler implements methods for, so they're bound to it.
+
+        :param object handler: Handler instance
+        """
+        events = self.events
+        missing = [name for name in self.internal_events if name not in events]
+        if not missing:
+            return
+        table = self._method_table(handler.__class__)
+        if table is None:
+            missing = [name for name in missing if getattr(handler, name, None)]
+        else:
+            instance_attrs = getattr(handler, '__dict__', ())
+            missing = [name for name in missing if name in table[0] or name in instance_attrs]
+        if missing:
+            self._add_internal_events(missing)
+
+    def _send_internal_event(self, name, arg):
+        if name in self.events:
+            self.get_event(name).fire(arg)
+
     def add_events(self, names, send_event=True, event_factory=None):
         """
         Add event by name.
@@ -178,13 +359,177 @@ class Dispatch(object):
         if not event_factory:
             event_factory = self.event_factory
 
+        # Methods bound to events being replaced go along with them
+        replaced = [name for name in names if name in self.events]
+        if replaced:
+            self._drop_bindings(replaced)
+
         # Create events
-        self.events.update({name: event_factory() for name in names},)
-        # Inspect handlers to see if they should be attached to this new event
-        [self._attach_handler_events(handler, events=names) for handler in self.handlers]
+        self.events.update({name: self._create_event(event_factory) for name in names},)
+        if self._patterns.count:
+            self._add_subscriptions(names)
+        # Extend the cached method tables of handler types we've already seen with any new names they implement
+        self._update_method_tables(names)
+        if self.lazy_binding:
+            # Bound upon first use
+            for name in names:
+                self._bound_cursors.pop(name, None)
+        else:
+            self._bind_events(names)
 
-        if send_event:
-            [self.on_add_event(name) for name in names]
+        if send_event and 'on_add_event' in self.events:
+            for name in names:
+                self._send_internal_event('on_add_event', name)
+
+    def _drop_bindings(self, names):
+        """
+        Forget which methods of registered handlers are bound to events, as the events are going away.
+
+        :param list names: Event names
+        """
+        names = set(names)
+        for registrations in self._registrations.values():
+            for bindings in registrations:
+                bindings[:] = [binding for binding in bindings if binding[0] not in names]
+
+    def _bind_events(self, names):
+        """
+        Attach registered handlers to newly added events.
+
+        :param tuple names: New event names
+        """
+        # Inspect handlers to see if they should be attached to this new event, in the order they were added
+        for bindings in list(self._registration_log):
+            if bindings.active:
+                self._attach_handler_events(bindings.handler, events=names, bindings=bindings)
+
+    def _add_subscriptions(self, names):
+        """
+        Add handlers subscribed to patterns matching newly added events to them.
+
+        :param tuple names: New event names
+        """
+        match = self._patterns.match
+        for name in names:
+            event = self.events[name]
+            for subscription in match(name):
+                event.add(subscription.handler, **subscription.add_kwargs)
+                subscription.names.add(name)
+
+    def subscribe(self, pattern, handler, **kwargs):
+        """
+        Subscribe a callable handler to all events with names matching pattern, current and future.
+
+        Names are split into segments on dots; `*` matches exactly one segment, and `**` any number of them.
+
+        >>> d = Dispatch()
+        >>> d.subscribe('order.*', len)
+        <built-in function len>
+        >>> d.fire('order.created', 'created')
+        [(<built-in function len>, 7)]
+        >>> d.fire('user.created', 'created')
+        []
+
+        :param str pattern: Event name pattern
+        :param callable handler: callable handler
+        :param dict kwargs: Keyword arguments for each matching event's add, eg priority
+        :return callable: The handler you subscribed is given back.
+        """
+        subscription = _Subscription(pattern, handler, kwargs)
+        self._patterns.add(pattern, subscription)
+        for name in [name for name in self.events if subscription in self._patterns.match(name)]:
+            self.events[name].add(handler, **kwargs)
+            subscription.names.add(name)
+        return handler
+
+    def unsubscribe(self, pattern, handler):
+        """
+        Undo the latest :meth:`subscribe` of handler to pattern.
+
+        :param str pattern: Event name pattern
+        :param callable handler: callable handler
+        :raises ValueError: If handler is not subscribed to pattern
+        """
+        subscriptions = [s for s in self._patterns.values(pattern) if s.handler == handler]
+        if not subscriptions:
+            raise ValueError("Handler not subscribed to %s: %s" % (pattern, handler))
+        subscription = subscriptions[-1]
+        self._patterns.remove(pattern, subscription)
+        for name in subscription.names:
+            event = self.events.get(name)
+            if event is None:
+                continue
+            try:
+                event.remove(handler)
+            except (KeyError, ValueError):
+                pass
+
+    def _create_event(self, event_factory):
+        """
+        Create an Event instance. Override to customize events as they are created.
+
+        :param callable event_factory: Factory to create Event instances
+        :return Event: New event
+        """
+        event = event_factory()
+        if self.collect_stats:
+            event.enable_stats()
+        if self.tracing:
+            event.enable_tracing()
+        return event
+
+    def enable_stats(self):
+        """
+        Start collecting call counts, errors and latencies per event and handler, for all events current and future.
+        """
+        self._set_options({'collect_stats': True})
+        for event in self.events.values():
+            event.enable_stats()
+
+    def disable_stats(self):
+        """
+        Stop collecting stats. Stats collected so far are kept.
+        """
+        self._set_options({'collect_stats': False})
+        for event in self.events.values():
+            event.disable_stats()
+
+    def enable_tracing(self, tracer=None):
+        """
+        Record spans of fires, of events current and future, and of handler calls; see :mod:`uninhibited.tracing`.
+
+        :param uninhibited.tracing.Tracer tracer: Tracer to start recording with (optional); spans go to whichever
+            tracer was started last.
+        """
+        if tracer is not None:
+            tracer.start()
+        self._set_options({'tracing': True})
+        for event in self.events.values():
+            event.enable_tracing()
+
+    def disable_tracing(self):
+        """
+        Stop recording spans, restoring the plain fire path.
+        """
+        self._set_options({'tracing': False})
+        for event in self.events.values():
+            event.disable_tracing()
+
+    def _traced_fire(self, method, event, args, kwargs):
+        from uninhibited.tracing import span
+
+        with span(event, 'dispatch'):
+            if not self._maybe_create_on_fire(event):
+                return
+            return getattr(self[event], method)(*args, **kwargs)
+
+    def stats(self):
+        """
+        Stats collected so far; see :meth:`enable_stats`.
+
+        :return dict: Mapping of event name to stats, as returned by :meth:`uninhibited.stats.EventStats.as_dict`
+        """
+        return dict((name, event.stats.as_dict()) for name, event in self.events.items() if event.stats is not None)
 
     def add_event(self, name, send_event=True, event_factory=None):
         """
@@ -201,19 +546,78 @@ class Dispatch(object):
         """
         return self.add_events((name,),send_event=send_event,event_factory=event_factory)
 
-    def _attach_handler_events(self, handler, events=None):
+    def _method_table(self, klass):
+        """
+        Lookup which known events a handler type implements, computing it only once per type.
+
+        :param type klass: Handler type
+        :return tuple|None: Tuple of (attribute names found along the MRO, frozenset of implemented event names), or
+            None if the type resolves attributes dynamically and must be searched per instance.
+        """
+        try:
+            return self._method_tables[klass]
+        except KeyError:
+            pass
+
+        if _resolves_attributes_dynamically(klass):
+            table = None
+        else:
+            attrs = frozenset(name for base in klass.__mro__ for name in vars(base))
+            table = (attrs, attrs.intersection(self.events))
+
+        self._method_tables[klass] = table
+        return table
+
+    def _update_method_tables(self, names):
+        """
+        Add newly added event names to the cached method tables of the handler types that implement them.
+
+        :param tuple names: New event names
+        """
+        for klass, table in self._method_tables.items():
+            if table is None:
+                continue
+            attrs, implemented = table
+            found = attrs.intersection(names)
+            if not found <= implemented:
+                self._method_tables[klass] = (attrs, implemented | found)
+
+    def _attach_handler_events(self, handler, events=None, bindings=None):
         """
         Search handler for methods named after events, attaching to event handlers as applicable.
 
         :param object handler: Handler instance
         :param list events: List of event names to look for. If not specified, will do all known event names.
+        :param list bindings: Registration to record attached (name, event, method) triples in, so they can be detached
+            on removal without searching every event. Defaults to the handler's latest registration.
         """
+        if bindings is None:
+            bindings = self._registrations[id(handler)][-1]
         if not events:
             events = self
+
+        table = self._method_table(handler.__class__)
+        if table is not None:
+            implemented = table[1]
+            if events is not self:
+                implemented = implemented.intersection(events)
+
+            # Methods set on the instance itself are not part of the type's table
+            instance_attrs = getattr(handler, '__dict__', None)
+            if instance_attrs:
+                known = self.events if events is self else events
+                extra = [name for name in instance_attrs if name in known and name not in implemented]
+                if extra:
+                    implemented = implemented.union(extra)
+
+            events = implemented
+
         for name in events:
             meth = getattr(handler, name, None)
             if meth:
-                self.events[name] += meth
+                event = self.events[name]
+                event += meth
+                bindings.append((name, event, meth))
 
     def _add(self, handler, allow_dupe=False, send_event=True):
         """
@@ -223,12 +627,21 @@ class Dispatch(object):
         :param bool allow_dupe: If True, allow registering a handler more than once.
         :return object: The handler you added is given back so this can be used as a decorator.
         """
-        if not allow_dupe and handler in self.handlers:
+        registrations = self._registrations.get(id(handler))
+        if registrations is None:
+            registrations = self._registrations[id(handler)] = []
+        elif not allow_dupe:
             raise ValueError("Handler already present: %s" % handler)
-        self.handlers.append(handler)
-        self._attach_handler_events(handler)
+
+        # Before registering it, as new events are bound to registered handlers
+        self._add_internal_events_for(handler)
+        bindings = _Registration(handler)
+        registrations.append(bindings)
+        self._registration_log.append(bindings)
+        if not self.lazy_binding:
+            self._attach_handler_events(handler, bindings=bindings)
         if send_event:
-            self.on_handler_add(handler)
+            self._send_internal_event('on_handler_add', handler)
 
     def add(self, handler, allow_dupe=False, send_event=True):
         """
@@ -258,11 +671,34 @@ class Dispatch(object):
         :param object handler: handler instance
         :return object: The handler you added is given back so this can be used as a decorator.
         """
-        for event in self:
-            event.remove_handlers_bound_to_instance(handler)
-        self.handlers.remove(handler)
+        registrations = self._registrations.get(id(handler))
+        if not registrations:
+            raise ValueError("Handler not present: %s" % handler)
+
+        # Each remove undoes the latest add of this handler
+        bindings = registrations.pop()
+        bindings.active = False
+        if not registrations:
+            del self._registrations[id(handler)]
+
+        events = self.events
+        for name, event, meth in bindings:
+            if events.get(name) is not event:
+                # Event was replaced; an equal method may be bound to the new one by another registration
+                continue
+            try:
+                event.remove(meth)
+            except (KeyError, ValueError):
+                # Method was removed from the event directly
+                pass
+
+        # The log is what handlers are read from; compact it once most of it is removed registrations
+        self._removed_registrations += 1
+        removed = self._removed_registrations
+        if removed > 32 and 2 * removed > len(self._registration_log):
+            self._compact_registration_log()
         if send_event:
-            self.on_handler_remove(handler)
+            self._send_internal_event('on_handler_remove', handler)
 
     def remove(self, handler):
         """
@@ -285,9 +721,9 @@ class Dispatch(object):
         return self
 
     def _maybe_create_on_fire(self, event):
-        if event in self.events:
+        if event in self.events or self._add_declared_event(event):
             return True
-        elif self.create_events_on_fire:
+        elif self.create_events_on_fire or (self._patterns.count and self._patterns.match(event)):
             self.add_event(event)
             return True
         else:
@@ -302,12 +738,59 @@ class Dispatch(object):
         :param dict kwargs: keyword arguments to call each handler with
         :return list: a list of tuples of handler, return value
         """
+        if self.tracing:
+            return self._traced_fire('fire', event, args, kwargs)
         if not self._maybe_create_on_fire(event):
             return
         return self[event].fire(*args, **kwargs)
 
     __call__ = fire
 
+    def fire_discard(self, event, *args, **kwargs):
+        """
+        Fire event without collecting handler results. See :meth:`Event.fire_discard`.
+
+        :param str name: Event name
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        """
+        if self.tracing:
+            return self._traced_fire('fire_discard', event, args, kwargs)
+        if not self._maybe_create_on_fire(event):
+            return
+        return self[event].fire_discard(*args, **kwargs)
+
+    def fire_reduce(self, event, reducer, *args, **kwargs):
+        """
+        Fire event, reducing handler results as they come. See :meth:`Event.fire_reduce`.
+
+        :param str name: Event name
+        :param callable reducer: Called with an iterable of handler results, eg `sum`, `all` or `any`
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        :return object: What reducer returned, or None if there's no such event
+        """
+        if self.tracing:
+            return self._traced_fire('fire_reduce', event, (reducer,) + args, kwargs)
+        if not self._maybe_create_on_fire(event):
+            return
+        return self[event].fire_reduce(reducer, *args, **kwargs)
+
+    def fire_first(self, event, *args, **kwargs):
+        """
+        Fire event until a handler returns something other than None, giving that back. See :meth:`Event.fire_first`.
+
+        :param str name: Event name
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        :return object: First result that is not None, or None
+        """
+        if self.tracing:
+            return self._traced_fire('fire_first', event, args, kwargs)
+        if not self._maybe_create_on_fire(event):
+            return
+        return self[event].fire_first(*args, **kwargs)
+
     def ifire(self, event, *args, **kwargs):
         """
         Iteratively fire event, returning generator. Calls each handler using given arguments, upon iteration,
@@ -327,6 +810,20 @@ class Dispatch(object):
         #     yield x
         return self[event].ifire(*args, **kwargs)
 
+    def fire_batch(self, event, payloads, *args, **kwargs):
+        """
+        Fire event once per payload, looking up the event and its handlers only once. See :meth:`Event.fire_many`.
+
+        :param str name: Event name
+        :param iterable payloads: payloads to fire event with, given to handlers as the first positional argument
+        :param tuple args: positional arguments to call each handler with after the payload
+        :param dict kwargs: keyword arguments to call each handler with
+        :return generator: a generator yielding a tuple of handler, return value
+        """
+        if not self._maybe_create_on_fire(event):
+            return
+        return self[event].fire_many(payloads, *args, **kwargs)
+
     def count(self):
         """
         Return event count.
@@ -349,6 +846,128 @@ class Dispatch(object):
         return '<%s %s handlers=%s>' % (self.__class__.__name__, list(self.events), self.handlers)
 
 
+class Dispatch(BaseDispatch):
+    """
+    Manage many events and dispatch them to a number of handlers.
+
+    Handlers are instances that can receive many events via methods named after the event.
+
+    Events are created lazily, and attached to handlers lazily as well.
+
+    Example usage:
+
+    Create instance
+    >>> d = Dispatch()
+
+    Define an example event handler:
+    >>> class Handler(object):
+    ...     def on_echo(self, arg):
+    ...         return arg
+
+    Create handler instance:
+    >>> handler = Handler()
+
+    Attach handler to our list of handlers:
+    >>> d += handler
+
+    You can also use :meth:`add` to do so:
+    Duplicates are not allowed by default, unless you specify.
+    >>> d.add(handler, allow_dupe=True)
+    <uninhibited.dispatch.Handler object at ...>
+
+    Fire the event:
+    >>> d('on_echo', True)
+    [(<bound method Handler.on_echo of ..., True), (<bound method Handler.on_echo of ..., True)]
+    >>> d.fire('on_echo', True)
+    [(<bound method Handler.on_echo of ..., True), (<bound method Handler.on_echo of ..., True)]
+
+    You can fire the event iteratively via ifire:
+    >>> d.ifire('on_echo')  # As you can see it returns a generator
+    <generator object ...>
+    >>> list(d.ifire('on_echo', False))
+    [(<bound method Handler.on_echo of ..., False), (<bound method Handler.on_echo of ..., False)]
+
+    Some introspections are supported:
+    >>> len(d)
+    1
+    >>> list(d)
+    ['on_echo']
+    """
+
+
 class PriorityDispatch(Dispatch):
     event_factory = PriorityEvent
     internal_event_factory = PriorityEvent
+
+
+class _Option(object):
+    """
+    Option of a :class:`CompactDispatch`: the value set for the instance, if any, or the class default otherwise.
+    """
+
+    __slots__ = ('name', 'default')
+
+    def __init__(self, name, default):
+        self.name = name
+        self.default = default
+
+    def __get__(self, obj, cls=None):
+        if obj is not None and obj._options is not None:
+            return obj._options.get(self.name, self.default)
+        return self.default
+
+
+class CompactDispatch(BaseDispatch):
+    """
+    Memory lean :class:`Dispatch`: no instance __dict__, and events are :class:`CompactEvent` instances.
+
+    Options given to __init__, or set later on such as by :meth:`enable_stats`, are kept in a single dict slot; class
+    defaults are overridden by subclassing, as with :class:`CompactEvent`.
+
+    >>> d = CompactDispatch(create_events_on_access=True)
+    >>> d.create_events_on_access
+    True
+    >>> CompactDispatch().create_events_on_access
+    False
+    >>> d['on_ping']
+    <CompactEvent []>
+    """
+
+    __slots__ = (
+        'events', '_method_tables', '_registrations', '_registration_log', '_removed_registrations', '_bound_cursors',
+        '_patterns', '_options', '__weakref__',
+    )
+
+    event_factory = CompactEvent
+    internal_event_factory = CompactEvent
+
+    _option_names = (
+        'create_events_on_access', 'create_events_on_fire', 'collect_stats', 'tracing', 'lazy_binding', 'schema',
+        'event_factory', 'internal_event_factory', 'events_mapping_factory', 'handlers_container_factory',
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super(CompactDispatch, cls).__init_subclass__(**kwargs)
+        cls._wrap_options()
+
+    @classmethod
+    def _wrap_options(cls):
+        # Class defaults, including those a subclass overrides, are read through the instance's options first
+        for name in cls._option_names:
+            setattr(cls, name, _Option(name, getattr(cls, name)))
+
+    def __init__(self, *args, **kwargs):
+        # Options set for this instance; None until there are any
+        self._options = None
+        super(CompactDispatch, self).__init__(*args, **kwargs)
+
+    def _set_options(self, options):
+        self._options = dict(self._options or (), **options)
+
+
+CompactDispatch._wrap_options()
+
+
+class CompactPriorityDispatch(CompactDispatch):
+    event_factory = CompactPriorityEvent
+    internal_event_factory = CompactPriorityEvent
@@ -1,72 +1,151 @@
 from uninhibited import containers
-from uninhibited.utils import _sentinel
+from uninhibited.filters import HandlerIndex
+from uninhibited.results import DISCARD, first
+from uninhibited.stats import InstrumentedEventMixin, instrument, uninstrument
+from uninhibited.utils import StopPropagation, _sentinel
 
 
-class Event(object):
+def batch_handler(handler):
     """
-    Callback. Register a number of callables and upon fire, it will call each one and return the results.
-
-    Example usage:
-
-    Create instance
-    >>> e = Event()
+    Mark handler as batch capable; :meth:`Event.fire_many` will call it once with the whole batch of payloads
+    (whatever sequence was given, eg a list or a NumPy array) instead of once per payload.
 
-    Define an example callable:
-    >>> def echo(arg):
-    ...    return arg
-
-    Add the example callable to the event's list of callbacks:
-    >>> e += echo
+    >>> @batch_handler
+    ... def total(payloads):
+    ...     return sum(payloads)
 
-    You can also use :meth:`add` to do so:
-    >>> e.add(echo)
-    <function echo at ...>
+    :param callable handler: callable handler
+    :return callable: The handler is given back so this can be used as a decorator.
+    """
+    handler.accepts_batch = True
+    return handler
 
-    Fire the event:
-    >>> e(True)
-    [(<function echo at ...>, True), (<function echo at ...>, True)]
-    >>> e.fire(True)
-    [(<function echo at ...>, True), (<function echo at ...>, True)]
 
-    You can fire the event iteratively via ifire:
-    >>> e.ifire()  # As you can see it returns a generator
-    <generator object ...>
-    >>> list(e.ifire(False))
-    [(<function echo at ...>, False), (<function echo at ...>, False)]
-
-    Some introspections are supported:
-    >>> len(e)
-    2
-    >>> list(e)
-    [<function echo at ...>, <function echo at ...>]
+class BaseEvent(object):
+    """
+    Event implementation without any per instance state of its own; see :class:`Event`.
     """
 
+    __slots__ = ()
+
     _container_factory = containers.ListHandlerCollection
 
-    def __init__(self, container_factory=None):
+    # (snapshot, batch handlers, per payload handlers) as of the last fire_many
+    _batch_cache = None
+
+    # Collected stats, see :meth:`enable_stats`
+    stats = None
+    # Mixin providing the timed fire path for this class
+    _stats_mixin = InstrumentedEventMixin
+    # Mixin providing the traced fire path for this class; None for :class:`uninhibited.tracing.TracedEventMixin`,
+    # which is only imported once tracing is enabled.
+    _tracing_mixin = None
+
+    # If True, :meth:`fire` calls handlers directly instead of through :meth:`_results` and :meth:`_call_handler`.
+    # Subclasses overriding either, or :attr:`handlers`, have it turned off for them on Python 3.6+; set it to False
+    # yourself on older versions.
+    _inline_calls = True
+    # If True, handlers are looked up from the container's snapshot rather than through :attr:`handlers`. Subclasses
+    # overriding :attr:`handlers` have it turned off for them on Python 3.6+.
+    _snapshot_handlers = True
+
+    # What :meth:`fire` gives back; None for a list of (handler, result) tuples. See :mod:`uninhibited.results`.
+    result_mode = None
+
+    # Position or name of the argument handler filters look at, and how its key is extracted. See :meth:`add`.
+    filter_arg = 0
+    filter_key = None
+    # Index of handler filters, created upon the first filtered add
+    _filter_index = None
+
+    def __init_subclass__(cls, **kwargs):
+        super(BaseEvent, cls).__init_subclass__(**kwargs)
+        def owner(name):
+            return next(klass for klass in cls.__mro__ if name in vars(klass))
+
+        if '_snapshot_handlers' not in vars(cls):
+            cls._snapshot_handlers = cls._snapshot_handlers and owner('handlers') is BaseEvent
+        if '_inline_calls' not in vars(cls):
+            overrides = ('_call_handler', '_results', 'handlers')
+            cls._inline_calls = cls._inline_calls and all(owner(name) is BaseEvent for name in overrides)
+
+    def __init__(self, container_factory=None, result_mode=None, filter_arg=None, filter_key=None):
         """
         Init.
 
         :param events.containers.HandlerCollection container_factory: Factory for callback storage; must support append and remove.
+        :param object result_mode: What :meth:`fire` gives back: DISCARD, or a reducer of handler results, eg `any`.
+        :param int|str filter_arg: Position or name of the argument handler filters look at
+        :param callable filter_key: Called with the filter argument to get the key handlers filter on, eg
+            `operator.attrgetter('tenant')`; the argument itself is used if not given.
         """
         if container_factory:
             self._container_factory = container_factory
+        if result_mode is not None:
+            self.result_mode = result_mode
+        if filter_arg is not None:
+            self.filter_arg = filter_arg
+        if filter_key is not None:
+            self.filter_key = filter_key
         self.container = self._container_factory()
 
     @property
     def handlers(self):
-        return self.container.iter_handlers()
+        return iter(self.container.snapshot)
 
-    def add(self, handler):
+    def _snapshot(self):
         """
-        Add handler.
+        Handlers in call order; the container's cached snapshot, unless :attr:`handlers` is overridden.
+
+        :return tuple: Handlers, in order
+        """
+        if self._snapshot_handlers:
+            return self.container.snapshot
+        return tuple(self.handlers)
+
+    def add(self, handler, types=None, key=_sentinel):
+        """
+        Add handler, optionally only to be called for some fires.
+
+        Filters look at the event's filter argument, the first positional one unless given otherwise. A handler's
+        filters are those given when it was last added.
+
+        >>> e = Event()
+        >>> e.add(abs, types=int)
+        <built-in function abs>
+        >>> e.add(len, types=(str, list))
+        <built-in function len>
+        >>> e.fire(-1), e.fire('ab')
+        ([(<built-in function abs>, 1)], [(<built-in function len>, 2)])
 
         :param callable handler: callable handler
+        :param type|tuple types: Only call handler when the filter argument is an instance of these
+        :param object key: Only call handler when the key of the filter argument equals this
         :return callable: The handler you added is given back so this can be used as a decorator.
         """
         self.container.add_handler(handler)
+        self._set_filters(handler, types, key)
         return handler
 
+    def _set_filters(self, handler, types, key):
+        index = self._filter_index
+        if index is None:
+            if types is None and key is _sentinel:
+                return
+            index = self._filter_index = HandlerIndex(arg=self.filter_arg, key=self.filter_key)
+        index.set(handler, types=types, key=key)
+
+    def _handlers_for(self, args, kwargs):
+        """
+        Lookup handlers to call for a fire, leaving out those whose filters don't match.
+
+        :return tuple: Handlers, in order
+        """
+        index = self._filter_index
+        if index is None:
+            return self._snapshot()
+        return index.select(self._snapshot(), args, kwargs)
+
     def __iadd__(self, handler):
         """
         Inplace add operator (+=) to add a handler.
@@ -74,7 +153,7 @@ class Event(object):
         :param callable handler: callable handler
         :return Event: self, as required by inplace operators
         """
-        self.container.add_handler(handler)
+        self.add(handler)
         return self
 
     def remove(self, handler):
@@ -85,6 +164,8 @@ class Event(object):
         :return callable: The handler you added is given back so this can be used as a decorator.
         """
         self.container.remove_handler(handler)
+        if self._filter_index is not None and handler not in self._snapshot():
+            self._filter_index.discard(handler)
         return handler
 
     def __isub__(self, handler):
@@ -94,7 +175,7 @@ class Event(object):
         :param callable handler: callable handler
         :return Event: self, as required by inplace operators
         """
-        self.container.remove_handler(handler)
+        self.remove(handler)
         return self
 
     def remove_handlers_bound_to_instance(self, obj):
@@ -105,16 +186,67 @@ class Event(object):
         :param object obj: Remove handlers that are methods of this instance
         """
         for handler in self.handlers:
-            if handler.im_self == obj:
+            if getattr(handler, '__self__', None) is obj:
                 self -= handler
 
+    def enable_stats(self, stats=None):
+        """
+        Start collecting call counts, errors and latencies per handler into :attr:`stats`.
+
+        This swaps in a timed fire path, so events that don't collect stats pay nothing for it.
+
+        >>> e = Event()
+        >>> e += abs
+        >>> stats = e.enable_stats()
+        >>> e.fire(-1)
+        [(<built-in function abs>, 1)]
+        >>> stats.fires, stats.handler(abs).calls
+        (1, 1)
+        >>> e.disable_stats()
+
+        :param uninhibited.stats.EventStats stats: Stats to record into (optional)
+        :return uninhibited.stats.EventStats: Stats being recorded into
+        """
+        return instrument(self, stats=stats)
+
+    def disable_stats(self):
+        """
+        Stop collecting stats, restoring the plain fire path. Stats collected so far are kept.
+        """
+        uninstrument(self)
+
+    def enable_tracing(self):
+        """
+        Start recording spans of fires and handler calls into the active :class:`uninhibited.tracing.Tracer`.
+
+        This swaps in a traced fire path, so events that are not traced pay nothing for it.
+        """
+        from uninhibited.tracing import trace
+
+        trace(self)
+
+    def disable_tracing(self):
+        """
+        Stop recording spans, restoring the plain fire path.
+        """
+        from uninhibited.tracing import untrace
+
+        untrace(self)
+
     def _call_handler(self, handler, args, kwargs):
         return handler(*args, **kwargs)
 
     def _results(self, args, kwargs, handlers=_sentinel):
         if handlers is _sentinel:
-            handlers = self.handlers
-        return ((h, self._call_handler(h, args, kwargs)) for h in handlers)
+            handlers = self._handlers_for(args, kwargs)
+        call = self._call_handler
+        for h in handlers:
+            try:
+                result = call(h, args, kwargs)
+            except StopPropagation as stop:
+                yield h, stop.result
+                return
+            yield h, result
 
     def fire(self, *args, **kwargs):
         """
@@ -122,9 +254,92 @@ class Event(object):
 
         :param tuple args: positional arguments to call each handler with
         :param dict kwargs: keyword arguments to call each handler with
-        :return list: a list of tuples of handler, return value
+        :return list: a list of tuples of handler, return value, unless our result mode says otherwise
+        """
+        if self.result_mode is not None:
+            return self._fire_with_mode(self.result_mode, args, kwargs)
+        if not self._inline_calls:
+            return list(self._results(args, kwargs))
+        # Hot path: loop over the cached snapshot directly, no generator or per handler method dispatch.
+        handlers = self.container.snapshot if self._filter_index is None else self._handlers_for(args, kwargs)
+        results = []
+        append = results.append
+        h = None
+        try:
+            for h in handlers:
+                append((h, h(*args, **kwargs)))
+        except StopPropagation as stop:
+            append((h, stop.result))
+        return results
+
+    def _values(self, args, kwargs):
         """
-        return list(self._results(args, kwargs))
+        Call handlers as the returned iterator is consumed, yielding their results alone.
+        """
+        if not self._inline_calls:
+            return (result for _, result in self._results(args, kwargs))
+        return self._inline_values(self._handlers_for(args, kwargs), args, kwargs)
+
+    @staticmethod
+    def _inline_values(handlers, args, kwargs):
+        for h in handlers:
+            try:
+                yield h(*args, **kwargs)
+            except StopPropagation as stop:
+                yield stop.result
+                return
+
+    def _fire_with_mode(self, mode, args, kwargs):
+        if mode is DISCARD:
+            return self.fire_discard(*args, **kwargs)
+        return mode(self._values(args, kwargs))
+
+    def fire_discard(self, *args, **kwargs):
+        """
+        Fire event, calling handlers without collecting their results.
+
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        """
+        if not self._inline_calls:
+            for _ in self._results(args, kwargs):
+                pass
+            return
+        handlers = self.container.snapshot if self._filter_index is None else self._handlers_for(args, kwargs)
+        try:
+            for h in handlers:
+                h(*args, **kwargs)
+        except StopPropagation:
+            pass
+
+    def fire_reduce(self, reducer, *args, **kwargs):
+        """
+        Fire event, reducing handler results as they come. Handlers are only called as far as reducer consumes them.
+
+        >>> e = Event()
+        >>> e += bool
+        >>> e += lambda value: value > 1
+        >>> e.fire_reduce(all, 1)
+        False
+        >>> e.fire_reduce(sum, 2)
+        2
+
+        :param callable reducer: Called with an iterable of handler results, eg `sum`, `all` or `any`
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        :return object: What reducer returned
+        """
+        return reducer(self._values(args, kwargs))
+
+    def fire_first(self, *args, **kwargs):
+        """
+        Fire event until a handler returns something other than None, giving that back.
+
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        :return object: First result that is not None, or None
+        """
+        return self.fire_reduce(first, *args, **kwargs)
 
     def ifire(self, *args, **kwargs):
         """
@@ -139,13 +354,101 @@ class Event(object):
 
     __call__ = fire
 
+    def _batch_handlers(self):
+        """
+        Split handlers into batch capable ones and per payload ones, caching the split until handlers change.
+
+        :return tuple: tuple of batch handlers, tuple of per payload handlers
+        """
+        snapshot = self._snapshot()
+        cached = self._batch_cache
+        if cached is None or cached[0] is not snapshot:
+            batch = tuple(h for h in snapshot if getattr(h, 'accepts_batch', False))
+            single = tuple(h for h in snapshot if not getattr(h, 'accepts_batch', False))
+            cached = self._batch_cache = (snapshot, batch, single)
+        return cached[1], cached[2]
+
+    def _payload_handlers(self, single, args, kwargs):
+        """
+        Lookup per payload handlers to call for a payload of :meth:`fire_many`.
+
+        :param tuple single: Per payload handlers
+        :return tuple: Handlers, in order
+        """
+        if self._filter_index is None:
+            return single
+        handlers = self._handlers_for(args, kwargs)
+        if not self._batch_cache[1]:
+            return handlers
+        return tuple(h for h in handlers if not getattr(h, 'accepts_batch', False))
+
+    def fire_many(self, payloads, *args, **kwargs):
+        """
+        Fire event once per payload, resolving handlers only once for the whole batch. Returns a generator; handlers
+        are called upon iteration.
+
+        Each payload is given as the first positional argument, followed by the given arguments. Handlers marked with
+        :func:`batch_handler` are instead called once, first, with the whole batch of payloads.
+
+        A handler raising :class:`StopPropagation` skips the remaining handlers for its payload; a batch handler doing
+        so ends the whole batch. Handler filters apply to each payload, not to batch handlers.
+
+        >>> e = Event()
+        >>> e += lambda payload: payload * 2
+        >>> [result for handler, result in e.fire_many([1, 2, 3])]
+        [2, 4, 6]
+
+        :param iterable payloads: payloads to fire event with
+        :param tuple args: positional arguments to call each handler with after the payload
+        :param dict kwargs: keyword arguments to call each handler with
+        :return generator: a generator yielding a tuple of handler, return value
+        """
+        batch, single = self._batch_handlers()
+
+        if batch:
+            # Batch handlers need the whole batch up front; sequences (lists, arrays) are passed as is
+            if not hasattr(payloads, '__len__'):
+                payloads = list(payloads)
+            for h in batch:
+                try:
+                    if self._inline_calls:
+                        result = h(payloads, *args, **kwargs)
+                    else:
+                        result = self._call_handler(h, (payloads,) + args, kwargs)
+                except StopPropagation as stop:
+                    yield h, stop.result
+                    return
+                yield h, result
+
+        if not single:
+            return
+        if self._filter_index is not None:
+            for payload in payloads:
+                fire_args = (payload,) + args
+                handlers = self._payload_handlers(single, fire_args, kwargs)
+                for result in self._results(fire_args, kwargs, handlers=handlers):
+                    yield result
+        elif self._inline_calls:
+            for payload in payloads:
+                for h in single:
+                    try:
+                        result = h(payload, *args, **kwargs)
+                    except StopPropagation as stop:
+                        yield h, stop.result
+                        break
+                    yield h, result
+        else:
+            for payload in payloads:
+                for result in self._results((payload,) + args, kwargs, handlers=single):
+                    yield result
+
     def __len__(self):
         """
         Return handler count.
 
         :return int: Number of handlers added
         """
-        return len(list(self.handlers))
+        return len(self._snapshot())
 
     def __iter__(self):
         """
@@ -159,25 +462,207 @@ class Event(object):
         return '<%s %s>' % (self.__class__.__name__, list(self.handlers))
 
 
-class PriorityEvent(Event):
+class Event(BaseEvent):
+    """
+    Callback. Register a number of callables and upon fire, it will call each one and return the results.
+
+    Example usage:
+
+    Create instance
+    >>> e = Event()
+
+    Define an example callable:
+    >>> def echo(arg):
+    ...    return arg
+
+    Add the example callable to the event's list of callbacks:
+    >>> e += echo
+
+    You can also use :meth:`add` to do so:
+    >>> e.add(echo)
+    <function echo at ...>
+
+    Fire the event:
+    >>> e(True)
+    [(<function echo at ...>, True), (<function echo at ...>, True)]
+    >>> e.fire(True)
+    [(<function echo at ...>, True), (<function echo at ...>, True)]
+
+    You can fire the event iteratively via ifire:
+    >>> e.ifire()  # As you can see it returns a generator
+    <generator object ...>
+    >>> list(e.ifire(False))
+    [(<function echo at ...>, False), (<function echo at ...>, False)]
+
+    Some introspections are supported:
+    >>> len(e)
+    2
+    >>> list(e)
+    [<function echo at ...>, <function echo at ...>]
+    """
+
+
+class BasePriorityEvent(BaseEvent):
+    """
+    Priority event implementation without any per instance state of its own; see :class:`PriorityEvent`.
+    """
+
+    __slots__ = ()
     _container_factory = containers.SortedDictPriorityHandlerCollection
 
-    def add(self, handler, priority=10):
+    def add(self, handler, priority=10, types=None, key=_sentinel):
         """
         Add handler.
 
         :param callable handler: callable handler
+        :param int priority: Priority, lower is called first
+        :param type|tuple types: Only call handler when the filter argument is an instance of these
+        :param object key: Only call handler when the key of the filter argument equals this
         :return callable: The handler you added is given back so this can be used as a decorator.
         """
         self.container.add_handler(handler, priority=priority)
+        self._set_filters(handler, types, key)
         return handler
 
     @property
     def handlers_by_priority(self):
         return self.container.iter_handlers_by_priority()
 
+    def _levels(self, args, kwargs):
+        """
+        Lookup handlers to call for a fire by priority, leaving out those whose filters don't match.
+
+        :return list: List of tuples of priority, handlers; lowest priority first, without empty levels
+        """
+        levels = self.handlers_by_priority
+        if self._filter_index is None:
+            return list(levels)
+        selected = set(self._handlers_for(args, kwargs))
+        levels = ((priority, [h for h in handlers if h in selected]) for priority, handlers in levels)
+        return [(priority, handlers) for priority, handlers in levels if handlers]
+
     def ifire_by_priority(self, *args, **kwargs):
-        return ((priority, self._results(handlers, args, kwargs)) for priority, handlers in self.handlers_by_priority)
+        """
+        Iteratively fire event by priority level, returning generator. Each level's handlers are called upon
+        iteration of its results.
+
+        A handler raising :class:`StopPropagation` ends its level's results, and no further levels are given.
+
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        :return generator: a generator yielding tuples of priority, generator of (handler, return value) tuples
+        """
+        stopped = []
+        for priority, handlers in self._levels(args, kwargs):
+            yield priority, self._level_results(args, kwargs, handlers, stopped)
+            if stopped:
+                return
+
+    def _level_results(self, args, kwargs, handlers, stopped):
+        call = self._call_handler
+        for h in handlers:
+            try:
+                result = call(h, args, kwargs)
+            except StopPropagation as stop:
+                stopped.append(h)
+                yield h, stop.result
+                return
+            yield h, result
 
     def fire_by_priority(self, *args, **kwargs):
+        """
+        Fire event by priority level.
+
+        >>> e = PriorityEvent()
+        >>> e.add(abs, priority=1)
+        <built-in function abs>
+        >>> e.add(str, priority=0)
+        <class 'str'>
+        >>> e.fire_by_priority(-1)
+        [(0, [(<class 'str'>, '-1')]), (1, [(<built-in function abs>, 1)])]
+
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        :return list: a list of tuples of priority, list of (handler, return value) tuples
+        """
         return [(priority, list(results)) for priority, results in self.ifire_by_priority(*args, **kwargs)]
+
+
+class PriorityEvent(BasePriorityEvent, Event):
+    """
+    Event calling its handlers in order of priority, lowest first.
+
+    Handlers are kept in a :class:`uninhibited.containers.SortedDictPriorityHandlerCollection` unless another
+    container factory is given, eg :class:`uninhibited.containers.BisectPriorityHandlerCollection` or
+    :class:`uninhibited.containers.FixedPriorityHandlerCollection` for a few integer priorities.
+
+    A handler can veto the rest by raising :class:`StopPropagation`:
+
+    >>> def veto(order):
+    ...     raise StopPropagation('rejected')
+    >>> e = PriorityEvent()
+    >>> e.add(veto, priority=0)
+    <function veto at ...>
+    >>> e.add(len, priority=10)
+    <built-in function len>
+    >>> e.fire('order')
+    [(<function veto at ...>, 'rejected')]
+    """
+
+
+class CompactEvent(BaseEvent):
+    """
+    Memory lean :class:`Event`: no instance __dict__, and no container is allocated until the first handler is added.
+
+    Events without handlers all share :data:`uninhibited.containers.EMPTY_HANDLERS`. A given container factory
+    can't be stored without a __dict__, so it is used right away; otherwise the `_container_factory` class attribute
+    is used upon the first add. Likewise, a result mode and filter argument are set through the class attributes of a
+    subclass.
+
+    >>> e = CompactEvent()
+    >>> e.container is containers.EMPTY_HANDLERS
+    True
+    >>> e.add(abs)
+    <built-in function abs>
+    >>> e.fire(-1)
+    [(<built-in function abs>, 1)]
+    """
+
+    __slots__ = ('container', 'stats', '_batch_cache', '_filter_index', '__weakref__')
+
+    _container_factory = containers.CompactListHandlerCollection
+
+    def __init__(self, container_factory=None):
+        """
+        Init.
+
+        :param events.containers.HandlerCollection container_factory: Factory for callback storage (optional)
+        """
+        if container_factory:
+            self.container = container_factory()
+        else:
+            self.container = containers.EMPTY_HANDLERS
+        self.stats = None
+        self._batch_cache = None
+        self._filter_index = None
+
+    def add(self, handler, *args, **kwargs):
+        """
+        Add handler, allocating our container on first use.
+
+        :param callable handler: callable handler
+        :return callable: The handler you added is given back so this can be used as a decorator.
+        """
+        if self.container is containers.EMPTY_HANDLERS:
+            self.container = self._container_factory()
+        return super(CompactEvent, self).add(handler, *args, **kwargs)
+
+
+class CompactPriorityEvent(CompactEvent, BasePriorityEvent):
+    """
+    Memory lean :class:`PriorityEvent`; see :class:`CompactEvent`.
+    """
+
+    __slots__ = ()
+
+    _container_factory = BasePriorityEvent._container_factory
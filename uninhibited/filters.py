@@ -0,0 +1,155 @@
+"""
+Declarative handler filters, so handlers that only care about some fires aren't called for the others.
+
+A handler can be added with `types`, to only be called when the event's filter argument is an instance of them, and
+with `key`, to only be called when the key of the filter argument equals it. Which argument is looked at, and how its
+key is extracted, is up to the event; see :class:`HandlerIndex`.
+"""
+
+import operator
+
+from uninhibited.utils import _sentinel
+
+
+class HandlerIndex(object):
+    """
+    Index of handler filters of an event, selecting the handlers to call for a fire.
+
+    Handlers are indexed by key, and selections are cached per concrete type of the filter argument (and per key, when
+    any handler filters on one), so a fire costs a dict lookup once a type or key has been seen. Type filters match
+    subclasses as well, as isinstance does. Selections keep handler order, and are dropped when handlers change.
+
+    >>> index = HandlerIndex(key=len)
+    >>> index.set(abs, types=int)
+    >>> index.set(repr, key=2)
+    >>> handlers = (abs, repr, len)
+    >>> index.select(handlers, (True,), {})
+    (<built-in function abs>, <built-in function len>)
+    >>> index.select(handlers, ('ab',), {})
+    (<built-in function repr>, <built-in function len>)
+    >>> index.select(handlers, (), {})
+    (<built-in function len>,)
+    """
+
+    # Maximum number of selections to cache; the cache is cleared once it's full.
+    cache_size = 4096
+
+    def __init__(self, arg=0, key=None):
+        """
+        Init.
+
+        :param int|str arg: Position or name of the argument filters look at
+        :param callable key: Called with the filter argument to get its key; the argument itself is used if None
+        """
+        self.arg = arg
+        self.key = key
+        # handler -> (types or None, key or _sentinel)
+        self.filters = {}
+        self._snapshot = None
+        self._cache = {}
+        # Tuples of (position, handler, types) of handlers without a key filter, and by key of the others
+        self._unkeyed = ()
+        self._keyed = {}
+        self._unfiltered = ()
+
+    def __len__(self):
+        return len(self.filters)
+
+    def set(self, handler, types=None, key=_sentinel):
+        """
+        Set filters of handler, replacing any it had.
+
+        :param callable handler: Handler
+        :param type|tuple types: Only call handler when the filter argument is an instance of these
+        :param object key: Only call handler when the filter argument's key equals this; must be hashable
+        """
+        if types is None and key is _sentinel:
+            self.filters.pop(handler, None)
+        else:
+            if key is not _sentinel:
+                hash(key)
+            self.filters[handler] = (types, key)
+        self._snapshot = None
+
+    def discard(self, handler):
+        """
+        Drop filters of handler, if any.
+
+        :param callable handler: Handler
+        """
+        self.filters.pop(handler, None)
+        self._snapshot = None
+
+    def _rebuild(self, snapshot):
+        unkeyed = []
+        keyed = {}
+        for position, h in enumerate(snapshot):
+            types, key = self.filters.get(h, (None, _sentinel))
+            if key is _sentinel:
+                unkeyed.append((position, h, types))
+            else:
+                keyed.setdefault(key, []).append((position, h, types))
+        self._unkeyed = tuple(unkeyed)
+        self._keyed = keyed
+        self._unfiltered = tuple(h for _, h, types in unkeyed if types is None)
+        self._cache.clear()
+        self._snapshot = snapshot
+
+    def _key_of(self, value):
+        if self.key is None:
+            return value
+        try:
+            return self.key(value)
+        except (AttributeError, KeyError, IndexError, TypeError):
+            # Can't have a key, so no key filter matches it
+            return _sentinel
+
+    def _select(self, kind, key):
+        entries = self._unkeyed
+        if key is not _sentinel:
+            try:
+                more = self._keyed.get(key)
+            except TypeError:
+                more = None
+            if more:
+                entries = sorted(entries + tuple(more), key=operator.itemgetter(0))
+        return tuple(h for _, h, types in entries if types is None or issubclass(kind, types))
+
+    def select(self, snapshot, args, kwargs):
+        """
+        Lookup handlers to call for a fire.
+
+        :param tuple snapshot: All handlers of the event, in order
+        :param tuple args: positional arguments of the fire
+        :param dict kwargs: keyword arguments of the fire
+        :return tuple: Handlers whose filters match, in order
+        """
+        if snapshot is not self._snapshot:
+            self._rebuild(snapshot)
+
+        arg = self.arg
+        try:
+            value = kwargs[arg] if isinstance(arg, str) else args[arg]
+        except (IndexError, KeyError):
+            return self._unfiltered
+
+        kind = type(value)
+        if self._keyed:
+            key = self._key_of(value)
+            cache_key = (kind, key)
+        else:
+            key = _sentinel
+            cache_key = kind
+
+        try:
+            return self._cache[cache_key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable key
+            return self._select(kind, _sentinel)
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        ret = self._cache[cache_key] = self._select(kind, key)
+        return ret
@@ -0,0 +1,394 @@
+"""
+Append only journal of dispatch fires, for crash recovery and load testing.
+
+A :class:`Journal` adds a :class:`JournalHandler` to each recorded event of a dispatch, like a
+:class:`uninhibited.bridge.Bridge` does. Each fire is encoded into a compact binary record right away, buffered, and
+written out in bulk once the buffer fills up or on :meth:`Journal.flush`. Records go to segment files in a directory,
+starting a new segment once the current one is full.
+
+A :class:`JournalReader` memory maps segments to read them back, and replays them into a Dispatch or AsyncDispatch,
+at full speed or paced to the time between the recorded fires.
+
+Usage::
+
+    journal = Journal('/var/lib/app/journal')
+    journal.attach(dispatch)        # record all events, current and future
+    ...
+    journal.close()
+
+    JournalReader('/var/lib/app/journal').replay(dispatch, speed=1.0)
+"""
+
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+from uninhibited.utils import clock
+
+# Segment header: magic, format version
+_SEGMENT_MAGIC = b'UNJL'
+_SEGMENT_HEADER = struct.Struct('<4sI')
+_VERSION = 1
+
+# Record header: body length, body crc32, timestamp, name length; followed by the body: name, pickled (args, kwargs)
+_RECORD_HEADER = struct.Struct('<IIdH')
+
+_SEGMENT_SUFFIX = '.journal'
+
+
+def _segment_name(index):
+    return '%012d%s' % (index, _SEGMENT_SUFFIX)
+
+
+def list_segments(directory):
+    """
+    List segment files of a journal, oldest first.
+
+    :param str directory: Journal directory
+    :return list: Paths
+    """
+    names = sorted(name for name in os.listdir(directory) if name.endswith(_SEGMENT_SUFFIX))
+    return [os.path.join(directory, name) for name in names]
+
+
+class JournalHandler(object):
+    """
+    Handler recording fires of an event into a :class:`Journal`; it returns None.
+
+    Fires are recorded when it's called among the event's other handlers, so a handler before it that stops
+    propagation keeps the fire out of the journal. It's ran inline on async events.
+    """
+
+    __slots__ = ('journal', 'name', 'encoded_name')
+
+    # Ran on the loop by async events, see :mod:`uninhibited.aio`
+    execution = 'inline'
+
+    def __init__(self, journal, name):
+        self.journal = journal
+        self.name = name
+        self.encoded_name = name.encode('utf-8')
+
+    def __call__(self, *args, **kwargs):
+        self.journal.write(self.encoded_name, args, kwargs)
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.name)
+
+
+class Journal(object):
+    """
+    Writes fires as binary records into segment files of a directory.
+
+    Segments are rotated when a buffered write leaves the current one past `segment_size`, so a segment can exceed it
+    by up to one buffer. Records carry a checksum; a record torn by a crash is skipped on replay, along with the rest
+    of its segment.
+    """
+
+    journal_handler_factory = JournalHandler
+    # Bytes after which a new segment is started
+    segment_size = 64 << 20
+    # Bytes of records buffered before writing them out
+    buffer_size = 1 << 20
+    # If True, fsync segments upon each write out
+    fsync = False
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+    # Timestamps of records, in seconds
+    timestamp = staticmethod(time.time)
+
+    def __init__(self, directory, segment_size=None, buffer_size=None, fsync=None):
+        """
+        Init.
+
+        :param str directory: Directory to write segments into; created as needed. Existing segments are kept, new
+            records go to a new segment after them.
+        :param int segment_size: Bytes after which a new segment is started
+        :param int buffer_size: Bytes of records buffered before writing them out
+        :param bool fsync: If True, fsync segments upon each write out
+        """
+        if segment_size is not None:
+            self.segment_size = segment_size
+        if buffer_size is not None:
+            self.buffer_size = buffer_size
+        if fsync is not None:
+            self.fsync = fsync
+
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self.records = 0
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+        segments = list_segments(directory)
+        self._index = int(os.path.basename(segments[-1])[:-len(_SEGMENT_SUFFIX)]) if segments else 0
+        self._open_segment()
+
+        # (dispatch, name) -> handler
+        self.handlers = {}
+        # Dispatches whose events are all recorded -> their on_add_event handler
+        self._watched = {}
+
+    def _open_segment(self):
+        self._index += 1
+        self.path = os.path.join(self.directory, _segment_name(self._index))
+        # Unbuffered, since we buffer records ourselves
+        self._file = open(self.path, 'ab', buffering=0)
+        header = _SEGMENT_HEADER.pack(_SEGMENT_MAGIC, _VERSION)
+        self._file.write(header)
+        self._size = len(header)
+
+    def write(self, name, args, kwargs, timestamp=None):
+        """
+        Record a fire.
+
+        :param bytes|str name: Event name
+        :param tuple args: positional arguments
+        :param dict kwargs: keyword arguments
+        :param float timestamp: When it was fired; now if None
+        """
+        if not isinstance(name, bytes):
+            name = name.encode('utf-8')
+        if timestamp is None:
+            timestamp = self.timestamp()
+        payload = pickle.dumps((args, kwargs), self.pickle_protocol)
+        crc = zlib.crc32(payload, zlib.crc32(name)) & 0xffffffff
+        header = _RECORD_HEADER.pack(len(name) + len(payload), crc, timestamp, len(name))
+
+        with self._lock:
+            buf = self._buffer
+            buf += header
+            buf += name
+            buf += payload
+            self.records += 1
+            if len(buf) >= self.buffer_size:
+                self._write_out()
+
+    def _write_out(self):
+        buf = self._buffer
+        if buf:
+            # Unbuffered writes may be partial
+            with memoryview(buf) as view:
+                written = 0
+                while written < len(view):
+                    written += self._file.write(view[written:])
+            self._size += len(buf)
+            del buf[:]
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        if self._size >= self.segment_size:
+            self._file.close()
+            self._open_segment()
+
+    def flush(self):
+        """
+        Write out buffered records.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._write_out()
+
+    def attach(self, dispatch, names=None):
+        """
+        Start recording fires of events of dispatch.
+
+        :param Dispatch dispatch: Dispatch
+        :param list names: Names of events to record; None for all but the dispatch's internal events, including
+            events added later.
+        """
+        if names is None:
+            if dispatch not in self._watched:
+                on_add_event = self._watched[dispatch] = self._make_on_add_event(dispatch)
+                dispatch['on_add_event'].add(on_add_event)
+            names = list(dispatch.events)
+        for name in names:
+            if name in dispatch.internal_events or (dispatch, name) in self.handlers:
+                continue
+            if name not in dispatch.events:
+                dispatch.add_event(name)
+            handler = self.handlers[dispatch, name] = self.journal_handler_factory(self, name)
+            dispatch.events[name].add(handler)
+
+    def _make_on_add_event(self, dispatch):
+        def on_add_event(name):
+            self.attach(dispatch, [name])
+        return on_add_event
+
+    def detach(self):
+        """
+        Stop recording fires of all dispatches.
+        """
+        for (dispatch, name), handler in self.handlers.items():
+            event = dispatch.events.get(name)
+            if event is not None:
+                try:
+                    event.remove(handler)
+                except (KeyError, ValueError):
+                    pass
+        self.handlers = {}
+        for dispatch, on_add_event in self._watched.items():
+            dispatch.events['on_add_event'].remove(on_add_event)
+        self._watched = {}
+
+    def close(self):
+        """
+        Stop recording, write out buffered records and close the current segment.
+        """
+        self.detach()
+        with self._lock:
+            if self._file is None:
+                return
+            self._write_out()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return '<%s %s records=%s>' % (self.__class__.__name__, self.directory, self.records)
+
+
+def read_segment(path):
+    """
+    Read the records of a segment file, memory mapping it.
+
+    Reading stops at the first truncated or corrupt record, such as one torn by a crash.
+
+    :param str path: Segment path
+    :return generator: a generator yielding tuples of timestamp, event name, args, kwargs
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size <= _SEGMENT_HEADER.size:
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic, version = _SEGMENT_HEADER.unpack_from(mm)
+        if magic != _SEGMENT_MAGIC or version != _VERSION:
+            raise ValueError("Not a journal segment: %s" % path)
+
+        # Names repeat a lot; decode each one once
+        names = {}
+        size = len(mm)
+        offset = _SEGMENT_HEADER.size
+        header_size = _RECORD_HEADER.size
+        unpack_from = _RECORD_HEADER.unpack_from
+        view = memoryview(mm)
+        try:
+            while offset + header_size <= size:
+                length, crc, timestamp, name_length = unpack_from(mm, offset)
+                start = offset + header_size
+                end = start + length
+                if end > size or zlib.crc32(view[start:end]) & 0xffffffff != crc:
+                    break
+                raw_name = mm[start:start + name_length]
+                name = names.get(raw_name)
+                if name is None:
+                    name = names[raw_name] = raw_name.decode('utf-8')
+                args, kwargs = pickle.loads(view[start + name_length:end])
+                offset = end
+                yield timestamp, name, args, kwargs
+        finally:
+            view.release()
+    finally:
+        mm.close()
+
+
+class JournalReader(object):
+    """
+    Reads records of a journal directory back, in order, and replays them into a dispatch.
+    """
+
+    # Sleep function used to pace replays
+    sleep = staticmethod(time.sleep)
+
+    def __init__(self, directory):
+        """
+        Init.
+
+        :param str directory: Journal directory
+        """
+        self.directory = directory
+
+    @property
+    def segments(self):
+        return list_segments(self.directory)
+
+    def __iter__(self):
+        """
+        Iterate over records.
+
+        :return generator: a generator yielding tuples of timestamp, event name, args, kwargs
+        """
+        for path in self.segments:
+            for record in read_segment(path):
+                yield record
+
+    def _paced(self, speed, since):
+        """
+        Iterate over records from since on, along with how long to wait before each to keep pace.
+
+        :return generator: a generator yielding tuples of delay in seconds or None, name, args, kwargs
+        """
+        first = start = None
+        for timestamp, name, args, kwargs in self:
+            if since is not None and timestamp < since:
+                continue
+            delay = None
+            if speed:
+                if first is None:
+                    first, start = timestamp, clock()
+                delay = (timestamp - first) / speed - (clock() - start)
+            yield delay, name, args, kwargs
+
+    def replay(self, dispatch, speed=None, since=None):
+        """
+        Fire recorded events on dispatch, discarding handler results.
+
+        :param Dispatch dispatch: Dispatch to fire events on
+        :param float speed: None to replay at full speed; otherwise pace fires to the time between them, sped up by
+            this factor, eg 1.0 for real time.
+        :param float timestamp since: Skip records from before this time
+        :return int: Number of fires replayed
+        """
+        count = 0
+        fire = dispatch.fire_discard
+        for delay, name, args, kwargs in self._paced(speed, since):
+            if delay is not None and delay > 0:
+                self.sleep(delay)
+            fire(name, *args, **kwargs)
+            count += 1
+        return count
+
+    async def replay_async(self, dispatch, speed=None, since=None):
+        """
+        Fire recorded events on an AsyncDispatch, waiting for the handlers of each fire before the next one.
+
+        See :meth:`replay` for arguments.
+
+        :return int: Number of fires replayed
+        """
+        import asyncio
+
+        count = 0
+        fire = dispatch.fire_discard
+        for delay, name, args, kwargs in self._paced(speed, since):
+            if delay is not None and delay > 0:
+                await asyncio.sleep(delay)
+            ret = fire(name, *args, **kwargs)
+            if ret is not None:
+                await ret
+            count += 1
+        return count
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.directory)
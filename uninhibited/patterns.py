@@ -0,0 +1,207 @@
+"""
+Wildcard event name patterns.
+
+Names are split into segments on dots. In a pattern, `*` matches exactly one segment and `**` matches any number of
+segments, including none; so `order.*` matches `order.created`, and `order.**.failed` matches both `order.failed` and
+`order.payment.card.failed`.
+"""
+
+import itertools
+
+
+def is_pattern(name):
+    """
+    Check if name contains wildcards.
+
+    :param str name: Event name or pattern
+    :return bool: True if it's a pattern
+    """
+    return '*' in name
+
+
+class _Node(object):
+    __slots__ = ('children', 'star', 'globstar', 'is_globstar', 'values')
+
+    def __init__(self, is_globstar=False):
+        self.children = {}
+        self.star = None
+        self.globstar = None
+        self.is_globstar = is_globstar
+        # List of (sequence, value), in order of addition
+        self.values = []
+
+    def __bool__(self):
+        return bool(self.values or self.children or self.star or self.globstar)
+
+    __nonzero__ = __bool__
+
+
+class PatternTrie(object):
+    """
+    Trie of patterns, matching a name against all of them in one walk over its segments.
+
+    Matches are cached per name until patterns are added or removed.
+
+    >>> trie = PatternTrie()
+    >>> trie.add('order.*', 'any order event')
+    >>> trie.add('order.**.failed', 'order failure')
+    >>> trie.add('**', 'everything')
+    >>> trie.match('order.created')
+    ('any order event', 'everything')
+    >>> trie.match('order.payment.failed')
+    ('order failure', 'everything')
+    >>> trie.match('order.failed')
+    ('any order event', 'order failure', 'everything')
+    """
+
+    separator = '.'
+    # Maximum number of names to cache matches of; the cache is cleared once it's full.
+    cache_size = 4096
+
+    def __init__(self):
+        self.root = _Node()
+        self.count = 0
+        self._sequence = itertools.count()
+        self._cache = {}
+
+    def __len__(self):
+        return self.count
+
+    def _segments(self, name):
+        return name.split(self.separator)
+
+    def add(self, pattern, value):
+        """
+        Add pattern.
+
+        :param str pattern: Pattern
+        :param object value: Value to give back from :meth:`match` for names matching pattern
+        """
+        node = self.root
+        for segment in self._segments(pattern):
+            if segment == '**':
+                if node.globstar is None:
+                    node.globstar = _Node(is_globstar=True)
+                node = node.globstar
+            elif segment == '*':
+                if node.star is None:
+                    node.star = _Node()
+                node = node.star
+            else:
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _Node()
+                node = child
+        node.values.append((next(self._sequence), value))
+        self.count += 1
+        self._cache.clear()
+
+    def _path(self, pattern):
+        """
+        Walk the nodes of pattern.
+
+        :param str pattern: Pattern
+        :return list: List of (parent node, attribute or segment, node)
+        :raises ValueError: If pattern is not present
+        """
+        path = []
+        node = self.root
+        for segment in self._segments(pattern):
+            if segment == '**':
+                attr, child = 'globstar', node.globstar
+            elif segment == '*':
+                attr, child = 'star', node.star
+            else:
+                attr, child = segment, node.children.get(segment)
+            if child is None:
+                raise ValueError("Pattern not present: %s" % pattern)
+            path.append((node, attr, child))
+            node = child
+        return path
+
+    def values(self, pattern):
+        """
+        Lookup values added under pattern itself.
+
+        :param str pattern: Pattern
+        :return list: Values, in order of addition
+        """
+        try:
+            path = self._path(pattern)
+        except ValueError:
+            return []
+        node = path[-1][2] if path else self.root
+        return [value for _, value in node.values]
+
+    def remove(self, pattern, value):
+        """
+        Remove the latest addition of value under pattern.
+
+        :param str pattern: Pattern
+        :param object value: Value given to :meth:`add`
+        :raises ValueError: If it's not present
+        """
+        path = self._path(pattern)
+        node = path[-1][2] if path else self.root
+        for index in range(len(node.values) - 1, -1, -1):
+            if node.values[index][1] == value:
+                del node.values[index]
+                break
+        else:
+            raise ValueError("Pattern not present: %s" % pattern)
+        self.count -= 1
+        self._cache.clear()
+
+        # Prune nodes left empty
+        for parent, attr, child in reversed(path):
+            if child:
+                break
+            if attr in ('globstar', 'star'):
+                setattr(parent, attr, None)
+            else:
+                del parent.children[attr]
+
+    def _closure(self, nodes):
+        # A globstar matches zero segments as well, so it's reachable without consuming one
+        for node in nodes:
+            if node.globstar is not None and node.globstar not in nodes:
+                nodes.append(node.globstar)
+        return nodes
+
+    def match(self, name):
+        """
+        Lookup values of all patterns matching name.
+
+        :param str name: Event name
+        :return tuple: Values, in order of addition
+        """
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+
+        nodes = self._closure([self.root]) if self.count else []
+        for segment in self._segments(name):
+            if not nodes:
+                break
+            matched = []
+            for node in nodes:
+                child = node.children.get(segment)
+                if child is not None and child not in matched:
+                    matched.append(child)
+                if node.star is not None and node.star not in matched:
+                    matched.append(node.star)
+                if node.is_globstar and node not in matched:
+                    matched.append(node)
+            nodes = self._closure(matched)
+
+        values = sorted(item for node in nodes for item in node.values)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        ret = self._cache[name] = tuple(value for _, value in values)
+        return ret
+
+    def clear(self):
+        self.root = _Node()
+        self.count = 0
+        self._cache.clear()
@@ -0,0 +1,315 @@
+import concurrent.futures
+import pickle
+
+from uninhibited.events import Event
+from uninhibited.dispatch import Dispatch
+from uninhibited.utils import StopPropagation, _sentinel
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+
+def _call_pickled(handler, payload):
+    """
+    Call handler with arguments unpickled from payload. Ran in worker processes.
+
+    :param callable handler: callable handler
+    :param bytes payload: Pickled tuple of args, kwargs
+    :return object: Handler's return value
+    """
+    args, kwargs = pickle.loads(payload)
+    return handler(*args, **kwargs)
+
+
+def _cancel(fs):
+    """
+    Cancel futures that have not started yet.
+
+    :param iterable fs: Futures
+    """
+    for f in fs:
+        f.cancel()
+
+
+class ExecutorEventMixin(object):
+    """
+    Fans handlers out over a long-lived executor instead of calling them serially on the firing thread.
+
+    :meth:`fire` returns results in handler order; :meth:`ifire` yields them as they complete.
+
+    Handlers all start right away, so :class:`StopPropagation` can only cancel those still queued in the executor;
+    results are given up to and including the raising handler's.
+
+    Each handler is called through :meth:`_call_handler` in the executor, so stats and tracing record handler calls
+    as they run there.
+    """
+
+    _inline_calls = False
+
+    executor_factory = None
+    max_workers = None
+
+    _executor = None
+    _owns_executor = False
+    # Gives the executor to use when we have none, instead of creating one; see :meth:`share_executor`
+    _executor_provider = None
+
+    def __init__(self, container_factory=None, executor=None, max_workers=None, result_mode=None, filter_arg=None,
+                 filter_key=None):
+        """
+        Init.
+
+        :param events.containers.HandlerCollection container_factory: Factory for callback storage
+        :param concurrent.futures.Executor executor: Executor to use. If not given, one is created on first fire and
+            owned by this event.
+        :param int max_workers: Worker count of the executor we create
+        :param object result_mode: What :meth:`fire` gives back, see :class:`uninhibited.events.Event`
+        :param int|str filter_arg: Position or name of the argument handler filters look at
+        :param callable filter_key: Extracts the key handler filters match from that argument
+        """
+        super(ExecutorEventMixin, self).__init__(
+            container_factory=container_factory, result_mode=result_mode, filter_arg=filter_arg, filter_key=filter_key)
+        if max_workers is not None:
+            self.max_workers = max_workers
+        if executor is not None:
+            self.use_executor(executor)
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            if self._executor_provider is not None:
+                self._executor = self._executor_provider()
+            else:
+                self._executor = self.executor_factory(self.max_workers)
+                self._owns_executor = True
+        return self._executor
+
+    def use_executor(self, executor, owned=False):
+        """
+        Use given executor from now on.
+
+        :param concurrent.futures.Executor executor: Executor
+        :param bool owned: If True, it's shut down with this event.
+        """
+        self._executor = executor
+        self._owns_executor = owned
+
+    def share_executor(self, provider):
+        """
+        Use the executor provider gives from now on, asking for it upon the next fire rather than right away.
+
+        :param callable provider: Called without arguments to get the executor
+        """
+        self._executor = None
+        self._owns_executor = False
+        self._executor_provider = provider
+
+    def shutdown(self, wait=True):
+        """
+        Shut down the executor if this event owns it.
+
+        :param bool wait: Wait for pending handler calls to finish
+        """
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=wait)
+        self._executor = None
+        self._owns_executor = False
+
+    def _submit(self, handler, args, kwargs):
+        if contextvars is None:
+            return self.executor.submit(self._call_handler, handler, args, kwargs)
+        # Handlers see the firing thread's context, eg the span they're called in; a copy each, as they run at once
+        return self.executor.submit(contextvars.copy_context().run, self._call_handler, handler, args, kwargs)
+
+    def _submit_all(self, args, kwargs, handlers=_sentinel):
+        if handlers is _sentinel:
+            handlers = self._handlers_for(args, kwargs)
+        return [(h, self._submit(h, args, kwargs)) for h in handlers]
+
+    def _call_handler(self, handler, args, kwargs):
+        # Ran in the executor
+        return handler(*args, **kwargs)
+
+    def _results(self, args, kwargs, handlers=_sentinel):
+        # Submit everything up front so handlers run concurrently, then hand back results in handler order
+        fs = self._submit_all(args, kwargs, handlers=handlers)
+        return self._collect(fs)
+
+    def _collect(self, fs):
+        for index, (h, f) in enumerate(fs):
+            try:
+                result = f.result()
+            except StopPropagation as stop:
+                _cancel(f for _, f in fs[index + 1:])
+                yield h, stop.result
+                return
+            yield h, result
+
+    def fire(self, *args, **kwargs):
+        """
+        Fire event. Call handlers concurrently in the executor using given arguments, return a list of results in
+        handler order.
+
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        :return list: a list of tuples of handler, return value
+        """
+        if self.result_mode is not None:
+            return self._fire_with_mode(self.result_mode, args, kwargs)
+        return list(self._results(args, kwargs))
+
+    __call__ = fire
+
+    def ifire(self, *args, **kwargs):
+        """
+        Fire event, returning a generator yielding results as handlers complete, in completion order.
+
+        :param tuple args: positional arguments to call each handler with
+        :param dict kwargs: keyword arguments to call each handler with
+        :return generator: a generator yielding a tuple of handler, return value
+        """
+        handlers = dict((f, h) for h, f in self._submit_all(args, kwargs))
+        for f in concurrent.futures.as_completed(handlers):
+            try:
+                result = f.result()
+            except StopPropagation as stop:
+                _cancel(handlers)
+                yield handlers[f], stop.result
+                return
+            yield handlers[f], result
+
+
+class ThreadPoolEvent(ExecutorEventMixin, Event):
+    """
+    Event that calls its handlers concurrently in a thread pool.
+
+    >>> e = ThreadPoolEvent(max_workers=2)
+    >>> e += abs
+    >>> e.fire(-1)
+    [(<built-in function abs>, 1)]
+    >>> e.shutdown()
+    """
+
+    executor_factory = concurrent.futures.ThreadPoolExecutor
+
+
+class ProcessPoolEvent(ExecutorEventMixin, Event):
+    """
+    Event that calls its handlers concurrently in a process pool.
+
+    Handlers must be picklable; this is checked when they are added. Arguments are pickled once per fire and shipped
+    to each handler call as a single bytes payload, rather than pickling the argument objects over again for every
+    handler.
+
+    Handlers run in other processes, so unlike thread pool events, stats and tracing don't record handler calls made
+    by :meth:`fire` and :meth:`ifire`; only fires.
+    """
+
+    executor_factory = concurrent.futures.ProcessPoolExecutor
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def add(self, handler, *args, **kwargs):
+        """
+        Add handler.
+
+        :param callable handler: picklable callable handler
+        :return callable: The handler you added is given back so this can be used as a decorator.
+        :raises TypeError: If handler can't be pickled
+        """
+        check_picklable(handler)
+        return super(ProcessPoolEvent, self).add(handler, *args, **kwargs)
+
+    def _submit_all(self, args, kwargs, handlers=_sentinel):
+        if handlers is _sentinel:
+            handlers = self._handlers_for(args, kwargs)
+        if not handlers:
+            return []
+        payload = pickle.dumps((args, kwargs), self.pickle_protocol)
+        submit = self.executor.submit
+        return [(h, submit(_call_pickled, h, payload)) for h in handlers]
+
+    def _call_handler(self, handler, args, kwargs):
+        return self._submit_all(args, kwargs, handlers=(handler,))[0][1].result()
+
+
+def check_picklable(obj):
+    """
+    Make sure obj can be pickled, so it can be sent to worker processes.
+
+    :param object obj: Object to check
+    :raises TypeError: If it can't be pickled
+    """
+    try:
+        pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    except Exception as exc:
+        raise TypeError("Handler is not picklable: %r (%s)" % (obj, exc))
+
+
+class ExecutorDispatchMixin(object):
+    """
+    Owns one long-lived executor and shares it with all of the executor backed events it creates.
+    """
+
+    executor_factory = None
+    max_workers = None
+
+    _executor = None
+    _owns_executor = False
+
+    def __init__(self, *args, **kwargs):
+        executor = kwargs.pop('executor', None)
+        max_workers = kwargs.pop('max_workers', None)
+        if max_workers is not None:
+            self.max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        super(ExecutorDispatchMixin, self).__init__(*args, **kwargs)
+
+    @property
+    def executor(self):
+        return self._get_executor()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = self.executor_factory(self.max_workers)
+        return self._executor
+
+    def _create_event(self, event_factory):
+        event = super(ExecutorDispatchMixin, self)._create_event(event_factory)
+        if isinstance(event, ExecutorEventMixin):
+            # Our executor is only started upon the first fire
+            event.share_executor(self._get_executor)
+        return event
+
+    def shutdown(self, wait=True):
+        """
+        Shut down the executor if this dispatch owns it.
+
+        :param bool wait: Wait for pending handler calls to finish
+        """
+        if self._executor is None or not self._owns_executor:
+            return
+        executor, self._executor = self._executor, None
+        executor.shutdown(wait=wait)
+        # Events go on with a new executor, only started upon the next fire
+        for event in self.events.values():
+            if isinstance(event, ExecutorEventMixin) and event._executor is executor:
+                event.share_executor(self._get_executor)
+
+
+class ThreadPoolDispatch(ExecutorDispatchMixin, Dispatch):
+    event_factory = ThreadPoolEvent
+    executor_factory = concurrent.futures.ThreadPoolExecutor
+
+
+class ProcessPoolDispatch(ExecutorDispatchMixin, Dispatch):
+    event_factory = ProcessPoolEvent
+    executor_factory = concurrent.futures.ProcessPoolExecutor
+
+    def _add(self, handler, *args, **kwargs):
+        # Check up front, so a handler that can't be sent to workers isn't left half attached
+        check_picklable(handler)
+        return super(ProcessPoolDispatch, self)._add(handler, *args, **kwargs)
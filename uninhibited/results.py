@@ -0,0 +1,31 @@
+"""
+Result modes, deciding what a fire gives back instead of the usual list of (handler, result) tuples.
+
+A mode is either :data:`DISCARD`, or a reducer: any callable taking an iterable of handler results, such as `sum`,
+`all`, `any` or :func:`first`. Handlers are called as the reducer consumes results, so a reducer that stops early,
+like `all` on a falsy result, leaves the remaining handlers uncalled.
+"""
+
+
+class _Discard(object):
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'DISCARD'
+
+
+# Call handlers and throw away their results, without collecting them
+DISCARD = _Discard()
+
+
+def first(results):
+    """
+    Reducer giving the first result that is not None, without calling any further handlers.
+
+    :param iterable results: Handler results
+    :return object: First result that is not None, or None
+    """
+    for result in results:
+        if result is not None:
+            return result
+    return None
@@ -0,0 +1,302 @@
+"""
+Optional per event and per handler instrumentation.
+
+Instrumenting an event swaps its class for a subclass with a timed fire path, so events that are not instrumented pay
+nothing for it at all.
+"""
+
+from uninhibited.utils import StopPropagation, clock
+
+
+class LatencyHistogram(object):
+    """
+    Latency histogram with power of two microsecond buckets.
+    """
+
+    buckets_count = 32
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * self.buckets_count
+
+    def record(self, seconds):
+        """
+        Record a duration.
+
+        :param float seconds: Duration
+        """
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+        index = min(int(seconds * 1e6).bit_length(), self.buckets_count - 1)
+        self.buckets[index] += 1
+
+    @property
+    def mean(self):
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def percentile(self, q):
+        """
+        Estimate a percentile, as the upper bound of the bucket it falls in.
+
+        :param float q: Percentile, 0-100
+        :return float: Duration in seconds, or None if nothing was recorded
+        """
+        if not self.count:
+            return None
+        threshold = self.count * q / 100.0
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= threshold:
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'buckets': dict(((1 << index) / 1e6, count) for index, count in enumerate(self.buckets) if count),
+        }
+
+
+class HandlerStats(object):
+    """
+    Call count, error count and latencies of a single handler.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        # Time spent queued in an executor before starting, for async events
+        self.wait = LatencyHistogram()
+
+    def record(self, seconds, error=False):
+        self.calls += 1
+        if error:
+            self.errors += 1
+        self.latency.record(seconds)
+
+    def as_dict(self):
+        ret = {
+            'calls': self.calls,
+            'errors': self.errors,
+            'latency': self.latency.as_dict(),
+        }
+        if self.wait.count:
+            ret['wait'] = self.wait.as_dict()
+        return ret
+
+
+class EventStats(object):
+    """
+    Fire count and latency of an event, along with :class:`HandlerStats` for each of its handlers.
+    """
+
+    handler_stats_factory = HandlerStats
+
+    def __init__(self):
+        self.fires = 0
+        self.latency = LatencyHistogram()
+        self.handlers = {}
+
+    def handler(self, handler):
+        """
+        Lookup stats of handler, creating them as needed.
+
+        :param callable handler: Handler
+        :return HandlerStats: Stats
+        """
+        try:
+            return self.handlers[handler]
+        except KeyError:
+            stats = self.handlers[handler] = self.handler_stats_factory()
+            return stats
+
+    def as_dict(self):
+        """
+        :return dict: Stats as plain data; handlers are keyed by handler.
+        """
+        return {
+            'fires': self.fires,
+            'latency': self.latency.as_dict(),
+            'handlers': dict((handler, stats.as_dict()) for handler, stats in self.handlers.items()),
+        }
+
+
+class InstrumentedEventMixin(object):
+    """
+    Timed fire path for synchronous events; see :func:`instrument`.
+
+    Its methods are copied into the instrumented subclass rather than inherited, so they reach the plain fire path
+    through `_uninstrumented_class` instead of super().
+    """
+
+    _inline_calls = False
+
+    def _call_handler(self, handler, args, kwargs):
+        stats = self.stats.handler(handler)
+        start = clock()
+        try:
+            result = self._uninstrumented_class._call_handler(self, handler, args, kwargs)
+        except StopPropagation:
+            stats.record(clock() - start)
+            raise
+        except Exception:
+            stats.record(clock() - start, error=True)
+            raise
+        stats.record(clock() - start)
+        return result
+
+    def fire(self, *args, **kwargs):
+        stats = self.stats
+        stats.fires += 1
+        start = clock()
+        try:
+            return self._uninstrumented_class.fire(self, *args, **kwargs)
+        finally:
+            stats.latency.record(clock() - start)
+
+    __call__ = fire
+
+    def ifire(self, *args, **kwargs):
+        self.stats.fires += 1
+        return self._uninstrumented_class.ifire(self, *args, **kwargs)
+
+    def fire_discard(self, *args, **kwargs):
+        stats = self.stats
+        stats.fires += 1
+        start = clock()
+        try:
+            return self._uninstrumented_class.fire_discard(self, *args, **kwargs)
+        finally:
+            stats.latency.record(clock() - start)
+
+    def fire_reduce(self, reducer, *args, **kwargs):
+        stats = self.stats
+        stats.fires += 1
+        start = clock()
+        try:
+            return self._uninstrumented_class.fire_reduce(self, reducer, *args, **kwargs)
+        finally:
+            stats.latency.record(clock() - start)
+
+
+_layered_classes = {}
+
+_mixin_skip_attrs = frozenset(('__dict__', '__weakref__', '__module__', '__doc__', '__qualname__', '__slots__'))
+
+
+def layered_class(cls, mixin, marker, prefix):
+    """
+    Lookup the subclass of cls swapped in to add the behaviour of mixin, creating it as needed.
+
+    The mixin's methods are copied in rather than inherited, and reach those of cls through the `marker` attribute.
+    Layers stack: instrumenting a traced event, or tracing an instrumented one, wraps one layer in the other.
+
+    :param type cls: Event class
+    :param type mixin: Mixin whose methods to copy in
+    :param str marker: Name of the attribute referring back to cls
+    :param str prefix: Prefix of the subclass' name
+    :return type: Subclass
+    """
+    key = (cls, mixin, marker)
+    try:
+        return _layered_classes[key]
+    except KeyError:
+        pass
+    # An empty __slots__ keeps the subclass' layout identical to cls, which swapping __class__ requires, whether or not
+    # cls itself uses slots.
+    attrs = dict((name, value) for name, value in vars(mixin).items() if name not in _mixin_skip_attrs)
+    attrs.update({
+        '__module__': cls.__module__,
+        '__slots__': (),
+        marker: cls,
+        '_layer': (mixin, marker, prefix),
+    })
+    subclass = _layered_classes[key] = type('%s%s' % (prefix, cls.__name__), (cls,), attrs)
+    return subclass
+
+
+def has_layer(cls, marker):
+    """
+    Check if cls has the layer referring back through marker, see :func:`layered_class`.
+    """
+    while '_layer' in vars(cls):
+        if marker in vars(cls):
+            return True
+        cls = vars(cls)[cls._layer[1]]
+    return False
+
+
+def without_layer(cls, marker):
+    """
+    Rebuild cls without the layer referring back through marker, keeping any other layers.
+
+    :param type cls: Event class
+    :param str marker: Name of the attribute of the layer to remove
+    :return type: Class without that layer
+    """
+    if marker in vars(cls):
+        return vars(cls)[marker]
+    layer = vars(cls).get('_layer')
+    if layer is None:
+        return cls
+    mixin, outer, prefix = layer
+    return layered_class(without_layer(vars(cls)[outer], marker), mixin, outer, prefix)
+
+
+def instrumented_class(cls):
+    """
+    Lookup the instrumented subclass of an event class, creating it as needed.
+
+    :param type cls: Event class
+    :return type: Instrumented subclass
+    """
+    return layered_class(cls, cls._stats_mixin, '_uninstrumented_class', 'Instrumented')
+
+
+def is_instrumented(event):
+    return has_layer(type(event), '_uninstrumented_class')
+
+
+def instrument(event, stats=None):
+    """
+    Start collecting stats for event.
+
+    :param Event event: Event to instrument
+    :param EventStats stats: Stats to record into; defaults to the event's existing stats, or new ones.
+    :return EventStats: Stats being recorded into, also available as `event.stats`
+    """
+    if stats is None:
+        stats = event.stats
+    if stats is None:
+        stats = EventStats()
+    event.stats = stats
+    if not is_instrumented(event):
+        event.__class__ = instrumented_class(type(event))
+    return stats
+
+
+def uninstrument(event):
+    """
+    Stop collecting stats for event, restoring its plain fire path. Collected stats are kept.
+
+    :param Event event: Event to uninstrument
+    """
+    if is_instrumented(event):
+        event.__class__ = without_layer(type(event), '_uninstrumented_class')
@@ -0,0 +1,350 @@
+"""
+Optional tracing of fires as nested spans, exported as a Chrome trace.
+
+A :class:`Tracer` records a span for each traced dispatch fire, event fire and handler call into a preallocated ring,
+linking each span to the span it happened in, so handlers firing other events show up nested under them. Load the
+file written by :meth:`Tracer.export` in `chrome://tracing` or https://ui.perfetto.dev.
+
+One tracer records at a time, see :meth:`Tracer.start`. Events only record spans once tracing is enabled for them,
+which swaps in a traced fire path the same way collecting stats does; events that are not traced pay nothing for it.
+
+>>> from uninhibited import Event
+>>> tracer = Tracer().start()
+>>> e = Event()
+>>> e += abs
+>>> e.enable_tracing()
+>>> e.fire(-1)
+[(<built-in function abs>, 1)]
+>>> tracer.stop()
+>>> [(span.name, span.parent) for span in tracer.spans]
+[('abs', 1), ('Event.fire', 0)]
+"""
+
+import collections
+import itertools
+import os
+import threading
+
+from uninhibited.stats import has_layer, layered_class, without_layer
+from uninhibited.utils import clock
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+try:
+    from threading import get_ident as _thread_id
+except ImportError:
+    from thread import get_ident as _thread_id
+
+Span = collections.namedtuple('Span', 'sequence name category start end id parent tid')
+
+# Tracer recording spans, if any
+_active = None
+
+
+class _LocalVar(object):
+    """
+    Per thread stand in for :class:`contextvars.ContextVar`, where that's not available.
+    """
+
+    def __init__(self, default):
+        self._local = threading.local()
+        self._default = default
+
+    def get(self):
+        return getattr(self._local, 'value', self._default)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+if contextvars is not None:
+    # Follows asyncio tasks as well as threads
+    _current = contextvars.ContextVar('uninhibited_span', default=0)
+else:
+    _current = _LocalVar(0)
+
+
+def current_span():
+    """
+    :return int: Id of the span being recorded in the current context, or 0 if none.
+    """
+    return _current.get()
+
+
+class _NullSpan(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _ActiveSpan(object):
+    __slots__ = ('tracer', 'name', 'category', 'id', 'parent', 'token', 'start')
+
+    def __init__(self, tracer, name, category):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.id = next(self.tracer._ids)
+        self.parent = _current.get()
+        self.token = _current.set(self.id)
+        self.start = clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = clock()
+        _current.reset(self.token)
+        self.tracer.record(self.name, self.category, self.start, end, self.id, self.parent)
+
+
+def span(name, category):
+    """
+    Context manager recording a span into the active tracer, if any.
+
+    :param str name: Span name
+    :param str category: Span category, eg 'event' or 'handler'
+    """
+    tracer = _active
+    if tracer is None:
+        return _NULL_SPAN
+    return _ActiveSpan(tracer, name, category)
+
+
+class Tracer(object):
+    """
+    Records spans into a ring of `capacity` slots, preallocated up front; once full, the oldest spans are overwritten.
+    """
+
+    capacity = 1 << 16
+    # Tells spans of threads apart from those of asyncio tasks, see :class:`uninhibited.aio.TracedAsyncEventMixin`
+    thread_id = staticmethod(_thread_id)
+
+    def __init__(self, capacity=None):
+        """
+        Init.
+
+        :param int capacity: Number of spans kept
+        """
+        if capacity is not None:
+            self.capacity = capacity
+        self._ring = [None] * self.capacity
+        self._sequence = itertools.count()
+        self._ids = itertools.count(1)
+
+    def start(self):
+        """
+        Start recording spans, replacing the tracer recording so far, if any.
+
+        :return Tracer: self
+        """
+        global _active
+        _active = self
+        return self
+
+    def stop(self):
+        """
+        Stop recording spans.
+        """
+        global _active
+        if _active is self:
+            _active = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def next_id(self):
+        return next(self._ids)
+
+    def record(self, name, category, start, end, id, parent, tid=None):
+        """
+        Record a finished span.
+
+        :param str name: Span name
+        :param str category: Span category
+        :param float start: Start, as given by :func:`uninhibited.utils.clock`
+        :param float end: End
+        :param int id: Span id, see :meth:`next_id`
+        :param int parent: Id of the span it happened in, or 0
+        :param int tid: Id of the thread or task it ran on; the current thread's if None
+        """
+        sequence = next(self._sequence)
+        if tid is None:
+            tid = self.thread_id()
+        self._ring[sequence % self.capacity] = (sequence, name, category, start, end, id, parent, tid)
+
+    @property
+    def spans(self):
+        """
+        Recorded spans still in the ring, in order of recording; spans end up recorded when they finish.
+
+        :return list: List of :class:`Span`
+        """
+        return [Span._make(span) for span in sorted(span for span in self._ring if span is not None)]
+
+    @property
+    def dropped(self):
+        """
+        :return int: Number of spans overwritten for lack of room
+        """
+        spans = [span[0] for span in self._ring if span is not None]
+        return max(spans) + 1 - len(spans) if spans else 0
+
+    def clear(self):
+        """
+        Drop recorded spans.
+        """
+        self._ring = [None] * self.capacity
+        self._sequence = itertools.count()
+
+    def as_chrome_trace(self):
+        """
+        Recorded spans in Chrome trace event format.
+
+        :return dict: JSON serializable trace
+        """
+        pid = os.getpid()
+        events = [{
+            'name': span.name,
+            'cat': span.category,
+            'ph': 'X',
+            'ts': span.start * 1e6,
+            'dur': (span.end - span.start) * 1e6,
+            'pid': pid,
+            'tid': span.tid,
+            'args': {'id': span.id, 'parent': span.parent},
+        } for span in self.spans]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export(self, path):
+        """
+        Write recorded spans to a Chrome trace JSON file.
+
+        :param str path: File path
+        """
+        import json
+
+        with open(path, 'w') as f:
+            json.dump(self.as_chrome_trace(), f)
+
+    def __repr__(self):
+        return '<%s spans=%s>' % (self.__class__.__name__, len(self.spans))
+
+
+_span_names = {}
+
+
+def handler_name(handler):
+    """
+    :return str: Name to give spans of handler calls
+    """
+    return getattr(handler, '__qualname__', None) or getattr(handler, '__name__', None) or repr(handler)
+
+
+def event_span_name(cls, method='fire'):
+    """
+    :return str: Name to give spans of fires of events of cls, eg `PriorityEvent.fire`
+    """
+    key = (cls, method)
+    try:
+        return _span_names[key]
+    except KeyError:
+        pass
+    plain = cls
+    while '_layer' in vars(plain):
+        plain = vars(plain)[plain._layer[1]]
+    name = _span_names[key] = '%s.%s' % (plain.__name__, method)
+    return name
+
+
+class TracedEventMixin(object):
+    """
+    Traced fire path for synchronous events; see :func:`trace`.
+
+    Like :class:`uninhibited.stats.InstrumentedEventMixin`, its methods are copied into the traced subclass, and reach
+    the plain fire path through `_untraced_class`.
+    """
+
+    _inline_calls = False
+
+    def _call_handler(self, handler, args, kwargs):
+        # Same as a span, minus the context manager, as this is ran for each handler
+        tracer = _active
+        if tracer is None:
+            return self._untraced_class._call_handler(self, handler, args, kwargs)
+        id = next(tracer._ids)
+        parent = _current.get()
+        token = _current.set(id)
+        start = clock()
+        try:
+            return self._untraced_class._call_handler(self, handler, args, kwargs)
+        finally:
+            end = clock()
+            _current.reset(token)
+            tracer.record(handler_name(handler), 'handler', start, end, id, parent)
+
+    def fire(self, *args, **kwargs):
+        with span(event_span_name(type(self)), 'event'):
+            return self._untraced_class.fire(self, *args, **kwargs)
+
+    __call__ = fire
+
+    def fire_discard(self, *args, **kwargs):
+        with span(event_span_name(type(self), 'fire_discard'), 'event'):
+            return self._untraced_class.fire_discard(self, *args, **kwargs)
+
+    def fire_reduce(self, reducer, *args, **kwargs):
+        with span(event_span_name(type(self), 'fire_reduce'), 'event'):
+            return self._untraced_class.fire_reduce(self, reducer, *args, **kwargs)
+
+
+def traced_class(cls):
+    """
+    Lookup the traced subclass of an event class, creating it as needed.
+
+    :param type cls: Event class
+    :return type: Traced subclass
+    """
+    return layered_class(cls, cls._tracing_mixin or TracedEventMixin, '_untraced_class', 'Traced')
+
+
+def is_traced(event):
+    return has_layer(type(event), '_untraced_class')
+
+
+def trace(event):
+    """
+    Start recording spans of fires of event, and of its handler calls, into the active tracer.
+
+    :param Event event: Event to trace
+    """
+    if not is_traced(event):
+        event.__class__ = traced_class(type(event))
+
+
+def untrace(event):
+    """
+    Stop recording spans of event, restoring its plain fire path.
+
+    :param Event event: Event to stop tracing
+    """
+    if is_traced(event):
+        event.__class__ = without_layer(type(event), '_untraced_class')
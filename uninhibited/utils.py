@@ -1,22 +1,48 @@
 import types
 import sys
+import time
 
-try:
-    if sys.version_info < (3,5):
-        raise ImportError("Python 3.5+ required")
-    import asyncio
-
-    HAS_ASYNCIO = True
-except ImportError:
-    HAS_ASYNCIO = False
+# asyncio and concurrent.futures are only checked for here, not imported; they are imported along with the parts of
+# uninhibited that use them.
+HAS_ASYNCIO = sys.version_info >= (3, 5)
 
 _HAS_ASYNCIO = HAS_ASYNCIO
 
+if sys.version_info >= (3, 2):
+    HAS_FUTURES = True
+else:
+    try:
+        # Python 2 needs the futures backport
+        import concurrent.futures  # noqa: F401
+
+        HAS_FUTURES = True
+    except ImportError:
+        HAS_FUTURES = False
+
 _sentinel = object()
 
+
+class StopPropagation(Exception):
+    """
+    Raised by a handler to stop its event from calling any further handlers.
+
+    The fire returns results of the handlers called so far, followed by the raising handler's with `result` as its
+    return value.
+    """
+
+    def __init__(self, result=None):
+        super(StopPropagation, self).__init__(result)
+        self.result = result
+
+
+# Monotonic high resolution clock where available
+clock = getattr(time, 'perf_counter', time.time)
+
 if HAS_ASYNCIO:
 
     def maybe_async(value):
+        import asyncio
+
         if isinstance(value, (types.CoroutineType, types.GeneratorType, asyncio.Future)):
             return value
         else: